@@ -1,5 +1,10 @@
+import os
 from abc import ABC, abstractmethod
-from src.husky_scraper.utils import fetch_html, save_to_file
+from collections import defaultdict
+from typing import Optional
+from src.husky_scraper.utils import fetch_html, fetch_html_many
+from src.husky_scraper.manifest import content_hash
+from src.husky_scraper.sinks import JsonlSink
 
 
 class BaseScraper(ABC):
@@ -7,7 +12,11 @@ class BaseScraper(ABC):
     Abstract base class for all scrapers. Defines the structure for scrapers to follow.
     """
 
-    def __init__(self, urls: str, output_file: str, logger) -> None:
+    # Set by scrapers whose pages each parse to a list of records, to save the records as one flat list
+    flatten_pages = False
+
+    def __init__(self, urls: str, output_file: str, logger, concurrent: bool = True, manifest=None,
+                 output_format: str = 'jsonl') -> None:
         """
         Initializes the scraper.
 
@@ -15,10 +24,22 @@ class BaseScraper(ABC):
             url (str): The URL to scrape.
             output_file (str): The file to save the scraped content to.
             logger: The logger instance for logging.
+            concurrent (bool): Fetch all URLs of the task concurrently instead of one at a time.
+            manifest (ScrapeManifest): Optional manifest used to skip tasks whose pages have not changed.
+            output_format (str): 'jsonl' to keep the streamed records as JSON Lines, or 'json' to
+                finalize them into a JSON array at `output_file`. In 'jsonl' mode a `.json` extension of
+                `output_file` becomes `.jsonl`.
         """
+        if output_format == 'jsonl' and output_file.endswith('.json'):
+            output_file += 'l'
         self.urls = urls
         self.output_file = output_file
         self.logger = logger
+        self.concurrent = concurrent
+        self.manifest = manifest
+        self.output_format = output_format
+        self.journal = None
+        self.failed_urls = []
 
     @abstractmethod
     def parse(self, html: str, url: str):
@@ -37,15 +58,119 @@ class BaseScraper(ABC):
 
     def scrape(self) -> None:
         """
-        Scrapes faculty members from multiple URLs and saves the data.
-        """
-        all_data = []
-        for url in self.urls:
-            self.logger.info(f"Scraping faculty members from {url}")
-            html = fetch_html(url, self.logger)
-            if html:
-                all_data.append(self.parse(html, url))
-                save_to_file(all_data, self.output_file, self.logger)
-                self.logger.info(f"All data saved to {self.output_file}")
-            else:
-                self.logger.error(f"Failed to fetch content from {url}")
+        Scrapes faculty members from multiple URLs and saves the data. Pages already saved by a
+        crashed run of the task are not fetched again.
+        """
+        sink = self.recover_sink()
+        urls = [url for index, url in enumerate(self.urls) if not sink or index not in sink.recovered]
+        if self.concurrent:
+            self.logger.info(f"Scraping {len(urls)} URLs concurrently")
+            pages = fetch_html_many(urls, self.logger)
+        else:
+            pages = ((url, fetch_html(url, self.logger)) for url in urls)
+        self.scrape_pages(pages, sink)
+
+    def scrape_pages(self, pages, sink: Optional[JsonlSink] = None) -> None:
+        """
+        Parses fetched pages as they arrive and streams each record to disk once. Records end up
+        in the same order as `self.urls`. With a manifest, pages whose content is unchanged are
+        held back, and if every page of the task is unchanged and the previous output is intact,
+        parsing and writing are skipped.
+
+        Args:
+            pages: Iterable of (url, html) pairs; html is None for failed fetches.
+            sink (JsonlSink): The sink recovered from a crashed run, if any; the pages it already
+                holds are not expected in `pages`.
+        """
+        recovered = sink.recovered if sink else {}
+        positions = defaultdict(list)
+        for index, url in enumerate(self.urls):
+            if index not in recovered:
+                positions[url].append(index)
+
+        deferred = {}
+        page_hashes = {entry['key']: entry['meta'] for entry in recovered.values()}
+        for url in page_hashes:
+            self.record_url(url, True)
+        try:
+            for url, html in pages:
+                index = positions[url].pop(0)
+                if not html:
+                    self.logger.error(f"Failed to fetch content from {url}")
+                    self.record_url(url, False, "fetch failed")
+                    continue
+                page_hashes[url] = content_hash(html)
+                if self.manifest and self.manifest.page_unchanged(url, page_hashes[url]):
+                    deferred[index] = (url, html)
+                    continue
+                sink = sink or self.open_sink()
+                sink.write(self.parse(html, url), index, url, page_hashes[url])
+                self.record_url(url, True)
+
+            if not page_hashes:
+                self.logger.error(f"No pages fetched, nothing saved to {self.output_file}")
+                return
+            if self.manifest and sink is None and self.manifest.task_unchanged(self.output_file, page_hashes):
+                self.logger.info(f"Pages unchanged, keeping {self.output_file}")
+                for url, _ in deferred.values():
+                    self.record_url(url, True)
+                return
+            sink = sink or self.open_sink()
+            for index, (url, html) in deferred.items():
+                sink.write(self.parse(html, url), index, url, page_hashes[url])
+                self.record_url(url, True)
+        finally:
+            if sink is not None:
+                sink.close()
+
+        sink.finalize(self.output_file, self.output_format, self.flatten_pages)
+        self.logger.info(f"All data saved to {self.output_file}")
+        if self.manifest:
+            self.manifest.record(self.output_file, page_hashes)
+
+    def record_url(self, url: str, succeeded: bool, error: str = None) -> None:
+        """
+        Records the outcome of one URL, remembering failures and updating the run journal, if any.
+        """
+        if not succeeded:
+            self.failed_urls.append(url)
+        if self.journal:
+            self.journal.url_finished(url, succeeded, error)
+
+    @property
+    def partial_file(self) -> str:
+        """
+        The JSON Lines file the task's records are streamed to before the output is finalized.
+        """
+        return f"{self.output_file}.partial.jsonl"
+
+    def open_sink(self) -> JsonlSink:
+        """
+        Opens a fresh JSON Lines sink for this task. The records are streamed to a `.partial.jsonl`
+        file next to the output, each with its URL and page hash, which keeps every completed page
+        if the run crashes and is turned into the final JSON Lines file (or JSON array in 'json'
+        mode) once the task is done.
+        """
+        return JsonlSink(self.partial_file, self.logger, keyed=True)
+
+    def recover_sink(self) -> Optional[JsonlSink]:
+        """
+        Reopens the partial file left by a crashed run of this task, if any, so its pages are not
+        fetched and parsed again. A partial file that does not match the task's URLs is discarded.
+
+        Returns:
+            JsonlSink: The sink holding the recovered pages, or None to start from scratch.
+        """
+        if not os.path.exists(self.partial_file):
+            return None
+        try:
+            sink = JsonlSink(self.partial_file, self.logger, append=True, keyed=True)
+        except ValueError as e:
+            self.logger.warning(f"Discarding {self.partial_file}: {e}")
+            return None
+        if any(index >= len(self.urls) or self.urls[index] != entry['key'] for index, entry in sink.recovered.items()):
+            self.logger.warning(f"Discarding {self.partial_file}, its pages do not match the task URLs")
+            sink.close()
+            return None
+        self.logger.info(f"Resuming {self.output_file} with {len(sink.recovered)} pages from a previous run")
+        return sink
@@ -0,0 +1,98 @@
+import os
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import requests
+
+DEFAULT_BASE_URL = 'https://api.openai.com/v1'
+# Batch statuses after which the batch no longer changes
+FINAL_STATUSES = ('completed', 'failed', 'expired', 'cancelled')
+
+
+class BatchClient(ABC):
+    """
+    Interface of the batch endpoints used by the dataset generator: upload a JSONL file of requests,
+    create a batch from it, poll the batch and download its output and error files.
+    """
+
+    @abstractmethod
+    def upload(self, path: str) -> str:
+        """
+        Uploads a JSONL request file and returns its file id.
+        """
+        pass
+
+    @abstractmethod
+    def create(self, input_file_id: str, endpoint: str, completion_window: str) -> dict:
+        """
+        Creates a batch over an uploaded request file and returns the batch object.
+        """
+        pass
+
+    @abstractmethod
+    def retrieve(self, batch_id: str) -> dict:
+        """
+        Returns the current batch object, with its `status`, `output_file_id` and `error_file_id`.
+        """
+        pass
+
+    @abstractmethod
+    def download(self, file_id: str) -> str:
+        """
+        Returns the content of an output or error file.
+        """
+        pass
+
+
+class HttpBatchClient(BatchClient):
+    """
+    Batch client speaking the OpenAI Files and Batches REST API. Pointing `base_url` at a local
+    `batch_stub.StubBatchServer` runs the batch mode without the real API.
+    """
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, api_key: Optional[str] = None, timeout: float = 60) -> None:
+        """
+        Initializes the client.
+
+        Args:
+            base_url (str): The API root, e.g. `https://api.openai.com/v1` or `http://localhost:8000/v1`.
+            api_key (str): The API key; defaults to the `OPENAI_API_KEY` environment variable.
+            timeout (float): Per-request timeout in seconds.
+        """
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.session = requests.Session()
+        api_key = api_key or os.environ.get('OPENAI_API_KEY')
+        if api_key:
+            self.session.headers['Authorization'] = f"Bearer {api_key}"
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> 'HttpBatchClient':
+        """
+        Creates a client from a `batch` config section; `base_url` and `api_key` are optional.
+        """
+        settings = settings or {}
+        return cls(settings.get('base_url', DEFAULT_BASE_URL), settings.get('api_key'))
+
+    def _request(self, method: str, path: str, **kwargs) -> requests.Response:
+        response = self.session.request(method, f"{self.base_url}{path}", timeout=self.timeout, **kwargs)
+        response.raise_for_status()
+        return response
+
+    def upload(self, path: str) -> str:
+        with open(path, 'rb') as f:
+            response = self._request('POST', '/files', data={'purpose': 'batch'},
+                                     files={'file': (os.path.basename(path), f, 'application/jsonl')})
+        return response.json()['id']
+
+    def create(self, input_file_id: str, endpoint: str, completion_window: str) -> dict:
+        return self._request('POST', '/batches', json={'input_file_id': input_file_id, 'endpoint': endpoint,
+                                                      'completion_window': completion_window}).json()
+
+    def retrieve(self, batch_id: str) -> dict:
+        return self._request('GET', f"/batches/{batch_id}").json()
+
+    def download(self, file_id: str) -> str:
+        response = self._request('GET', f"/files/{file_id}/content")
+        response.encoding = 'utf-8'
+        return response.text
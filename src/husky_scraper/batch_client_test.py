@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import sys
+import tempfile
+
+from src.husky_scraper.batch_client import FINAL_STATUSES, BatchClient, HttpBatchClient
+from src.husky_scraper.batch_stub import StubBatchServer
+from src.husky_scraper.llm_output import parse_dataset
+
+# Run from the repository root: python -m pytest src/husky_scraper/batch_client_test.py
+# gpt_summarizer imports its helpers relative to src/husky_scraper, the directory it is run from
+SCRAPER_DIRECTORY = os.path.dirname(os.path.abspath(__file__))
+ENDPOINT = '/v1/chat/completions'
+
+
+def test_batch_client_is_abstract():
+    """
+    `BatchClient` cannot be used without implementing its endpoints.
+    """
+    try:
+        BatchClient()
+    except TypeError:
+        return
+    raise AssertionError("BatchClient can be instantiated without implementing its endpoints")
+
+
+def test_http_batch_client_round_trip(requests_count: int = 5):
+    """
+    Runs one batch through `HttpBatchClient` against the stub: upload, create, poll, download. One
+    request fails and must come back in the error file, while the others come back valid.
+    """
+    custom_ids = [f"page.json#{index}" for index in range(requests_count)]
+    with StubBatchServer(fail=[custom_ids[-1]]) as server, tempfile.TemporaryDirectory() as directory:
+        client = HttpBatchClient(server.base_url, api_key='stub')
+        path = os.path.join(directory, 'requests.jsonl')
+        with open(path, 'w') as f:
+            for custom_id in custom_ids:
+                f.write(json.dumps({'custom_id': custom_id, 'method': 'POST', 'url': ENDPOINT, 'body': {
+                    'model': 'gpt-4o', 'messages': [{'role': 'user', 'content': f"Data of {custom_id}"}]}}) + '\n')
+        batch = client.create(client.upload(path), ENDPOINT, '24h')
+        while batch['status'] not in FINAL_STATUSES:
+            batch = client.retrieve(batch['id'])
+        answered = []
+        for line in client.download(batch['output_file_id']).splitlines():
+            item = json.loads(line)
+            answered.append(item['custom_id'])
+            # Raises OutputParseError if the stub's answer does not come back intact
+            parse_dataset(item['response']['body']['choices'][0]['message']['content'])
+        failed = [json.loads(line)['custom_id'] for line in client.download(batch['error_file_id']).splitlines()]
+    assert sorted(answered) == sorted(custom_ids[:-1]), f"Answered {answered}, expected {custom_ids[:-1]}"
+    assert failed == custom_ids[-1:], f"Failed {failed}, expected {custom_ids[-1:]}"
+
+
+def test_run_batch():
+    """
+    Runs `gpt_summarizer.run_batch` end to end against the stub on two raw files, with one request failing
+    once, and checks that both refined files are written. gpt_summarizer needs openai: without it the
+    import fails and so does the test, since the batch mode is the code under test.
+    """
+    if SCRAPER_DIRECTORY not in sys.path:
+        sys.path.insert(0, SCRAPER_DIRECTORY)
+    import gpt_summarizer
+
+    logger = logging.getLogger('BatchClientTest')
+    with tempfile.TemporaryDirectory() as directory:
+        filepaths = []
+        for name in ('first', 'second'):
+            filepath = os.path.join(directory, 'raw', f"{name}.json")
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, 'w') as f:
+                json.dump({f"{name.title()} page": {'Content': {'General Content': [f"Text of the {name} page."]}}}, f)
+            filepaths.append(filepath)
+        with StubBatchServer(fail=[f"{filepaths[1]}#0"]) as server:
+            error_files = gpt_summarizer.run_batch(filepaths, HttpBatchClient(server.base_url, api_key='stub'),
+                                                   logger, directory=os.path.join(directory, 'batches'),
+                                                   poll_seconds=0)
+        assert not error_files, f"run_batch reported failures for {error_files}"
+        missing = [filepath for filepath in filepaths if not os.path.exists(gpt_summarizer.refined_path(filepath))]
+        assert not missing, f"No refined output for {missing}"
+
+
+if __name__ == '__main__':
+    for test in (test_batch_client_is_abstract, test_http_batch_client_round_trip, test_run_batch):
+        test()
+        print(f"{test.__name__}: ok")
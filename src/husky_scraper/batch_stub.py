@@ -0,0 +1,209 @@
+import argparse
+import email.parser
+import email.policy
+import json
+import re
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, Optional
+
+# Model output of a request, computed from its chat completion body
+Responder = Callable[[dict], str]
+
+
+def echo_responder(body: dict) -> str:
+    """
+    Answers every request with a valid one-pair dataset quoting the start of its prompt.
+    """
+    prompt = body['messages'][-1]['content']
+    return json.dumps({'dataset': [{'prompt': prompt.strip()[:60], 'completion': 'Stub completion.'}]})
+
+
+class StubBatchServer:
+    """
+    Local stand-in for the OpenAI Files and Batches endpoints used by `HttpBatchClient`, so the batch mode
+    can be run and checked without the real API. Requests are answered by `responder` when their batch is
+    created; a batch reports `in_progress` until it has been polled `polls_to_complete` times. Requests whose
+    `custom_id` is in `fail` land in the error file once, and are answered normally when resubmitted.
+    """
+
+    def __init__(self, responder: Responder = echo_responder, fail: Iterable[str] = (), polls_to_complete: int = 2,
+                 port: int = 0) -> None:
+        """
+        Initializes the server; it listens on 127.0.0.1 once started.
+
+        Args:
+            responder (Responder): Computes the model output of a request from its body.
+            fail (Iterable[str]): Custom ids whose first request fails with a 500.
+            polls_to_complete (int): Status checks after which a batch is completed.
+            port (int): Port to listen on; 0 picks a free one.
+        """
+        self.responder = responder
+        self.fail = set(fail)
+        self.polls_to_complete = polls_to_complete
+        self.files: Dict[str, str] = {}
+        self.batches: Dict[str, dict] = {}
+        self._polls: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        """
+        The API root to hand to `HttpBatchClient`.
+        """
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def __enter__(self) -> 'StubBatchServer':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.stop()
+
+    def start(self) -> None:
+        """
+        Serves requests on a background thread.
+        """
+        self._thread = threading.Thread(target=self._server.serve_forever, name="batch-stub", daemon=True)
+        self._thread.start()
+
+    def serve_forever(self) -> None:
+        """
+        Serves requests on the calling thread until interrupted, then closes the socket.
+        """
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self._server.server_close()
+
+    def stop(self) -> None:
+        """
+        Stops serving on the background thread and closes the socket.
+        """
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def _add_file(self, content: str) -> str:
+        file_id = f"file-{len(self.files)}"
+        self.files[file_id] = content
+        return file_id
+
+    def upload(self, content_type: str, payload: bytes) -> dict:
+        """
+        Stores the file of a multipart `POST /files` request.
+        """
+        message = email.parser.BytesParser(policy=email.policy.HTTP).parsebytes(
+            f"Content-Type: {content_type}\r\n\r\n".encode('utf-8') + payload)
+        for part in message.iter_parts():
+            if part.get_param('name', header='content-disposition') == 'file':
+                with self._lock:
+                    return {'id': self._add_file(part.get_payload(decode=True).decode('utf-8')), 'purpose': 'batch'}
+        raise ValueError("No file in the upload")
+
+    def create(self, request: dict) -> dict:
+        """
+        Answers every request of an uploaded file and creates the batch holding the results.
+        """
+        with self._lock:
+            outputs, errors = [], []
+            for line in self.files[request['input_file_id']].splitlines():
+                if not line.strip():
+                    continue
+                item = json.loads(line)
+                custom_id = item['custom_id']
+                if custom_id in self.fail:
+                    self.fail.discard(custom_id)
+                    errors.append({'custom_id': custom_id, 'error': None, 'response': {
+                        'status_code': 500, 'body': {'error': {'message': 'Stub failure'}}}})
+                    continue
+                outputs.append({'custom_id': custom_id, 'error': None, 'response': {'status_code': 200, 'body': {
+                    'choices': [{'message': {'role': 'assistant', 'content': self.responder(item['body'])}}],
+                    'usage': {'prompt_tokens': 0, 'completion_tokens': 0}}}})
+            batch_id = f"batch-{len(self.batches)}"
+            self.batches[batch_id] = {
+                'id': batch_id, 'status': 'in_progress', 'endpoint': request['endpoint'],
+                'input_file_id': request['input_file_id'],
+                'output_file_id': self._add_file(''.join(json.dumps(o) + '\n' for o in outputs)) if outputs else None,
+                'error_file_id': self._add_file(''.join(json.dumps(e) + '\n' for e in errors)) if errors else None,
+                'request_counts': {'total': len(outputs) + len(errors), 'completed': len(outputs),
+                                   'failed': len(errors)}}
+            self._polls[batch_id] = 0
+            return dict(self.batches[batch_id])
+
+    def retrieve(self, batch_id: str) -> dict:
+        """
+        Returns a batch, completing it once it has been polled `polls_to_complete` times.
+        """
+        with self._lock:
+            batch = self.batches[batch_id]
+            self._polls[batch_id] += 1
+            if self._polls[batch_id] >= self.polls_to_complete:
+                batch['status'] = 'completed'
+            return dict(batch)
+
+    def _handler(self):
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status: int, body: bytes, content_type: str = 'application/json') -> None:
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _route(self, method: str):
+                try:
+                    if method == 'POST':
+                        payload = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                        if self.path == '/v1/files':
+                            return self._send(200, json.dumps(stub.upload(self.headers['Content-Type'], payload)).encode())
+                        if self.path == '/v1/batches':
+                            return self._send(200, json.dumps(stub.create(json.loads(payload))).encode())
+                    else:
+                        match = re.fullmatch(r'/v1/batches/([\w-]+)', self.path)
+                        if match:
+                            return self._send(200, json.dumps(stub.retrieve(match.group(1))).encode())
+                        match = re.fullmatch(r'/v1/files/([\w-]+)/content', self.path)
+                        if match:
+                            return self._send(200, stub.files[match.group(1)].encode('utf-8'), 'application/jsonl')
+                    self._send(404, json.dumps({'error': {'message': f"No route for {method} {self.path}"}}).encode())
+                except (KeyError, ValueError) as e:
+                    self._send(400, json.dumps({'error': {'message': str(e)}}).encode())
+
+            def do_GET(self):
+                self._route('GET')
+
+            def do_POST(self):
+                self._route('POST')
+
+        return Handler
+
+
+def main(argv=None) -> int:
+    """
+    Serves the stub until interrupted; point the `batch.base_url` config setting at the printed URL.
+    """
+    parser = argparse.ArgumentParser(description="Serve a local stub of the OpenAI Files and Batches endpoints.")
+    parser.add_argument('--port', type=int, default=8000, help="Port to listen on.")
+    parser.add_argument('--fail', nargs='*', default=[], help="Custom ids whose first request fails.")
+    args = parser.parse_args(argv)
+
+    server = StubBatchServer(fail=args.fail, port=args.port)
+    print(f"Batch stub listening on {server.base_url}")
+    server.serve_forever()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
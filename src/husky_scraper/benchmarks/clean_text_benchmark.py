@@ -0,0 +1,94 @@
+import argparse
+import json
+import re
+import sys
+import time
+import warnings
+from typing import Dict, Iterator, List
+
+from bs4 import BeautifulSoup
+
+from src.husky_scraper_v1.preprocessing.clean_data import clean_text
+
+# Raw Banner records of the last v1 harvest, relative to src/husky_scraper like the scraper config paths
+DEFAULT_RECORDS = '../husky_scraper_v1/data/raw/all_courses.jsonl'
+
+# Course fields that clean_course_data passes through clean_text
+FIELDS = ('Description', 'Catalog Details', 'Prerequisites', 'Co-requisites')
+
+# Fragments covering the markup corner cases of the BeautifulSoup semantics, checked on every run
+SAMPLE_FRAGMENTS = [
+    '', '   ', 'plain text', '<p>Intro</p>\n<ul><li> CS 2500 </li><li>CS&nbsp;2510</li></ul>&amp; more',
+    '<b>Prereq</b><br/>with a grade of C-<!-- comment -->', '<script>var x = 1;</script>tail<style>p {}</style>',
+    '<template>t<p>q</p></template>after', '<ruby>漢<rt>kan</rt><rp>(</rp></ruby>', '<!DOCTYPE html><p>a</p>b',
+    '</html>after the document<?php x ?>', '&lt;b&gt; &foo; <![CDATA[cd]]>', '<title>T</title><noscript>ns</noscript>',
+]
+
+
+def legacy_clean_text(text: str) -> str:
+    """
+    The original BeautifulSoup implementation of `clean_text`, kept as the reference.
+    """
+    soup = BeautifulSoup(text, 'lxml')
+    return re.sub(r'\s+', ' ', soup.get_text(separator='.', strip=True))
+
+
+def iter_fragments(paths: List[str]) -> Iterator[str]:
+    """
+    Yields the sample fragments, then every string field of the given JSON Lines course records
+    that `clean_course_data` cleans. Missing files are skipped.
+    """
+    yield from SAMPLE_FRAGMENTS
+    for path in paths:
+        try:
+            with open(path, encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        course = json.loads(line)
+                        for field in FIELDS:
+                            if isinstance(course.get(field), str):
+                                yield course[field]
+        except FileNotFoundError:
+            print(f"Skipping missing file: {path}")
+
+
+def benchmark(fragments: List[str]) -> Dict[str, object]:
+    """
+    Cleans every fragment with the BeautifulSoup reference and with `clean_text`.
+
+    Returns:
+        Dict[str, object]: The number of fragments, the ones whose output differed, and the total time of both.
+    """
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        started = time.perf_counter()
+        expected = [legacy_clean_text(fragment) for fragment in fragments]
+        legacy_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    actual = [clean_text(fragment) for fragment in fragments]
+    seconds = time.perf_counter() - started
+    mismatches = [fragment for fragment, old, new in zip(fragments, expected, actual) if old != new]
+    return {'fragments': len(fragments), 'mismatches': mismatches, 'legacy_seconds': legacy_seconds,
+            'seconds': seconds}
+
+
+def main(argv=None) -> int:
+    """
+    Checks that `clean_text` matches the BeautifulSoup implementation and reports the speedup.
+    """
+    parser = argparse.ArgumentParser(description="Compare clean_text with the original BeautifulSoup cleaner.")
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_RECORDS],
+                        help="JSON Lines files of raw course records (default: the last v1 harvest).")
+    args = parser.parse_args(argv)
+
+    results = benchmark(list(iter_fragments(args.paths)))
+    speedup = results['legacy_seconds'] / results['seconds'] if results['seconds'] else 0.0
+    print(f"{results['fragments']} fragments, {len(results['mismatches'])} differ; "
+          f"BeautifulSoup {results['legacy_seconds']:.2f}s, clean_text {results['seconds']:.2f}s ({speedup:.1f}x)")
+    for fragment in results['mismatches']:
+        print(f"Output differs for: {fragment!r}")
+    return 1 if results['mismatches'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,84 @@
+import argparse
+import random
+import sys
+import warnings
+from typing import Iterator, List, Tuple
+
+from src.husky_scraper.benchmarks.clean_text_benchmark import iter_fragments, legacy_clean_text
+from src.husky_scraper_v1.preprocessing.clean_data import clean_text
+
+# Building blocks of the generated fragments: the markup Banner returns, plus the corner cases of the
+# BeautifulSoup semantics (skipped elements, comments, doctypes, CDATA, entities, text after </html>)
+TAGS = ('p', 'b', 'i', 'br', 'ul', 'li', 'div', 'span', 'a', 'table', 'tr', 'td', 'html', 'body', 'head', 'title',
+        'noscript', 'script', 'style', 'template', 'ruby', 'rt', 'rp')
+PIECES = (' CS 2500 ', 'with a grade of C-', 'Prereq', '&amp;', '&nbsp;', '&lt;b&gt;', '&foo;', '&#233;', '<!-- c -->',
+          '<![CDATA[cd]]>', '<?php x ?>', '<!DOCTYPE html>', '</html>', '<br/>', '\n\t ', '  ', '.', 'Café', '漢字',
+          '<p', '>', '"')
+
+
+def random_fragment(rng: random.Random, depth: int = 0) -> str:
+    """
+    Builds a random markup fragment of text pieces and nested, sometimes unclosed, elements.
+    """
+    parts = []
+    for _ in range(rng.randint(0, 6)):
+        if depth < 4 and rng.random() < 0.35:
+            tag = rng.choice(TAGS)
+            closing = f'</{tag}>' if rng.random() < 0.85 else ''
+            parts.append(f'<{tag}>{random_fragment(rng, depth + 1)}{closing}')
+        else:
+            parts.append(rng.choice(PIECES))
+    return ''.join(parts)
+
+
+def generate_fragments(count: int, seed: int) -> Iterator[str]:
+    """
+    Yields `count` random fragments; the same seed always yields the same fragments.
+    """
+    rng = random.Random(seed)
+    for _ in range(count):
+        yield random_fragment(rng)
+
+
+def check_parity(fragments: List[str]) -> List[Tuple[str, str, str]]:
+    """
+    Cleans every fragment, as a string and as UTF-8 bytes, with `clean_text` and with the BeautifulSoup
+    reference.
+
+    Returns:
+        List[Tuple[str, str, str]]: The fragments whose output differed, with the expected and actual output.
+    """
+    mismatches = []
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore')
+        for fragment in fragments:
+            expected = legacy_clean_text(fragment)
+            for markup in (fragment, fragment.encode('utf-8')):
+                actual = clean_text(markup)
+                if actual != expected:
+                    mismatches.append((fragment, expected, actual))
+                    break
+    return mismatches
+
+
+def main(argv=None) -> int:
+    """
+    Fails when `clean_text` differs from the BeautifulSoup implementation on any checked fragment.
+    """
+    parser = argparse.ArgumentParser(description="Check that clean_text matches the original BeautifulSoup "
+                                                 "cleaner on sample, generated and harvested fragments.")
+    parser.add_argument('paths', nargs='*', help="JSON Lines files of raw course records to check as well.")
+    parser.add_argument('--count', type=int, default=20000, help="Number of generated fragments.")
+    parser.add_argument('--seed', type=int, default=0, help="Seed of the generated fragments.")
+    args = parser.parse_args(argv)
+
+    fragments = list(iter_fragments(args.paths)) + list(generate_fragments(args.count, args.seed))
+    mismatches = check_parity(fragments)
+    print(f"{len(fragments)} fragments checked as str and UTF-8 bytes, {len(mismatches)} differ")
+    for fragment, expected, actual in mismatches[:20]:
+        print(f"Output differs for {fragment!r}: expected {expected!r}, got {actual!r}")
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,154 @@
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+from src.husky_scraper.json_formatter import extract_texts
+
+# Run from the repository root: python -m src.husky_scraper.benchmarks.extract_texts_benchmark
+# Raw undergrad results of the last scraping run, resolved against this file so the default works from any directory
+DEFAULT_RESULTS = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                '../../../results/raw/undergrad'))
+# Nesting depth of the synthetic document that checks deep Content trees
+DEEP_NESTING = 20000
+
+
+def legacy_extract_texts(data: Any) -> List[str]:
+    """
+    The original recursive `extract_texts`, kept as the reference.
+    """
+    texts = []
+    if isinstance(data, str):
+        texts.append(data.strip())
+    elif isinstance(data, dict):
+        text = data.get('text', '')
+        if text:
+            texts.append(text.strip())
+        else:
+            for value in data.values():
+                texts.extend(legacy_extract_texts(value))
+    elif isinstance(data, list):
+        for item in data:
+            texts.extend(legacy_extract_texts(item))
+    return texts
+
+
+def largest_files(directory: str, count: int) -> List[str]:
+    """
+    Returns the `count` largest JSON files under a directory, largest first.
+    """
+    paths = [os.path.join(root, name) for root, _, names in os.walk(directory) for name in names
+             if name.endswith('.json')]
+    return sorted(paths, key=os.path.getsize, reverse=True)[:count]
+
+
+def deep_document(depth: int = DEEP_NESTING) -> Any:
+    """
+    Builds a pathologically nested `Content` tree: `depth` levels of alternating dicts and lists.
+    """
+    data = 'innermost text'
+    for level in range(depth):
+        data = {f'Heading {level}': [data, f'text {level}']} if level % 2 else [data]
+    return data
+
+
+def measure(extract: Callable[[Any], Any], data: Any, repeat: int) -> Tuple[List[str], float, int]:
+    """
+    Extracts all texts of a document.
+
+    Returns:
+        Tuple[List[str], float, int]: The texts, the best time in seconds and the peak traced memory in bytes.
+    """
+    texts = list(extract(data))
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        for _ in extract(data):
+            pass
+        best = min(best, time.perf_counter() - started)
+    tracemalloc.start()
+    for _ in extract(data):
+        pass
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return texts, best, peak
+
+
+def benchmark(paths: List[str], repeat: int = 5) -> Dict[str, dict]:
+    """
+    Runs the recursive and the iterative `extract_texts` over each file and a deeply nested document.
+
+    Returns:
+        Dict[str, dict]: Per document, the number of texts, whether both versions agree, and the time and
+            peak memory of both; `legacy_seconds` is None where the recursive version failed.
+    """
+    documents = []
+    for path in paths:
+        with open(path, 'r') as f:
+            documents.append((path, json.load(f)))
+    documents.append((f'<nested {DEEP_NESTING} levels>', deep_document()))
+
+    results = {}
+    for name, data in documents:
+        texts, seconds, peak = measure(extract_texts, data, repeat)
+        stats = {'texts': len(texts), 'seconds': seconds, 'peak_bytes': peak,
+                 'legacy_seconds': None, 'legacy_peak_bytes': None, 'matches': None}
+        try:
+            legacy_texts, stats['legacy_seconds'], stats['legacy_peak_bytes'] = measure(
+                legacy_extract_texts, data, repeat)
+            stats['matches'] = legacy_texts == texts
+        except RecursionError:
+            pass
+        results[name] = stats
+    return results
+
+
+def format_report(results: Dict[str, dict]) -> str:
+    """
+    Formats the benchmark results as a table.
+    """
+    lines = [f"{'document':<60}{'texts':>8}{'same':>6}{'recursive ms':>16}{'iterative ms':>14}"
+             f"{'recursive KiB':>15}{'iterative KiB':>15}"]
+    for name, stats in results.items():
+        label = name if len(name) <= 58 else '...' + name[-55:]
+        if stats['legacy_seconds'] is None:
+            legacy_ms, legacy_kib, same = 'RecursionError', '-', '-'
+        else:
+            legacy_ms = f"{1000 * stats['legacy_seconds']:.2f}"
+            legacy_kib = f"{stats['legacy_peak_bytes'] / 1024:.0f}"
+            same = 'yes' if stats['matches'] else 'NO'
+        lines.append(f"{label:<60}{stats['texts']:>8}{same:>6}{legacy_ms:>16}{1000 * stats['seconds']:>14.2f}"
+                     f"{legacy_kib:>15}{stats['peak_bytes'] / 1024:>15.0f}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """
+    Compares the recursive and the iterative `extract_texts` on the largest raw undergrad files.
+    """
+    parser = argparse.ArgumentParser(description="Compare time, peak memory and output of the recursive and "
+                                                 "iterative extract_texts.")
+    parser.add_argument('paths', nargs='*', help="JSON files to extract (default: the largest raw undergrad files).")
+    parser.add_argument('--directory', default=DEFAULT_RESULTS, help="Where to look for the largest files.")
+    parser.add_argument('--count', type=int, default=5, help="Number of largest files to benchmark.")
+    parser.add_argument('--repeat', type=int, default=5, help="Timed runs per document and version.")
+    args = parser.parse_args(argv)
+
+    missing = [path for path in args.paths if not os.path.isfile(path)]
+    if missing:
+        print(f"Files not found: {', '.join(missing)}")
+        return 1
+    paths = args.paths or largest_files(args.directory, args.count)
+    if not paths:
+        print(f"No JSON files found under {os.path.abspath(args.directory)}; pass files or --directory.")
+        return 1
+    results = benchmark(paths, args.repeat)
+    print(format_report(results))
+    return 1 if any(stats['matches'] is False for stats in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
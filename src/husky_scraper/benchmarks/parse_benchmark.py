@@ -0,0 +1,176 @@
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import sys
+import time
+import tracemalloc
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+from src.husky_scraper import parsing
+from src.husky_scraper.general_information.accreditation_scrapper import AccreditationScraper
+from src.husky_scraper.general_information.course_scraper import CourseScraper
+from src.husky_scraper.general_information.faculty_scraper import FacultyScraper
+from src.husky_scraper.general_information.major_cip_codes import MajorCIPScraper
+from src.husky_scraper.undergrad.scraper import UndergradScraper
+from src.husky_scraper_v3.undergrad.academic_policies.scraper import AcademicPolicies
+from src.husky_scraper_v3.undergrad.admissions.scraper import (
+    UndergradAdmissionRequirements, UndergradJohnMartinsonRequirements, UndergradMilitaryRequirements,
+    UndergradSpecializedEntry)
+from src.husky_scraper_v3.undergrad.entering_students_info.scraper import EnteringStudentsInfo
+from src.husky_scraper_v3.undergrad.financial_information.scraper import (
+    FinancialInformation, TuitionRoomBoardFeesScraper)
+
+# Saved pages of the last scraping run, relative to src/husky_scraper like the scraper config paths
+DEFAULT_PAGES = '../../results/http_cache/bodies'
+
+BASELINE = {'parser': 'html.parser', 'use_strainers': False}
+
+
+def page_parsers(logger) -> Dict[str, Callable[[str, str], object]]:
+    """
+    Returns the parse function of every catalog scraper as `parse(html, url)`, keyed by scraper name.
+    """
+    def ignore_url(parse):
+        return lambda html, url: parse(html)
+
+    parsers = {'UndergradScraper': UndergradScraper([''], '', logger).parse}
+    for scraper_class in (FacultyScraper, CourseScraper, MajorCIPScraper, AccreditationScraper):
+        parsers[scraper_class.__name__] = ignore_url(scraper_class([''], '', logger).parse)
+    for scraper_class in (AcademicPolicies, FinancialInformation, TuitionRoomBoardFeesScraper,
+                          EnteringStudentsInfo, UndergradAdmissionRequirements, UndergradMilitaryRequirements,
+                          UndergradJohnMartinsonRequirements, UndergradSpecializedEntry):
+        parsers[scraper_class.__name__] = ignore_url(scraper_class('', '', logger).parse)
+    return parsers
+
+
+def iter_pages(paths: List[str]) -> Iterator[Tuple[str, str]]:
+    """
+    Yields (path, html) for every HTML document found in the given files and directories.
+    Files that do not look like HTML (e.g. cached Banner JSON responses) are skipped.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            files = sorted(os.path.join(root, name) for root, _, names in os.walk(path) for name in names)
+        else:
+            files = [path]
+        for file_path in files:
+            with open(file_path, 'rb') as f:
+                html = f.read().decode('utf-8', errors='replace')
+            if '<html' in html[:2048].lower():
+                yield file_path, html
+
+
+def run_parse(parse: Callable[[str, str], object], html: str, url: str, settings: dict,
+              repeat: int) -> Tuple[Optional[str], float, int]:
+    """
+    Parses a page with the given parser settings.
+
+    Returns:
+        Tuple[Optional[str], float, int]: The serialized output (None if the scraper does not apply to
+            the page), the best parse time in seconds and the peak traced memory in bytes.
+    """
+    parsing.configure_parser(**settings)
+    with contextlib.redirect_stdout(io.StringIO()):
+        try:
+            output = json.dumps(parse(html, url))
+        except Exception:
+            return None, 0.0, 0
+        best = float('inf')
+        for _ in range(repeat):
+            started = time.perf_counter()
+            parse(html, url)
+            best = min(best, time.perf_counter() - started)
+        tracemalloc.start()
+        parse(html, url)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return output, best, peak
+
+
+def benchmark(paths: List[str], repeat: int = 3, logger=None) -> Dict[str, dict]:
+    """
+    Runs every scraper over the saved pages with the original full `html.parser` tree and with the
+    shared parsing layer (the configured parser plus strainers), checking that both produce identical output.
+
+    Args:
+        paths (List[str]): HTML files or directories of saved pages.
+        repeat (int): Timed parses per page and mode; the fastest one is kept.
+        logger: The logger handed to the scrapers.
+
+    Returns:
+        Dict[str, dict]: Per scraper, the number of pages it applied to, the pages whose output differed,
+            and the total parse time and summed peak memory of both modes.
+    """
+    logger = logger or logging.getLogger("ParseBenchmark")
+    current = parsing.parser_settings()
+    results = {}
+    try:
+        parsers = page_parsers(logger)
+        for path, html in iter_pages(paths):
+            for name, parse in parsers.items():
+                baseline, baseline_time, baseline_peak = run_parse(parse, html, path, BASELINE, repeat)
+                if baseline is None:
+                    continue
+                output, output_time, output_peak = run_parse(parse, html, path, current, repeat)
+                stats = results.setdefault(name, {'pages': 0, 'mismatches': [], 'baseline_seconds': 0.0,
+                                                  'seconds': 0.0, 'baseline_peak_bytes': 0, 'peak_bytes': 0})
+                stats['pages'] += 1
+                if output != baseline:
+                    stats['mismatches'].append(path)
+                stats['baseline_seconds'] += baseline_time
+                stats['seconds'] += output_time
+                stats['baseline_peak_bytes'] += baseline_peak
+                stats['peak_bytes'] += output_peak
+    finally:
+        parsing.configure_parser(**current)
+    return results
+
+
+def format_report(results: Dict[str, dict]) -> str:
+    """
+    Formats the benchmark results as a table of per-page averages.
+    """
+    lines = [f"{'scraper':<36}{'pages':>6}{'diff':>6}{'html.parser ms':>16}{'new ms':>10}{'speedup':>9}"
+             f"{'html.parser KiB':>17}{'new KiB':>10}"]
+    for name, stats in sorted(results.items()):
+        pages = stats['pages']
+        speedup = stats['baseline_seconds'] / stats['seconds'] if stats['seconds'] else 0.0
+        lines.append(f"{name:<36}{pages:>6}{len(stats['mismatches']):>6}"
+                     f"{1000 * stats['baseline_seconds'] / pages:>16.2f}{1000 * stats['seconds'] / pages:>10.2f}"
+                     f"{speedup:>8.1f}x{stats['baseline_peak_bytes'] / pages / 1024:>17.0f}"
+                     f"{stats['peak_bytes'] / pages / 1024:>10.0f}")
+    for name, stats in sorted(results.items()):
+        for path in stats['mismatches']:
+            lines.append(f"Output differs for {name}: {path}")
+    return '\n'.join(lines)
+
+
+def main(argv=None) -> int:
+    """
+    Benchmarks the shared parsing layer against full `html.parser` trees and reports output differences.
+    """
+    parser = argparse.ArgumentParser(description="Compare scraper parse time, memory and output between "
+                                                 "full html.parser trees and the strainer parsing layer.")
+    parser.add_argument('paths', nargs='*', default=[DEFAULT_PAGES],
+                        help="HTML files or directories of saved pages (default: the HTTP cache bodies).")
+    parser.add_argument('--parser', default=parsing.DEFAULT_PARSER, help="Tree builder of the parsing layer.")
+    parser.add_argument('--no-strainers', action='store_true', help="Build full trees with the parsing layer.")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed parses per page and mode.")
+    args = parser.parse_args(argv)
+
+    parsing.configure_parser(args.parser, use_strainers=not args.no_strainers)
+    logger = logging.getLogger("ParseBenchmark")
+    logger.setLevel(logging.WARNING)
+    results = benchmark(args.paths, repeat=args.repeat, logger=logger)
+    if not results:
+        print("No pages to benchmark.")
+        return 1
+    print(format_report(results))
+    return 1 if any(stats['mismatches'] for stats in results.values()) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,107 @@
+import json
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+
+try:
+    import tiktoken
+    _ENCODING = tiktoken.get_encoding('o200k_base')
+except ImportError:
+    _ENCODING = None
+
+# Default size of the JSON data inlined in one prompt
+DEFAULT_CHUNK_TOKENS = 6000
+
+Path = Tuple[Any, ...]
+
+
+def count_tokens(text: str) -> int:
+    """
+    Counts the tokens of a text with tiktoken (the gpt-4o encoding), or estimates them at four
+    characters per token when tiktoken is not installed.
+    """
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text))
+    return len(text) // 4 + 1
+
+
+def json_tokens(value: Any, tokenizer: Callable[[str], int] = count_tokens) -> int:
+    """
+    Returns the tokens of a value serialized the way prompts inline it.
+    """
+    return tokenizer(json.dumps(value, indent=2))
+
+
+def split_sections(value: Any, budget: int, tokenizer: Callable[[str], int] = count_tokens,
+                   path: Path = ()) -> Iterator[Tuple[Path, Any, int]]:
+    """
+    Splits a scraped JSON value into sections that fit the budget, in document order. Dictionaries are
+    split by key (page titles, `Content` headings, sections) and lists by element, descending only
+    into the parts that are too large. A single string larger than the budget is kept whole.
+
+    Args:
+        value: The JSON value to split.
+        budget (int): Maximum tokens of a section.
+        tokenizer (Callable[[str], int]): Counts the tokens of a text.
+        path (Path): Keys and list indexes leading to `value` in the whole document.
+
+    Yields:
+        Tuple[Path, Any, int]: The path of each section, its value and its size in tokens.
+    """
+    size = json_tokens(value, tokenizer)
+    if size <= budget or not isinstance(value, (dict, list)) or not value:
+        yield path, value, size
+        return
+    items = value.items() if isinstance(value, dict) else enumerate(value)
+    for key, child in items:
+        yield from split_sections(child, budget, tokenizer, path + (key,))
+
+
+def _place(nodes: Dict[Path, Any], data: Any, path: Path, value: Any) -> None:
+    """
+    Adds a section to a chunk, recreating the dictionaries and lists that lead to it in the document
+    (page title, `Content`, heading) so every chunk keeps the context of its sections.
+    """
+    node, original = nodes[()], data
+    for depth, key in enumerate(path):
+        original = original[key]
+        prefix = path[:depth + 1]
+        if depth < len(path) - 1 and prefix in nodes:
+            node = nodes[prefix]
+            continue
+        child = value if depth == len(path) - 1 else type(original)()
+        if isinstance(node, list):
+            node.append(child)
+        else:
+            node[key] = child
+        nodes[prefix] = node = child
+
+
+def chunk_data(data: Any, budget: int = DEFAULT_CHUNK_TOKENS,
+               tokenizer: Callable[[str], int] = count_tokens) -> List[Any]:
+    """
+    Packs the sections of a scraped JSON document into chunks of about `budget` tokens. Each chunk has
+    the layout of the document, restricted to its sections. A document within the budget is returned
+    unchanged as the only chunk.
+
+    Args:
+        data: The scraped JSON document.
+        budget (int): Target size of a chunk in tokens.
+        tokenizer (Callable[[str], int]): Counts the tokens of a text.
+
+    Returns:
+        List[Any]: The chunks, in document order.
+    """
+    if json_tokens(data, tokenizer) <= budget or not isinstance(data, (dict, list)):
+        return [data]
+    chunks = []
+    nodes, size = None, 0
+    for path, value, section_size in split_sections(data, budget, tokenizer):
+        if nodes is not None and size + section_size > budget:
+            chunks.append(nodes[()])
+            nodes = None
+        if nodes is None:
+            nodes, size = {(): type(data)()}, 0
+        _place(nodes, data, path, value)
+        size += section_size
+    if nodes is not None:
+        chunks.append(nodes[()])
+    return chunks
@@ -0,0 +1,80 @@
+import hashlib
+import json
+import os
+import time
+from typing import Any, Optional
+
+from src.husky_scraper.http_cache import atomic_write
+
+
+class CompletionCache:
+    """
+    Persistent cache of LLM completions. Each entry is keyed by the hash of the input JSON, the prompt
+    template, the model and the temperature, so a completion is only requested again when one of them
+    changes. Entries are small JSON files under `directory`, holding the raw completion text and the
+    token usage of the request that produced it.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str): Directory holding the cache, created on first write.
+        """
+        self.directory = directory
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> Optional['CompletionCache']:
+        """
+        Builds a cache from a `completion_cache` config section.
+
+        Args:
+            settings (dict): The config section, or None.
+
+        Returns:
+            CompletionCache: The configured cache, or None if the section is missing or disabled.
+        """
+        if not settings or not settings.get('enabled', True):
+            return None
+        return cls(settings['directory'])
+
+    @staticmethod
+    def key(data: Any, template: str, model: str, temperature: float) -> str:
+        """
+        Returns the cache key of a completion request. The input JSON is hashed with sorted keys,
+        so re-serializing an unchanged file keeps its key.
+        """
+        payload = {
+            'input': hashlib.sha256(json.dumps(data, sort_keys=True).encode('utf-8')).hexdigest(),
+            'template': hashlib.sha256(template.encode('utf-8')).hexdigest(),
+            'model': model,
+            'temperature': temperature,
+        }
+        return hashlib.sha256(json.dumps(payload, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """Returns the path of the JSON entry for a completion key."""
+        return os.path.join(self.directory, key[:2], f"{key}.json")
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """
+        Returns the stored entry for the key (`content`, `usage`, `created_at`), or None if it is missing.
+        """
+        try:
+            with open(self._entry_path(key), 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def store(self, key: str, content: str, usage: Optional[dict] = None) -> None:
+        """
+        Stores a completion and the token usage reported for it.
+
+        Args:
+            key (str): The completion key.
+            content (str): The raw completion text.
+            usage (dict): `prompt_tokens` and `completion_tokens` of the request, if known.
+        """
+        entry = {'content': content, 'usage': usage or {}, 'created_at': time.time()}
+        atomic_write(self._entry_path(key), json.dumps(entry).encode('utf-8'))
@@ -0,0 +1,86 @@
+import re
+from typing import Dict, List, Tuple
+
+EMAIL_PATTERN = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}')
+# Stricter variants for pages with many digit runs: word-bounded emails, and phone numbers only with separators
+STRICT_EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}\b')
+STRICT_PHONE_PATTERN = re.compile(r'\(?\d{3}\)?[-.\s]\d{3}[-.\s]\d{4}')
+_NON_DIGITS = re.compile(r'\D')
+
+
+def normalize_phone(phone_number: str) -> str:
+    """
+    Normalizes a matched phone number to the `617-373-2000` format, so that `(617) 373-2000`,
+    `617.373.2000` and `617 373 2000` are recognized as the same number.
+    """
+    digits = _NON_DIGITS.sub('', phone_number)
+    return f"{digits[:3]}-{digits[3:6]}-{digits[6:]}"
+
+
+class ContactCollector:
+    """
+    Collects the unique emails, phone numbers and hyperlinks found on a page, in order of first appearance.
+    Duplicates are detected with sets, so pages with many contacts stay linear.
+    """
+
+    def __init__(self, strict: bool = False) -> None:
+        """
+        Initializes an empty collector.
+
+        Args:
+            strict (bool): Match with `STRICT_EMAIL_PATTERN` and `STRICT_PHONE_PATTERN`, so a bare run of
+                ten digits is not taken for a phone number.
+        """
+        self.email_pattern = STRICT_EMAIL_PATTERN if strict else EMAIL_PATTERN
+        self.phone_pattern = STRICT_PHONE_PATTERN if strict else PHONE_PATTERN
+        self.emails: List[str] = []
+        self.phone_numbers: List[str] = []
+        self.hyperlinks: List[Dict[str, str]] = []
+        self._seen_emails = set()
+        self._seen_phone_numbers = set()
+
+    def add_text(self, text: str) -> None:
+        """
+        Scans a text once for emails and phone numbers and keeps the ones not seen before.
+
+        Args:
+            text (str): The page or section text, e.g. from `soup.get_text()`.
+        """
+        for email in self.email_pattern.findall(text):
+            if email not in self._seen_emails:
+                self._seen_emails.add(email)
+                self.emails.append(email)
+        for phone_number in self.phone_pattern.findall(text):
+            phone_number = normalize_phone(phone_number)
+            if phone_number not in self._seen_phone_numbers:
+                self._seen_phone_numbers.add(phone_number)
+                self.phone_numbers.append(phone_number)
+
+    def add_links(self, links: List[Dict[str, str]]) -> None:
+        """
+        Appends hyperlinks (`{'text': ..., 'url': ...}`); repeated links are kept, as they appear in content.
+        """
+        self.hyperlinks.extend(links)
+
+    def to_dict(self) -> Dict[str, list]:
+        """
+        Returns the collected contacts in the `contact_info` layout of the scraped JSON.
+        """
+        return {'emails': self.emails, 'phone_numbers': self.phone_numbers, 'hyperlinks': self.hyperlinks}
+
+
+def extract_contacts(text: str, strict: bool = False) -> Tuple[List[str], List[str]]:
+    """
+    Extracts the unique emails and normalized phone numbers from a text.
+
+    Args:
+        text (str): The text to scan, computed once per page by the caller.
+        strict (bool): Use the strict patterns, see `ContactCollector`.
+
+    Returns:
+        Tuple[List[str], List[str]]: The emails and the phone numbers, in order of first appearance.
+    """
+    contacts = ContactCollector(strict)
+    contacts.add_text(text)
+    return contacts.emails, contacts.phone_numbers
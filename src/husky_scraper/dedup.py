@@ -0,0 +1,281 @@
+import argparse
+import hashlib
+import json
+import operator
+import re
+import sys
+import time
+import zlib
+from array import array
+from string import Formatter
+from typing import Dict, List, Optional, Pattern, Sequence, Set, Tuple
+
+from src.husky_scraper.json_formatter import FOOTER_PROMPTS
+
+DEFAULT_THRESHOLD = 0.9
+DEFAULT_NUM_PERM = 64
+DEFAULT_SHINGLE_SIZE = 5
+KEYS = ('pair', 'completion')
+
+_WHITESPACE = re.compile(r'\s+')
+_HASH_RANGE = 1 << 32
+# Marks a bin no shingle hashed into; CRC32 values are below it
+_EMPTY = _HASH_RANGE
+
+
+def template_pattern(prompt_format: str) -> Pattern:
+    """
+    Builds the regex matching the prompts produced by a `str.format` prompt template. The `{title}` field
+    matches any document title; every other field is captured, so it becomes part of the template's scope.
+    """
+    parts = []
+    for literal, field, _, _ in Formatter().parse(prompt_format):
+        parts.append(re.escape(literal))
+        if field is not None:
+            parts.append('.*' if field == 'title' else '(.*?)')
+    return re.compile(''.join(parts), re.DOTALL)
+
+
+# The contact pairs json_formatter emits for every document differ only by the document title; their
+# completions are compared for near duplicates within the same template (and link text), never across them
+FOOTER_TEMPLATES = tuple(template_pattern(prompt) for prompt in FOOTER_PROMPTS)
+
+
+def normalize(text: str) -> str:
+    """
+    Lower-cases a text and collapses its whitespace, so formatting differences do not hide duplicates.
+    """
+    return _WHITESPACE.sub(' ', text).strip().lower()
+
+
+def shingles(text: str, size: int = DEFAULT_SHINGLE_SIZE) -> Set[bytes]:
+    """
+    Returns the distinct n-grams of the UTF-8 bytes of a normalized text; texts shorter than `size` are
+    one shingle.
+    """
+    data = text.encode('utf-8')
+    if len(data) <= size:
+        return {data}
+    return {data[start:start + size] for start in range(len(data) - size + 1)}
+
+
+def minhash(text: str, num_perm: int = DEFAULT_NUM_PERM, shingle_size: int = DEFAULT_SHINGLE_SIZE) -> array:
+    """
+    Computes the MinHash signature of a normalized text with one-permutation hashing: every shingle is
+    hashed once (CRC32, stable across runs) into one of `num_perm` bins, each bin keeps its minimum, and
+    empty bins borrow the value of the next non-empty bin. The share of equal bins between two
+    signatures estimates the Jaccard similarity of their shingle sets at O(shingles) cost per text.
+
+    Returns:
+        array: The signature, one unsigned 32-bit value per bin.
+    """
+    bins = [_EMPTY] * num_perm
+    # Visiting the hashes in decreasing order leaves the minimum of each bin written last
+    for value in sorted(map(zlib.crc32, shingles(text, shingle_size)), reverse=True):
+        bins[value % num_perm] = value
+    if _EMPTY in bins:
+        # Densification: an empty bin takes the next filled bin's value, offset by the distance to keep bins distinct
+        filled = bins[:]
+        for index in range(num_perm):
+            if filled[index] == _EMPTY:
+                distance = 1
+                while filled[(index + distance) % num_perm] == _EMPTY:
+                    distance += 1
+                bins[index] = (filled[(index + distance) % num_perm] + distance * 0x9E3779B1) % _HASH_RANGE
+    return array('I', bins)
+
+
+def choose_bands(num_perm: int, threshold: float) -> Tuple[int, int]:
+    """
+    Picks the LSH bands and rows per band for a similarity threshold: the layout whose S-curve midpoint
+    `(1 / bands) ** (1 / rows)` is closest below the threshold, so pairs at the threshold are likely to
+    share a band. Candidates are verified against the threshold afterwards.
+
+    Returns:
+        Tuple[int, int]: The number of bands and the rows per band.
+    """
+    layouts = [(bands, num_perm // bands) for bands in range(1, num_perm + 1) if num_perm % bands == 0]
+    below = [layout for layout in layouts if (1 / layout[0]) ** (1 / layout[1]) <= threshold]
+    return max(below or layouts, key=lambda layout: (1 / layout[0]) ** (1 / layout[1]))
+
+
+def similarity(first: array, second: array) -> float:
+    """
+    Estimates the Jaccard similarity of two texts from their signatures.
+    """
+    return sum(map(operator.eq, first, second)) / len(first)
+
+
+class Deduplicator:
+    """
+    Streaming duplicate filter for prompt/completion pairs. A pair is dropped when its normalized prompt
+    and completion (or the completion alone with `key='completion'`) were seen before. A pair whose prompt
+    follows one of `templates` is also dropped when the estimated Jaccard similarity of its completion to
+    a kept pair of the same template reaches `threshold`; other questions that share an answer are kept.
+    Only kept pairs are indexed: an 8-byte hash for exact matches and a MinHash signature in banded LSH
+    buckets for near duplicates, so memory grows with the number of distinct pairs, not with the dataset.
+    """
+
+    def __init__(self, threshold: float = DEFAULT_THRESHOLD, num_perm: int = DEFAULT_NUM_PERM,
+                 shingle_size: int = DEFAULT_SHINGLE_SIZE, key: str = 'pair', near: bool = True,
+                 templates: Sequence[Pattern] = FOOTER_TEMPLATES) -> None:
+        """
+        Initializes an empty index.
+
+        Args:
+            threshold (float): Estimated Jaccard similarity from which a pair is a near duplicate.
+            num_perm (int): MinHash signature size; larger is more precise and uses more memory.
+            shingle_size (int): Length of the character n-grams compared.
+            key (str): 'pair' to match exact duplicates on prompt and completion, 'completion' on the
+                completion only.
+            near (bool): Whether to detect near duplicates; exact duplicates are always dropped.
+            templates (Sequence[Pattern]): Prompt templates within which completions are compared for near
+                duplicates; the groups a template captures must match as well.
+        """
+        if key not in KEYS:
+            raise ValueError(f"key must be one of {KEYS}, got {key!r}")
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        self.key = key
+        self.near = near
+        self.templates = tuple(templates)
+        self.bands, self.rows = choose_bands(num_perm, threshold)
+        self._exact: Dict[bytes, int] = {}
+        self._buckets: List[Dict[int, int]] = [{} for _ in range(self.bands)]
+        self._signatures: Dict[int, array] = {}
+
+    def text(self, record: dict) -> str:
+        """
+        Returns the normalized text a record is matched on for exact duplicates.
+        """
+        completion = str(record.get('completion', ''))
+        if self.key == 'pair':
+            return normalize(f"{record.get('prompt', '')}\n{completion}")
+        return normalize(completion)
+
+    def scope(self, record: dict) -> Optional[tuple]:
+        """
+        Returns the template of a record's prompt and the groups it captured, or None if the prompt follows
+        none of the templates and the record is only matched exactly.
+        """
+        prompt = str(record.get('prompt', ''))
+        for index, template in enumerate(self.templates):
+            match = template.fullmatch(prompt)
+            if match:
+                return (index,) + match.groups()
+        return None
+
+    def check(self, record: dict, line: int) -> Optional[dict]:
+        """
+        Checks a record against the pairs kept so far and indexes it if it is kept.
+
+        Args:
+            record (dict): The prompt/completion pair.
+            line (int): Its line number, reported as `duplicate_of` for later duplicates.
+
+        Returns:
+            dict: None if the record is kept, otherwise the reason (`exact` or `near`), the line of the
+                kept pair it duplicates and the estimated similarity.
+        """
+        digest = hashlib.blake2b(self.text(record).encode('utf-8'), digest_size=8).digest()
+        if digest in self._exact:
+            return {'reason': 'exact', 'duplicate_of': self._exact[digest], 'similarity': 1.0}
+        scope = self.scope(record) if self.near else None
+        if scope is not None:
+            # The scope is part of every band key, so only completions of the same template are candidates
+            signature = minhash(normalize(str(record.get('completion', ''))), self.num_perm, self.shingle_size)
+            band_keys = [hash((scope, tuple(signature[band * self.rows:(band + 1) * self.rows])))
+                         for band in range(self.bands)]
+            checked = set()
+            for bucket, band_key in zip(self._buckets, band_keys):
+                candidate = bucket.get(band_key)
+                if candidate is not None and candidate not in checked:
+                    checked.add(candidate)
+                    score = similarity(signature, self._signatures[candidate])
+                    if score >= self.threshold:
+                        return {'reason': 'near', 'duplicate_of': candidate, 'similarity': round(score, 3)}
+            for bucket, band_key in zip(self._buckets, band_keys):
+                bucket.setdefault(band_key, line)
+            self._signatures[line] = signature
+        self._exact[digest] = line
+        return None
+
+
+def deduplicate(input_file: str, output_file: str, report_file: Optional[str] = None,
+                deduplicator: Optional[Deduplicator] = None) -> Dict[str, float]:
+    """
+    Streams a JSONL dataset into `output_file` without its duplicate pairs, keeping the first occurrence
+    of each. Every removed pair is written to `report_file` with the reason and the line it duplicates.
+
+    Args:
+        input_file (str): The JSONL dataset of prompt/completion pairs.
+        output_file (str): Where the kept pairs are written, in their original order.
+        report_file (str): Optional JSONL report of the removed pairs.
+        deduplicator (Deduplicator): The configured filter; defaults to exact matching on whole pairs and
+            near-duplicate detection on the completions of the footer contact pairs.
+
+    Returns:
+        Dict[str, float]: The number of pairs read, kept, and removed as exact and near duplicates,
+            and the elapsed seconds.
+    """
+    deduplicator = deduplicator or Deduplicator()
+    stats = {'pairs': 0, 'kept': 0, 'exact': 0, 'near': 0}
+    started = time.perf_counter()
+    report = open(report_file, 'w') if report_file else None
+    try:
+        with open(input_file, 'r') as source, open(output_file, 'w') as target:
+            for line_number, line in enumerate(source, start=1):
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                stats['pairs'] += 1
+                removed = deduplicator.check(record, line_number)
+                if removed is None:
+                    target.write(line if line.endswith('\n') else line + '\n')
+                    stats['kept'] += 1
+                    continue
+                stats[removed['reason']] += 1
+                if report:
+                    report.write(json.dumps({'line': line_number, **removed, **record}) + '\n')
+    finally:
+        if report:
+            report.close()
+    stats['seconds'] = time.perf_counter() - started
+    return stats
+
+
+def format_stats(stats: Dict[str, float]) -> str:
+    """
+    Formats the result of `deduplicate` as one line.
+    """
+    rate = stats['pairs'] / stats['seconds'] if stats['seconds'] else 0.0
+    return (f"Kept {stats['kept']}/{stats['pairs']} pairs, removed {stats['exact']} exact and {stats['near']} near "
+            f"duplicates in {stats['seconds']:.2f}s ({rate:.0f} pairs/s)")
+
+
+def main(argv=None) -> int:
+    """
+    Removes exact and near-duplicate pairs from a fine-tuning JSONL dataset.
+    """
+    parser = argparse.ArgumentParser(description="Remove exact and near-duplicate prompt/completion pairs.")
+    parser.add_argument('input', help="JSONL dataset of prompt/completion pairs.")
+    parser.add_argument('--output', required=True, help="JSONL file for the kept pairs.")
+    parser.add_argument('--report', help="JSONL report of the removed pairs.")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Estimated Jaccard similarity from which pairs are near duplicates.")
+    parser.add_argument('--num-perm', type=int, default=DEFAULT_NUM_PERM, help="MinHash signature size.")
+    parser.add_argument('--shingle-size', type=int, default=DEFAULT_SHINGLE_SIZE, help="Character n-gram length.")
+    parser.add_argument('--key', choices=KEYS, default='pair',
+                        help="Match exact duplicates on whole pairs or on completions only.")
+    parser.add_argument('--exact-only', action='store_true',
+                        help="Only remove exact duplicates, not near-duplicate footer contact pairs.")
+    args = parser.parse_args(argv)
+
+    deduplicator = Deduplicator(args.threshold, args.num_perm, args.shingle_size, args.key, near=not args.exact_only)
+    print(format_stats(deduplicate(args.input, args.output, args.report, deduplicator)))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,314 @@
+import asyncio
+import concurrent.futures
+import re
+import sys
+import threading
+import zlib
+from collections import defaultdict
+from functools import partial
+from typing import Dict, Iterator, List, Optional, Tuple
+from urllib.parse import urldefrag, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.husky_scraper.http_cache import CachedSession, ResponseCache
+
+DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def canonicalize_url(url: str) -> str:
+    """
+    Normalizes a URL so that different spellings of the same document compare equal.
+    The fragment is dropped, scheme and host are lower-cased, default ports are removed
+    and repeated or trailing slashes in the path are collapsed.
+
+    Args:
+        url (str): The URL to normalize.
+
+    Returns:
+        str: The canonical form of the URL.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    netloc = (parts.hostname or '').lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(scheme):
+        netloc = f"{netloc}:{parts.port}"
+    path = re.sub(r'/{2,}', '/', parts.path).rstrip('/') or '/'
+    return urlunsplit((scheme, netloc, path, parts.query, ''))
+
+
+def dedupe_urls(urls: List[str]) -> List[str]:
+    """
+    Removes URLs that point to the same document, keeping the first spelling of each.
+
+    Args:
+        urls (List[str]): The URLs to deduplicate.
+
+    Returns:
+        List[str]: The URLs in their original order, without canonical duplicates.
+    """
+    unique = {}
+    for url in urls:
+        unique.setdefault(canonicalize_url(url), url)
+    return list(unique.values())
+
+
+class FetchEngine:
+    """
+    Asynchronous HTTP fetch engine shared by all scrapers in a run.
+
+    Requests are scheduled on a single background asyncio event loop and executed on a
+    bounded thread pool, each thread reusing its own keep-alive `requests.Session`.
+    A per-host semaphore caps the number of in-flight requests against any one server,
+    and an optional global pacer caps the overall request rate. With a `ResponseCache`
+    configured, responses are served from and revalidated against the on-disk cache.
+
+    Fetches are deduplicated by canonical URL: a document requested by several tasks, or
+    under several fragments, is downloaded once per run and the same content is handed to
+    every caller. Requests made while the download is in flight share its future; later
+    requests are answered from the documents fetched so far, which are kept zlib-compressed
+    so the run holds a fraction of the bodies' size. Failed fetches are not remembered.
+    """
+
+    def __init__(self, max_per_host: int = 8, max_workers: int = 32, timeout: float = 30,
+                 requests_per_second: Optional[float] = None, cache: Optional[ResponseCache] = None) -> None:
+        """
+        Initializes the fetch engine. The event loop is started lazily on first use.
+
+        Args:
+            max_per_host (int): Maximum number of concurrent requests per host.
+            max_workers (int): Size of the thread pool executing the blocking requests.
+            timeout (float): Per-request timeout in seconds.
+            requests_per_second (float): Global cap on requests started per second, or None for no cap.
+            cache (ResponseCache): Optional persistent response cache.
+        """
+        self.max_per_host = max_per_host
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.requests_per_second = requests_per_second
+        self.cache = cache
+        self._next_slot = 0.0
+        self._loop = None
+        self._thread = None
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._host_limits: Dict[str, asyncio.Semaphore] = {}
+        self._in_flight: Dict[str, concurrent.futures.Future] = {}
+        self._documents: Dict[str, bytes] = {}
+
+    def configure(self, max_per_host: Optional[int] = None, max_workers: Optional[int] = None,
+                  requests_per_second: Optional[float] = None, cache: Optional[ResponseCache] = None) -> None:
+        """
+        Updates the engine limits. Must be called before the first fetch of a run,
+        since host limits and the worker pool are created when the loop starts.
+
+        Args:
+            max_per_host (int): Maximum number of concurrent requests per host.
+            max_workers (int): Size of the thread pool executing the blocking requests.
+            requests_per_second (float): Global cap on requests started per second.
+            cache (ResponseCache): Persistent response cache used by the worker sessions.
+        """
+        if max_per_host is not None:
+            self.max_per_host = max_per_host
+        if max_workers is not None:
+            self.max_workers = max_workers
+        if requests_per_second is not None:
+            self.requests_per_second = requests_per_second
+        if cache is not None:
+            self.cache = cache
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Starts the background event loop thread if it is not already running.
+
+        Returns:
+            asyncio.AbstractEventLoop: The running event loop.
+        """
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                loop.set_default_executor(
+                    concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers,
+                                                          thread_name_prefix="fetch"))
+                thread = threading.Thread(target=loop.run_forever, name="fetch-engine", daemon=True)
+                thread.start()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+    def _session(self) -> requests.Session:
+        """
+        Returns the keep-alive session owned by the calling worker thread.
+        """
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = CachedSession(self.cache)
+            adapter = HTTPAdapter(pool_connections=self.max_per_host, pool_maxsize=self.max_per_host)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            self._local.session = session
+        return session
+
+    def _get(self, url: str, logger) -> Optional[str]:
+        """
+        Performs the blocking GET request on a worker thread.
+
+        Args:
+            url (str): The URL to fetch.
+            logger: The logger instance used for logging information and errors.
+
+        Returns:
+            str: The response body, or None if an error occurred.
+        """
+        try:
+            logger.info(f"Fetching HTML content from: {url}")
+            response = self._session().get(url, timeout=self.timeout)
+            response.raise_for_status()
+            return response.text
+        except Exception as e:
+            logger.error(f"Error fetching URL {url}: {e}, {sys.exc_info()}")
+            return None
+
+    def _host_limit(self, url: str) -> asyncio.Semaphore:
+        """
+        Returns the semaphore bounding concurrency for the URL's host. Only called on the loop thread.
+        """
+        host = urlsplit(url).netloc.lower()
+        if host not in self._host_limits:
+            self._host_limits[host] = asyncio.Semaphore(self.max_per_host)
+        return self._host_limits[host]
+
+    async def _throttle(self) -> None:
+        """
+        Waits for the next free slot under the global request-rate cap. Only called on the loop thread.
+        """
+        if not self.requests_per_second:
+            return
+        now = asyncio.get_running_loop().time()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + 1.0 / self.requests_per_second
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+    async def fetch_async(self, url: str, logger) -> Optional[str]:
+        """
+        Fetches a single URL, waiting for a free slot on its host first.
+
+        Args:
+            url (str): The URL to fetch.
+            logger: The logger instance used for logging information and errors.
+
+        Returns:
+            str: The HTML content, or None if an error occurred.
+        """
+        async with self._host_limit(url):
+            await self._throttle()
+            return await asyncio.get_running_loop().run_in_executor(None, self._get, url, logger)
+
+    def submit(self, url: str, logger) -> concurrent.futures.Future:
+        """
+        Schedules a fetch on the engine's event loop without waiting for it. If the same
+        document is in flight, its existing future is returned; if it was already fetched
+        in this run, a future holding its content is returned without fetching it again.
+
+        Args:
+            url (str): The URL to fetch.
+            logger: The logger instance used for logging information and errors.
+
+        Returns:
+            concurrent.futures.Future: A future resolving to the HTML content or None.
+        """
+        loop = self._ensure_loop()
+        key = canonicalize_url(url)
+        with self._lock:
+            future = self._in_flight.get(key)
+            if future is not None and not (future.done() and future.result() is None):
+                logger.info(f"Reusing fetch of {key} for {url}")
+                return future
+            document = self._documents.get(key)
+            if document is None:
+                future = asyncio.run_coroutine_threadsafe(self.fetch_async(urldefrag(url)[0], logger), loop)
+                self._in_flight[key] = future
+        if document is not None:
+            logger.info(f"Reusing the content of {key} fetched earlier in this run for {url}")
+            future = concurrent.futures.Future()
+            future.set_result(zlib.decompress(document).decode('utf-8'))
+            return future
+        # Registered outside the lock: the callback takes it and runs immediately if the fetch is already done
+        future.add_done_callback(partial(self._finished, key))
+        return future
+
+    def _finished(self, key: str, future: concurrent.futures.Future) -> None:
+        """
+        Keeps the compressed content of a successful fetch for the rest of the run and forgets the
+        future, so its body lives only as long as the callers holding it.
+        """
+        succeeded = not future.cancelled() and future.exception() is None and future.result() is not None
+        # Compressed outside the lock, so concurrent submits do not wait for it
+        document = zlib.compress(future.result().encode('utf-8')) if succeeded else None
+        with self._lock:
+            if document is not None:
+                self._documents[key] = document
+            if self._in_flight.get(key) is future:
+                del self._in_flight[key]
+
+    def fetch(self, url: str, logger) -> Optional[str]:
+        """
+        Fetches a single URL and blocks until it is available.
+
+        Args:
+            url (str): The URL to fetch.
+            logger: The logger instance used for logging information and errors.
+
+        Returns:
+            str: The HTML content, or None if an error occurred.
+        """
+        return self.submit(url, logger).result()
+
+    def fetch_many(self, urls: List[str], logger) -> Iterator[Tuple[str, Optional[str]]]:
+        """
+        Fetches all URLs concurrently and yields them in completion order.
+        Every input URL is yielded once, even when several of them share a download.
+
+        Args:
+            urls (List[str]): The URLs to fetch.
+            logger: The logger instance used for logging information and errors.
+
+        Yields:
+            Tuple[str, str]: The URL and its HTML content (None if the fetch failed).
+        """
+        futures = defaultdict(list)
+        for url in urls:
+            futures[self.submit(url, logger)].append(url)
+        for future in concurrent.futures.as_completed(futures):
+            # Popped so each body can be released as soon as it has been yielded
+            for url in futures.pop(future):
+                yield url, future.result()
+
+    def close(self) -> None:
+        """
+        Stops the background event loop, releases its worker threads and forgets
+        the documents fetched during the run.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+            self._host_limits = {}
+            self._in_flight = {}
+            self._documents = {}
+            self._next_slot = 0.0
+        if loop is not None:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.run_until_complete(loop.shutdown_default_executor())
+            loop.close()
+
+
+_default_engine = FetchEngine()
+
+
+def get_fetch_engine() -> FetchEngine:
+    """
+    Returns the process-wide fetch engine used by `fetch_html` and the scrapers.
+    """
+    return _default_engine
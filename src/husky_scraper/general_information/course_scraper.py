@@ -1,8 +1,9 @@
 from typing import List, Dict
-from bs4 import BeautifulSoup
 from src.husky_scraper.base_scraper import BaseScraper
+from src.husky_scraper.parsing import COURSE_BLOCKS, LINKS, make_soup
 import re
-from src.husky_scraper_v3.utils import fetch_html, save_to_file, replace_unicode
+from src.husky_scraper_v3.utils import fetch_html, fetch_html_many, replace_unicode
+from src.husky_scraper.fetcher import dedupe_urls
 
 
 def clean_course_title_and_hours(title):
@@ -20,6 +21,8 @@ class CourseScraper(BaseScraper):
     Scraper for extracting course descriptions from the course catalog page.
     """
 
+    flatten_pages = True
+
     def __init__(self, urls: List[str], output_file: str, logger) -> None:
         """
         Initializes the FacultyScraper with a list of URLs.
@@ -30,20 +33,23 @@ class CourseScraper(BaseScraper):
             logger: The logger instance for logging.
         """
         super().__init__(urls[0], output_file, logger)  # Use first URL for the base class
-        self.urls = urls
+        # The catalog pages listing the departments; the department pages become `self.urls` once found
+        self.catalog_urls = urls
+        self.urls = []
 
-    def parse(self, html: str) -> List[Dict[str, str]]:
+    def parse(self, html: str, url: str = None) -> List[Dict[str, str]]:
         """
         Parses course descriptions from the HTML content.
 
         Args:
             html (str): The HTML content fetched from the URL.
+            url (str): The URL the HTML was fetched from.
 
         Returns:
             List[Dict[str, str]]: A list of dictionaries containing course details.
         """
         self.logger.info("Parsing course descriptions.")
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, COURSE_BLOCKS)
 
         # Find all course blocks
         courses = soup.find_all('div', class_='courseblock')
@@ -75,24 +81,29 @@ class CourseScraper(BaseScraper):
 
     def scrape(self) -> None:
         """
-        Scrapes course descriptions from multiple URLs and saves the data.
+        Scrapes course descriptions from multiple URLs and saves the data. The department pages linked
+        from the catalog pages are the pages of the task: they are fetched concurrently and streamed to
+        disk in link order, and those saved by a crashed run of the task are not fetched again.
         """
         # Find all anchor tags (<a>) for departments and extract href attributes
         links = []
-        course_data = []
-        for url in self.urls:
+        for url in self.catalog_urls:
             self.logger.info(f"Scraping course description from {url}")
             html = fetch_html(url, self.logger)
-            soup = BeautifulSoup(html, 'html.parser')
             if html:
+                self.record_url(url, True)
+                soup = make_soup(html, LINKS)
                 for a_tag in soup.find_all('a', href=True):
                     link = a_tag['href']
                     # Filter for only course description links
                     if 'course-descriptions' in link and link not in links:
                         links.append(link)
-                for link in links:
-                    html = fetch_html(f"https://catalog.northeastern.edu{link}", self.logger)
-                    course_data.extend(self.parse(html))
-
-        save_to_file(course_data, self.output_file, self.logger)
-        self.logger.info(f"All faculty data saved to {self.output_file}")
+            else:
+                self.logger.error(f"Failed to fetch content from {url}")
+                self.record_url(url, False, "fetch failed")
+
+        self.urls = dedupe_urls([f"https://catalog.northeastern.edu{link}" for link in links])
+        sink = self.recover_sink()
+        urls = [url for index, url in enumerate(self.urls) if not sink or index not in sink.recovered]
+        self.logger.info(f"Scraping {len(urls)} department pages concurrently")
+        self.scrape_pages(fetch_html_many(urls, self.logger), sink)
@@ -1,7 +1,8 @@
 from typing import List, Dict
-from bs4 import BeautifulSoup
 from src.husky_scraper.base_scraper import BaseScraper
-from src.husky_scraper.utils import fetch_html, save_to_file, replace_unicode
+from src.husky_scraper.parsing import FACULTY_BLOCKS, make_soup
+from src.husky_scraper.utils import replace_unicode
+from src.husky_scraper.fetcher import dedupe_urls
 
 
 class FacultyScraper(BaseScraper):
@@ -9,6 +10,8 @@ class FacultyScraper(BaseScraper):
     Scraper for extracting faculty member information from multiple URLs.
     """
 
+    flatten_pages = True
+
     def __init__(self, urls: List[str], output_file: str, logger) -> None:
         """
         Initializes the FacultyScraper with a list of URLs.
@@ -19,20 +22,22 @@ class FacultyScraper(BaseScraper):
             logger: The logger instance for logging.
         """
         super().__init__(urls[0], output_file, logger)  # Use first URL for the base class
-        self.urls = urls
+        # The per-letter URLs only differ by fragment, so the directory page is fetched and parsed once
+        self.urls = dedupe_urls(urls)
 
-    def parse(self, html: str) -> List[Dict[str, str]]:
+    def parse(self, html: str, url: str = None) -> List[Dict[str, str]]:
         """
         Parses faculty members from the HTML content.
 
         Args:
             html (str): The HTML content fetched from the URL.
+            url (str): The URL the HTML was fetched from.
 
         Returns:
             List[Dict[str, str]]: A list of dictionaries containing faculty member details.
         """
         self.logger.info("Parsing faculty members.")
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, FACULTY_BLOCKS)
         # Find all faculty blocks with the <p> tag and class 'keeptogether'
         faculty_blocks = soup.find_all('p', class_='keeptogether')
         faculty_list = []
@@ -52,17 +57,3 @@ class FacultyScraper(BaseScraper):
             })
         self.logger.info(f"Parsed {len(faculty_list)} faculty members.")
         return faculty_list
-
-    def scrape(self) -> None:
-        """
-        Scrapes faculty members from multiple URLs and saves the data.
-        """
-        all_faculty = []
-        for url in self.urls:
-            self.logger.info(f"Scraping faculty members from {url}")
-            html = fetch_html(url, self.logger)
-            if html:
-                all_faculty.extend(self.parse(html))
-
-        save_to_file(all_faculty, self.output_file, self.logger)
-        self.logger.info(f"All faculty data saved to {self.output_file}")
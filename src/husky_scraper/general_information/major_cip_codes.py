@@ -1,8 +1,9 @@
 from typing import List, Dict
-from bs4 import BeautifulSoup
 import re
 from src.husky_scraper.base_scraper import BaseScraper
-from src.husky_scraper_v3.utils import fetch_html, save_to_file, replace_unicode
+from src.husky_scraper.parsing import CIP_TABLE, make_soup
+from src.husky_scraper_v3.utils import replace_unicode
+from src.husky_scraper.fetcher import dedupe_urls
 
 
 def clean_cell_text(text: str, label: str) -> str:
@@ -24,22 +25,25 @@ class MajorCIPScraper(BaseScraper):
     Scraper for extracting major CIP codes from the Northeastern University catalog page.
     """
 
+    flatten_pages = True
+
     def __init__(self, urls: List[str], output_file: str, logger) -> None:
         super().__init__(urls[0], output_file, logger)
-        self.urls = urls
+        self.urls = dedupe_urls(urls)
 
-    def parse(self, html: str) -> List[Dict[str, str]]:
+    def parse(self, html: str, url: str = None) -> List[Dict[str, str]]:
         """
         Parses major CIP codes from the HTML content.
 
         Args:
             html (str): The HTML content fetched from the URL.
+            url (str): The URL the HTML was fetched from.
 
         Returns:
             List[Dict[str, str]]: A list of dictionaries containing major CIP code details.
         """
         self.logger.info("Parsing major CIP codes.")
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, CIP_TABLE)
 
         # Locate the major CIP codes table
         table = soup.find('table', class_='visible grid sc_majorciptable')
@@ -61,17 +65,3 @@ class MajorCIPScraper(BaseScraper):
 
         self.logger.info(f"Parsed {len(cip_list)} CIP codes.")
         return cip_list
-
-    def scrape(self) -> None:
-        """
-        Scrapes major CIP codes from multiple URLs and saves the data.
-        """
-        cip_data = []
-        for url in self.urls:
-            self.logger.info(f"Scraping CIP codes from {url}")
-            html = fetch_html(url, self.logger)
-            if html:
-                cip_data.extend(self.parse(html))
-
-        save_to_file(cip_data, self.output_file, self.logger)
-        self.logger.info(f"All CIP code data saved to {self.output_file}")
@@ -1,26 +1,43 @@
 from utils import load_from_file
 from logging_util import LoggerFactory
+import argparse
+import asyncio
 import os
 import json
-from openai import OpenAI
-from pydantic import BaseModel, ValidationError
-import ast
+import random
 import time
+from openai import AsyncOpenAI, APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
 import traceback
+from src.husky_scraper.batch_client import FINAL_STATUSES, HttpBatchClient
+from src.husky_scraper.chunking import DEFAULT_CHUNK_TOKENS, chunk_data, count_tokens
+from src.husky_scraper.completion_cache import CompletionCache
+from src.husky_scraper.http_cache import atomic_write
+from src.husky_scraper.llm_output import OutputParseError, PolicyDatasetModel, parse_dataset
+from src.husky_scraper.rate_limit import RateLimiter
+from src.husky_scraper.sinks import JsonlSink, find_outputs, load_records, read_jsonl
 
+MODEL = "gpt-4o"  # You can use "gpt-4" if you have access
+TEMPERATURE = 0
+# Completion budget of one chunk. Chunks hold at most DEFAULT_CHUNK_TOKENS of data and their pairs are shorter
+# than the data, so this bounds the output without reserving the model's whole context against the TPM limit.
+MAX_TOKENS = 4096
+# Limits used when the config has no `rate_limits` section (gpt-4o on a usage tier 2 account). A request is
+# charged its prompt plus MAX_TOKENS, at most ~11k tokens, so 450k TPM sustains 40+ chunks a minute; 32
+# requests in flight keep that rate with completions taking up to ~45s.
+DEFAULT_RATE_LIMITS = {'requests_per_minute': 5000, 'tokens_per_minute': 450000, 'concurrency': 32}
+MAX_RETRIES = 6
+# Extra requests for a chunk whose output does not decode or validate
+PARSE_RETRIES = 2
+# Errors worth retrying: 429s, dropped connections, timeouts and 5xx responses
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, APITimeoutError, InternalServerError)
+# Batch API mode: endpoint of the batched requests, request limit per batch and default working directory
+BATCH_ENDPOINT = '/v1/chat/completions'
+BATCH_MAX_REQUESTS = 50000
+DEFAULT_BATCH_DIRECTORY = '../../results/batches'
 
-# Define Pydantic model for structured output
-class PolicyResponseModel(BaseModel):
-    prompt: str
-    completion: str
 
-
-# Function to generate structured output from JSON data
-def generate_response_from_data(data):
-    # Construct the prompt with structured formatting
-    # Function to generate structured output from JSON data
-    # Construct the prompt with structured formatting
-    prompt = f'''
+# Prompt for one page; `{data}` is replaced by its JSON. Edits change the completion cache keys.
+PROMPT_TEMPLATE = '''
     You are a helpful university advisor. Based on the following JSON data containing university policies, procedures, contact information, and other relevant details, generate a structured JSON output in the following format:
     1. Analyze the provided JSON structure.
     2. Convert the information into clear, natural language.
@@ -51,7 +68,7 @@ def generate_response_from_data(data):
     Please ensure the output is valid JSON and includes all relevant details from the input data.
 
     Input JSON data:
-    {json.dumps(data, indent=2)}
+    {data}
     I need maximum information to be covered as this data will be used for fine tuning a LLM.
     Understand the information and add what promts and completion based on what questions a student can have about it.
     output format:
@@ -65,34 +82,521 @@ def generate_response_from_data(data):
     Read the prompt carefully and answer and try to generate at least 10 prompts. if enough data is not there it is ok to have less prompts
     }}
     '''
-    client = OpenAI()
-    response = client.chat.completions.create(
-        model="gpt-4o",  # You can use "gpt-4" if you have access
-        messages=[{"role": "user", "content": prompt}],
-        temperature=0,
-        max_tokens=16382,
-        response_format={
+
+
+def build_prompt(data):
+    """
+    Builds the fine-tuning dataset prompt for the JSON data of one scraped page.
+
+    Args:
+        data: The scraped JSON data.
+
+    Returns:
+        str: The prompt sent to the model.
+    """
+    return PROMPT_TEMPLATE.format(data=json.dumps(data, indent=2))
+
+
+def retry_delay(error, attempt):
+    """
+    Returns how long to wait before retrying a failed request: the server's `Retry-After` when
+    it sent one, otherwise exponential backoff with jitter, capped at a minute.
+    """
+    response = getattr(error, 'response', None)
+    retry_after = response.headers.get('retry-after') if response is not None else None
+    if retry_after:
+        try:
+            return float(retry_after)
+        except ValueError:
+            pass
+    return min(60.0, 2 ** attempt) * (0.5 + random.random())
+
+
+def completion_body(prompt):
+    """
+    Returns the chat completion parameters for a prompt, as sent directly or inside a batch request.
+    """
+    return {
+        'model': MODEL,
+        'messages': [{"role": "user", "content": prompt}],
+        'temperature': TEMPERATURE,
+        'max_tokens': MAX_TOKENS,
+        'response_format': {
             'type': 'json_schema',
             'json_schema':
                 {
                     "name": "whocares",
-                    "schema": PolicyResponseModel.model_json_schema()
+                    "schema": PolicyDatasetModel.model_json_schema()
                 }}
-    )
-    # Return content directly as JSON
+    }
+
+
+async def request_completion(client, prompt, limiter, logger, max_retries=MAX_RETRIES):
+    """
+    Sends one prompt to the model within the account's rate limits. Rate-limited, timed-out and failed
+    requests are retried with backoff; a 429 pauses every request of the run, not only this one.
+
+    Args:
+        client (AsyncOpenAI): The API client.
+        prompt (str): The prompt to send.
+        limiter (RateLimiter): The limits shared by all requests of the run.
+        logger: The logger instance for logging.
+        max_retries (int): Retries before the last error is raised.
+
+    Returns:
+        The chat completion response.
+    """
+    # The API counts max_tokens against the TPM limit up front, along with the prompt
+    cost = count_tokens(prompt) + MAX_TOKENS
+    for attempt in range(max_retries + 1):
+        try:
+            async with limiter.limit(cost):
+                return await client.chat.completions.create(**completion_body(prompt))
+        except RETRYABLE_ERRORS as e:
+            # An exhausted quota is reported as a 429 too, but waiting does not help
+            if attempt == max_retries or getattr(e, 'code', None) == 'insufficient_quota':
+                raise
+            delay = retry_delay(e, attempt)
+            if isinstance(e, RateLimitError):
+                limiter.pause(delay)
+            logger.warning(f"{type(e).__name__} from the API, retrying in {delay:.1f}s "
+                           f"(attempt {attempt + 1}/{max_retries})")
+            await asyncio.sleep(delay)
+
+
+def decode_output(content):
+    """
+    Decodes and validates the model output of one request against `PolicyDatasetModel`.
+
+    Returns:
+        dict: The validated `{"dataset": [...]}` output, or None if it could not be decoded or validated.
+    """
     try:
-        content = response.choices[0].message.content
-        return ast.literal_eval(content)
-    except json.JSONDecodeError:
-        print("Failed to decode the response as JSON.")
+        return parse_dataset(content).model_dump()
+    except OutputParseError as e:
+        print(f"Failed to decode the response: {e}")
         return None
 
 
-def main():
+async def generate_chunk_response(client, data, limiter, logger, cache=None):
+    """
+    Generates the structured prompt/completion dataset for one chunk of JSON data. With a cache,
+    a completion stored for the same input, prompt template, model and temperature is reused
+    instead of calling the API, and new completions that validate are stored. An output that does
+    not decode or validate is requested again, up to `PARSE_RETRIES` times, for this chunk only.
+
+    Args:
+        client (AsyncOpenAI): The API client.
+        data: The JSON data of the chunk.
+        limiter (RateLimiter): The limits shared by all requests of the run.
+        logger: The logger instance for logging.
+        cache (CompletionCache): Optional persistent completion cache.
+
+    Returns:
+        dict: The validated output, or None if no attempt produced one.
+    """
+    key = cache.key(data, PROMPT_TEMPLATE, MODEL, TEMPERATURE) if cache else None
+    entry = cache.lookup(key) if cache else None
+    if entry is not None:
+        output = decode_output(entry['content'])
+        if output is not None:
+            return output
+        logger.warning("Cached completion does not match the dataset schema, generating it again")
+    prompt = build_prompt(data)
+    for attempt in range(PARSE_RETRIES + 1):
+        response = await request_completion(client, prompt, limiter, logger)
+        content = response.choices[0].message.content
+        output = decode_output(content)
+        if output is not None:
+            if cache:
+                usage = response.usage and {'prompt_tokens': response.usage.prompt_tokens,
+                                            'completion_tokens': response.usage.completion_tokens}
+                cache.store(key, content, usage)
+            return output
+        if attempt < PARSE_RETRIES:
+            logger.warning(f"Invalid output for a chunk, requesting it again ({attempt + 1}/{PARSE_RETRIES})")
+    return None
+
+
+async def generate_response_from_data(client, data, limiter, logger, cache=None, chunk_tokens=DEFAULT_CHUNK_TOKENS):
+    """
+    Generates the structured prompt/completion dataset for the JSON data of one page. Data larger than
+    `chunk_tokens` is split by page, heading and section into chunks that are generated concurrently,
+    and the `dataset` entries of their outputs are merged in document order. A chunk whose request
+    still fails after its retries is logged and left out, like a chunk whose output does not decode.
+
+    Args:
+        client (AsyncOpenAI): The API client.
+        data: The scraped JSON data.
+        limiter (RateLimiter): The limits shared by all requests of the run.
+        logger: The logger instance for logging.
+        cache (CompletionCache): Optional persistent completion cache, keyed per chunk.
+        chunk_tokens (int): Target size of the JSON data inlined in one prompt.
+
+    Returns:
+        The parsed model output, or None if it could not be decoded.
+    """
+    chunks = chunk_data(data, chunk_tokens)
+    if len(chunks) == 1:
+        return await generate_chunk_response(client, chunks[0], limiter, logger, cache)
+    logger.info(f"Split data into {len(chunks)} chunks of about {chunk_tokens} tokens")
+    results = await asyncio.gather(*(generate_chunk_response(client, chunk, limiter, logger, cache)
+                                     for chunk in chunks), return_exceptions=True)
+    outputs = []
+    for index, result in enumerate(results):
+        if isinstance(result, Exception):
+            logger.error(f"Chunk {index + 1}/{len(chunks)} failed: {type(result).__name__}: {result}")
+            result = None
+        elif isinstance(result, BaseException):
+            raise result
+        outputs.append(result)
+    return merge_outputs(outputs, logger)
+
+
+def merge_outputs(outputs, logger):
+    """
+    Concatenates the `dataset` entries of the chunk outputs. Chunks whose output could not be
+    decoded are left out.
+
+    Returns:
+        dict: The merged `{"dataset": [...]}` output, or None if no chunk produced one.
+    """
+    dataset = []
+    merged = 0
+    for output in outputs:
+        if isinstance(output, dict) and isinstance(output.get('dataset'), list):
+            dataset.extend(output['dataset'])
+            merged += 1
+    if merged < len(outputs):
+        logger.warning(f"{len(outputs) - merged}/{len(outputs)} chunks produced no dataset")
+    return {'dataset': dataset} if merged else None
+
+
+def refined_path(filepath):
+    """
+    Returns where the refined dataset of a raw JSON or JSON Lines file is written.
+    """
+    return os.path.splitext(filepath.replace('raw', 'refined'))[0] + '.jsonl'
+
+
+def write_refined(filepath, response_text):
+    """
+    Writes the generated dataset of a raw JSON file to its refined path; empty outputs are not written.
+    The dataset was already validated against `PolicyDatasetModel` when its chunks were decoded.
+
+    Returns:
+        bool: Whether the dataset was written.
+    """
+    if not response_text:
+        return False
+    refined_output_path = refined_path(filepath)
+    try:
+        os.makedirs(os.path.dirname(refined_output_path), exist_ok=True)
+        # Write structured response to a .jsonl file with the same name as the input file
+        with open(refined_output_path, 'w') as jsonl_file:
+            jsonl_file.write(json.dumps(response_text, indent=4))
+    except OSError as e:
+        print(f"Failed to write the output of {os.path.basename(filepath)} to {refined_output_path}: {e}")
+        return False
+    print(f"Processed and wrote output to {refined_output_path}")
+    return True
+
+
+async def refine_file(client, filepath, limiter, logger, cache=None, chunk_tokens=DEFAULT_CHUNK_TOKENS):
+    """
+    Generates the dataset of one raw JSON file and writes it next to the raw results, under `refined`.
+
+    Returns:
+        bool: Whether a dataset was generated.
+    """
+    data = load_records(filepath)
+
+    # Generate response from JSON data
+    try:
+        response_text = await generate_response_from_data(client, data, limiter, logger, cache, chunk_tokens)
+    except Exception as e:
+        logger.error(f"Error occurred during fetching data from api {filepath}: {str(e)} - {traceback.format_exc()} ")
+        return False
+
+    return write_refined(filepath, response_text)
+
+
+async def generate_dataset(filepaths, limiter, logger, cache=None, chunk_tokens=DEFAULT_CHUNK_TOKENS):
+    """
+    Refines all files concurrently; the limiter decides how many requests actually run at once.
+
+    Returns:
+        list: The files whose API call failed.
+    """
+    client = AsyncOpenAI(max_retries=0)  # Retries are done here, under the shared rate limits
+    try:
+        results = await asyncio.gather(*(refine_file(client, filepath, limiter, logger, cache, chunk_tokens)
+                                         for filepath in filepaths))
+    finally:
+        await client.close()
+    return [filepath for filepath, succeeded in zip(filepaths, results) if not succeeded]
+
+
+def dry_run(filepaths, cache, logger, chunk_tokens=DEFAULT_CHUNK_TOKENS):
+    """
+    Reports which chunks would be served from the completion cache and the tokens the others would
+    cost, without calling the API. Completion tokens are projected from the average of the cached
+    completions, or from `MAX_TOKENS` while the cache holds no usage yet.
+
+    Returns:
+        dict: File, chunk, hit and miss counts and the projected prompt and completion tokens.
+    """
+    hits, misses, chunk_count, prompt_tokens, cached_completion_tokens, cached_with_usage = 0, 0, 0, 0, 0, 0
+    for filepath in filepaths:
+        data = load_records(filepath)
+        chunks = chunk_data(data, chunk_tokens)
+        chunk_count += len(chunks)
+        file_misses = 0
+        for chunk in chunks:
+            entry = cache.lookup(cache.key(chunk, PROMPT_TEMPLATE, MODEL, TEMPERATURE)) if cache else None
+            if entry is not None:
+                hits += 1
+                if entry['usage'].get('completion_tokens') is not None:
+                    cached_completion_tokens += entry['usage']['completion_tokens']
+                    cached_with_usage += 1
+            else:
+                file_misses += 1
+                prompt_tokens += count_tokens(build_prompt(chunk))
+        if file_misses:
+            misses += file_misses
+            logger.info(f"Would generate {file_misses}/{len(chunks)} chunks of {filepath}")
+    per_completion = cached_completion_tokens / cached_with_usage if cached_with_usage else MAX_TOKENS
+    report = {'files': len(filepaths), 'chunks': chunk_count, 'cache_hits': hits, 'cache_misses': misses,
+              'projected_prompt_tokens': prompt_tokens,
+              'projected_completion_tokens': int(per_completion * misses)}
+    logger.info(f"Dry run: {len(filepaths)} files in {chunk_count} chunks, {hits} cached, {misses} to generate, "
+                f"~{report['projected_prompt_tokens']} prompt and ~{report['projected_completion_tokens']} "
+                f"completion tokens")
+    return report
+
+
+def batch_requests(filepaths, chunk_tokens=DEFAULT_CHUNK_TOKENS):
+    """
+    Lists the chunk requests of every raw file. A request's `custom_id` is `<raw file>#<chunk index>`,
+    and its `key` is the completion cache key of the chunk, which changes whenever its input,
+    the prompt template, the model or the temperature does.
+
+    Returns:
+        dict: The requests of each file, in chunk order, keyed by file path.
+    """
+    requests_by_file = {}
+    for filepath in filepaths:
+        data = load_records(filepath)
+        requests_by_file[filepath] = [
+            {'custom_id': f"{filepath}#{index}", 'key': CompletionCache.key(chunk, PROMPT_TEMPLATE, MODEL, TEMPERATURE),
+             'chunk': chunk}
+            for index, chunk in enumerate(chunk_data(data, chunk_tokens))]
+    return requests_by_file
+
+
+def load_batch_state(directory):
+    """
+    Loads the batches submitted by earlier runs from `state.json` in the batch directory.
+    """
+    try:
+        with open(os.path.join(directory, 'state.json'), 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {'batches': []}
+
+
+def save_batch_state(directory, state):
+    """
+    Atomically saves the batch state, so an interrupted run finds every submitted batch again.
+    """
+    atomic_write(os.path.join(directory, 'state.json'), json.dumps(state, indent=2).encode('utf-8'))
+
+
+def load_batch_results(directory):
+    """
+    Loads the collected results of earlier batches from `results.jsonl` in the batch directory.
+
+    Returns:
+        dict: The last result of each `custom_id`, with its `key` and either `content` or `error`.
+    """
+    results = {}
+    path = os.path.join(directory, 'results.jsonl')
+    if os.path.exists(path):
+        for record in read_jsonl(path):
+            results[record['custom_id']] = record
+    return results
+
+
+def completed_output(request, results, cache):
+    """
+    Returns the validated output of a request if an earlier batch or the completion cache already
+    produced one for the same key, otherwise None. Valid batch results are stored in the cache.
+    """
+    result = results.get(request['custom_id'])
+    if result is not None and result['key'] == request['key'] and result.get('content') is not None:
+        output = decode_output(result['content'])
+        if output is not None:
+            if cache and cache.lookup(request['key']) is None:
+                cache.store(request['key'], result['content'], result.get('usage'))
+            return output
+    entry = cache.lookup(request['key']) if cache else None
+    return decode_output(entry['content']) if entry is not None else None
+
+
+def submit_batches(client, pending, directory, state, logger, completion_window='24h',
+                   max_requests=BATCH_MAX_REQUESTS):
+    """
+    Writes the pending requests to JSONL request files of at most `max_requests` lines, uploads them
+    and creates one batch per file. Each batch is saved in the state as soon as it is created.
+    """
+    os.makedirs(directory, exist_ok=True)
+    for start in range(0, len(pending), max_requests):
+        group = pending[start:start + max_requests]
+        path = os.path.join(directory, f"requests-{len(state['batches']):04d}.jsonl")
+        with open(path, 'w') as f:
+            for request in group:
+                f.write(json.dumps({'custom_id': request['custom_id'], 'method': 'POST', 'url': BATCH_ENDPOINT,
+                                    'body': completion_body(build_prompt(request['chunk']))}) + '\n')
+        batch = client.create(client.upload(path), BATCH_ENDPOINT, completion_window)
+        state['batches'].append({'id': batch['id'], 'input': path, 'collected': False,
+                                 'keys': {request['custom_id']: request['key'] for request in group}})
+        save_batch_state(directory, state)
+        logger.info(f"Submitted batch {batch['id']} with {len(group)} requests from {path}")
+
+
+def wait_for_batch(client, batch_id, logger, poll_seconds=60):
+    """
+    Polls a batch until it reaches a final status and returns the batch object.
+    """
+    while True:
+        batch = client.retrieve(batch_id)
+        if batch['status'] in FINAL_STATUSES:
+            return batch
+        counts = batch.get('request_counts') or {}
+        logger.info(f"Batch {batch_id} is {batch['status']}: {counts.get('completed', 0)}/{counts.get('total', '?')} "
+                    f"requests done, checking again in {poll_seconds}s")
+        time.sleep(poll_seconds)
+
+
+def collect_batch(client, batch, keys, directory, logger):
+    """
+    Downloads the output and error files of a finished batch and appends one result per request to
+    `results.jsonl`: the completion content and usage, or the error of a failed request.
+
+    Returns:
+        int: The number of requests that failed.
+    """
+    lines = []
+    for file_id in (batch.get('output_file_id'), batch.get('error_file_id')):
+        if file_id:
+            lines.extend(line for line in client.download(file_id).splitlines() if line.strip())
+    failed = 0
+    with JsonlSink(os.path.join(directory, 'results.jsonl'), logger, append=True) as sink:
+        for line in lines:
+            item = json.loads(line)
+            custom_id = item['custom_id']
+            record = {'custom_id': custom_id, 'key': keys.get(custom_id)}
+            response = item.get('response') or {}
+            if not item.get('error') and response.get('status_code') == 200:
+                body = response['body']
+                record['content'] = body['choices'][0]['message']['content']
+                record['usage'] = body.get('usage')
+            else:
+                record['error'] = item.get('error') or response.get('body', {}).get('error')
+                failed += 1
+            sink.write(record)
+    logger.info(f"Collected batch {batch['id']} ({batch['status']}): {len(lines) - failed} results, {failed} failed")
+    return failed
+
+
+def run_batch(filepaths, client, logger, cache=None, chunk_tokens=DEFAULT_CHUNK_TOKENS, directory=DEFAULT_BATCH_DIRECTORY,
+              poll_seconds=60, completion_window='24h'):
+    """
+    Generates the dataset through the Batch API. Batches left unfinished by an earlier run are waited for
+    and collected first. Requests whose `custom_id` already has a valid result for the same key, or whose
+    completion is cached, are not submitted again, so re-running resumes an interrupted run. Requests that
+    failed or whose output does not validate are resubmitted, up to `PARSE_RETRIES` times. Results are then
+    demultiplexed back into the refined path of each raw file.
+
+    Args:
+        filepaths (list): The raw JSON files.
+        client (BatchClient): The batch endpoints, e.g. `HttpBatchClient` against the API or a stub server.
+        logger: The logger instance for logging.
+        cache (CompletionCache): Optional persistent completion cache; decoded results are stored in it.
+        chunk_tokens (int): Target size of the JSON data inlined in one prompt.
+        directory (str): Where request files, the batch state and collected results are kept.
+        poll_seconds (float): Delay between two status checks of a batch.
+        completion_window (str): The batch completion window.
+
+    Returns:
+        list: The files with requests that did not complete, or whose output could not be written;
+            re-running submits only the requests that did not complete.
+    """
+    state = load_batch_state(directory)
+
+    def collect_pending():
+        for entry in state['batches']:
+            if not entry['collected']:
+                batch = wait_for_batch(client, entry['id'], logger, poll_seconds)
+                collect_batch(client, batch, entry['keys'], directory, logger)
+                entry['collected'] = True
+                save_batch_state(directory, state)
+
+    collect_pending()
+    requests_by_file = batch_requests(filepaths, chunk_tokens)
+    total = sum(len(requests) for requests in requests_by_file.values())
+    outputs = {}
+    for attempt in range(PARSE_RETRIES + 1):
+        results = load_batch_results(directory)
+        pending = []
+        for requests in requests_by_file.values():
+            for request in requests:
+                if request['custom_id'] not in outputs:
+                    output = completed_output(request, results, cache)
+                    if output is None:
+                        pending.append(request)
+                    else:
+                        outputs[request['custom_id']] = output
+        if attempt == 0:
+            logger.info(f"{total - len(pending)}/{total} requests already completed, submitting {len(pending)}")
+        elif pending:
+            logger.info(f"Resubmitting {len(pending)} failed or invalid requests")
+        if not pending or attempt == PARSE_RETRIES:
+            break
+        submit_batches(client, pending, directory, state, logger, completion_window)
+        collect_pending()
+
+    error_files = []
+    for filepath, requests in requests_by_file.items():
+        if any(request['custom_id'] not in outputs for request in requests):
+            error_files.append(filepath)
+            continue
+        file_outputs = [outputs[request['custom_id']] for request in requests]
+        output = file_outputs[0] if len(file_outputs) == 1 else merge_outputs(file_outputs, logger)
+        if not write_refined(filepath, output):
+            error_files.append(filepath)
+    return error_files
+
+
+def find_input_files(data_directory):
+    """
+    Returns the raw JSON and JSON Lines files under a directory, sorted.
+    """
+    return find_outputs(data_directory)
+
+
+def main(argv=None):
     """
     Main function to orchestrate the scraping process by loading the config
     and executing the appropriate scrapers concurrently.
     """
+    parser = argparse.ArgumentParser(description="Generate the fine-tuning dataset from the raw scraped results.")
+    parser.add_argument('--dry-run', action='store_true',
+                        help="Report completion cache hits and projected token spend without calling the API.")
+    parser.add_argument('--batch', action='store_true',
+                        help="Generate through the Batch API; re-running resumes unfinished and failed requests.")
+    args = parser.parse_args(argv)
+
     logger = LoggerFactory.get_logger("JsonFormatter")
     logger.info("Starting the scraping process...")
 
@@ -108,47 +612,34 @@ def main():
 
     data_directory = config['input_directory']
     output_directory = config['output_directory']
-    api_key = config['api_key']
-    os.environ["OPENAI_API_KEY"] = api_key
+    api_key = config.get('api_key')
+    if api_key:
+        os.environ["OPENAI_API_KEY"] = api_key
+    limiter = RateLimiter.from_config(config.get('rate_limits') or DEFAULT_RATE_LIMITS)
+    cache = CompletionCache.from_config(config.get('completion_cache'))
+    chunk_tokens = config.get('chunking', {}).get('max_input_tokens', DEFAULT_CHUNK_TOKENS)
 
-    # Loop through each JSON file, process, and create a corresponding JSONL file
+    # Create a corresponding JSONL file for each JSON file, refining the files concurrently
     if output_directory and not os.path.exists(output_directory):
         os.makedirs(output_directory)
         logger.info(f"Created directory: {output_directory}")
-    error_files = []
-    for root, dirs, files in os.walk(data_directory):
-        for filename in files:
-            if filename.endswith('.json'):
-                filepath = os.path.join(root, filename)
-                print(filename)
-                refined_output_path = filepath.replace('raw', 'refined').replace('.json', '.jsonl')
-                os.makedirs(os.path.dirname(refined_output_path), exist_ok=True)
-                with open(filepath, 'r') as f:
-                    data = json.load(f)
-
-                # Generate response from JSON data
-
-                try:
-                    response_text = generate_response_from_data(data)
-                except Exception as e:
-                    response_text = []
-                    error_files.append(filepath)
-                    logger.error(f"Error occurred during fetching data from api {filepath}: {str(e)} - {traceback.format_exc()} ")
-
-                time.sleep(30)
-                if response_text:
-                    # Create structured data using the Pydantic model
-                    try:
-                        # Write structured response to a .jsonl file with the same name as the input file
-                        with open(refined_output_path, 'w') as jsonl_file:
-                            jsonl_file.write(json.dumps(response_text, indent=4))
-
-                        print(f"Processed and wrote output to {refined_output_path}")
-
-                    except ValidationError as e:
-                        print(f"Validation error for {filename}: {e}")
-
+    filepaths = find_input_files(data_directory)
+    if args.dry_run:
+        dry_run(filepaths, cache, logger, chunk_tokens)
+        return
+    started = time.monotonic()
+    if args.batch:
+        batch_settings = config.get('batch', {})
+        error_files = run_batch(filepaths, HttpBatchClient.from_config(batch_settings), logger, cache, chunk_tokens,
+                                directory=batch_settings.get('directory', DEFAULT_BATCH_DIRECTORY),
+                                poll_seconds=batch_settings.get('poll_seconds', 60),
+                                completion_window=batch_settings.get('completion_window', '24h'))
+    else:
+        error_files = asyncio.run(generate_dataset(filepaths, limiter, logger, cache, chunk_tokens))
+    elapsed = time.monotonic() - started
+    logger.info(f"Refined {len(filepaths) - len(error_files)}/{len(filepaths)} files in {elapsed:.1f}s")
     logger.info(f"error file = {error_files}")
 
 
-main()
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+# Response headers kept with a cached body; enough to rebuild `.text`/`.json()` and to revalidate
+STORED_HEADERS = ('Content-Type', 'ETag', 'Last-Modified')
+
+
+def atomic_write(path: str, data: bytes) -> None:
+    """
+    Writes the bytes to a temporary file next to `path` and renames it into place.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# Share of `max_bytes` the cache is pruned down to once it overflows, so the entries are not walked again on
+# every following store
+PRUNE_RATIO = 0.9
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed HTTP response cache.
+
+    Response bodies are stored once per SHA-256 of their content under `bodies/`, and each
+    request (method, URL, query and form body) has a small JSON entry under `entries/` holding
+    the body hash, the validators (ETag, Last-Modified) and timestamps. Entries younger than
+    `ttl_seconds` are served without touching the network; older ones are revalidated with
+    If-None-Match / If-Modified-Since. Once the bodies exceed `max_bytes`, the least recently
+    used entries are evicted down to `PRUNE_RATIO` of it. In `offline` mode the cache only replays stored responses.
+    """
+
+    def __init__(self, directory: str, ttl_seconds: float = 86400, max_bytes: Optional[int] = None,
+                 offline: bool = False) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            directory (str): Directory holding the cache, created on first write.
+            ttl_seconds (float): How long a stored response is served without revalidation.
+            max_bytes (int): Upper bound on the total size of stored bodies, or None for no limit.
+            offline (bool): Never contact the network; serve stored responses regardless of age.
+        """
+        self.directory = directory
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.offline = offline
+        self._lock = threading.Lock()
+        self._size = self._bodies_size()
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> Optional['ResponseCache']:
+        """
+        Builds a cache from an `http_cache` config section.
+
+        Args:
+            settings (dict): The config section, or None.
+
+        Returns:
+            ResponseCache: The configured cache, or None if the section is missing or disabled.
+        """
+        if not settings or not settings.get('enabled', True):
+            return None
+        return cls(settings['directory'],
+                   ttl_seconds=settings.get('ttl_seconds', 86400),
+                   max_bytes=settings.get('max_bytes'),
+                   offline=settings.get('offline', False))
+
+    @staticmethod
+    def key(request: requests.PreparedRequest) -> str:
+        """
+        Returns the cache key of a request: the hash of its method, full URL and encoded body.
+        """
+        body = request.body or b''
+        if isinstance(body, str):
+            body = body.encode('utf-8')
+        digest = hashlib.sha256(f"{request.method} {request.url}\n".encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()
+
+    def _entry_path(self, key: str) -> str:
+        """Returns the path of the JSON entry for a request key."""
+        return os.path.join(self.directory, 'entries', key[:2], f"{key}.json")
+
+    def _body_path(self, body_hash: str) -> str:
+        """Returns the path of a stored body by its content hash."""
+        return os.path.join(self.directory, 'bodies', body_hash[:2], body_hash)
+
+    def _bodies_size(self) -> int:
+        """Returns the total size in bytes of the stored bodies."""
+        total = 0
+        for root, _, files in os.walk(os.path.join(self.directory, 'bodies')):
+            total += sum(os.path.getsize(os.path.join(root, name)) for name in files)
+        return total
+
+    def lookup(self, key: str) -> Optional[dict]:
+        """
+        Returns the stored entry for the key, or None if it is missing or its body was evicted.
+        """
+        try:
+            with open(self._entry_path(key), 'r') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(self._body_path(entry['body_sha256'])):
+            return None
+        return entry
+
+    def is_fresh(self, entry: dict) -> bool:
+        """
+        Returns True if the entry can be served without revalidation.
+        """
+        return self.offline or time.time() - entry['validated_at'] < self.ttl_seconds
+
+    def conditional_headers(self, entry: dict) -> dict:
+        """
+        Returns the revalidation headers for a stored entry.
+        """
+        headers = {}
+        if entry['headers'].get('ETag'):
+            headers['If-None-Match'] = entry['headers']['ETag']
+        if entry['headers'].get('Last-Modified'):
+            headers['If-Modified-Since'] = entry['headers']['Last-Modified']
+        return headers
+
+    def _write_entry(self, key: str, entry: dict) -> None:
+        """Atomically writes the JSON entry for a request key."""
+        atomic_write(self._entry_path(key), json.dumps(entry).encode('utf-8'))
+
+    def touch(self, key: str, entry: dict, revalidated: bool = False) -> None:
+        """
+        Marks an entry as recently used and, after a 304, as revalidated.
+        """
+        entry['used_at'] = time.time()
+        if revalidated:
+            entry['validated_at'] = entry['used_at']
+        self._write_entry(key, entry)
+
+    def store(self, key: str, url: str, response: requests.Response) -> dict:
+        """
+        Stores a successful response and returns its entry.
+        """
+        body = response.content
+        body_hash = hashlib.sha256(body).hexdigest()
+        now = time.time()
+        entry = {
+            'url': url,
+            'body_sha256': body_hash,
+            'encoding': response.encoding,
+            'headers': {name: response.headers[name] for name in STORED_HEADERS if name in response.headers},
+            'validated_at': now,
+            'used_at': now,
+        }
+        with self._lock:
+            body_path = self._body_path(body_hash)
+            if not os.path.exists(body_path):
+                atomic_write(body_path, body)
+                self._size += len(body)
+            self._write_entry(key, entry)
+            if self.max_bytes is not None and self._size > self.max_bytes:
+                self._prune_locked()
+        return entry
+
+    def build_response(self, entry: dict, request: requests.PreparedRequest) -> requests.Response:
+        """
+        Rebuilds a `requests.Response` from a stored entry.
+        """
+        with open(self._body_path(entry['body_sha256']), 'rb') as f:
+            body = f.read()
+        response = requests.Response()
+        response.status_code = 200
+        response.reason = 'OK'
+        response._content = body
+        response.url = request.url
+        response.request = request
+        response.encoding = entry['encoding']
+        response.headers = CaseInsensitiveDict(entry['headers'])
+        response.from_cache = True
+        return response
+
+    def prune(self) -> None:
+        """
+        Evicts least recently used entries until the stored bodies fit in `PRUNE_RATIO` of `max_bytes`.
+        """
+        with self._lock:
+            self._prune_locked()
+
+    def _prune_locked(self) -> None:
+        """Evicts entries and unreferenced bodies; the caller must hold the lock."""
+        entries = []
+        for root, _, files in os.walk(os.path.join(self.directory, 'entries')):
+            for name in files:
+                if not name.endswith('.json'):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    with open(path, 'r') as f:
+                        entries.append((json.load(f), path))
+                except (OSError, ValueError):
+                    os.remove(path)
+
+        # Drop the oldest entries until the bodies they still reference fit well below the budget, leaving room
+        # for the next stores before the entries have to be walked again
+        target = None if self.max_bytes is None else self.max_bytes * PRUNE_RATIO
+        entries.sort(key=lambda item: item[0]['used_at'])
+        references = {}
+        for entry, _ in entries:
+            references[entry['body_sha256']] = references.get(entry['body_sha256'], 0) + 1
+        sizes = {body_hash: os.path.getsize(self._body_path(body_hash))
+                 for body_hash in references if os.path.exists(self._body_path(body_hash))}
+        total = sum(sizes.values())
+        for entry, path in entries:
+            if target is None or total <= target:
+                break
+            os.remove(path)
+            body_hash = entry['body_sha256']
+            references[body_hash] -= 1
+            if references[body_hash] == 0 and body_hash in sizes:
+                os.remove(self._body_path(body_hash))
+                total -= sizes.pop(body_hash)
+        self._size = total
+
+
+class CachedSession(requests.Session):
+    """
+    `requests.Session` that serves and revalidates responses through a `ResponseCache`.
+
+    GET requests are cached by default. Other methods (e.g. read-only Banner POST endpoints)
+    are only cached when the call passes `cache=True`; passing `cache=False` bypasses the cache.
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None) -> None:
+        """
+        Initializes the session.
+
+        Args:
+            cache (ResponseCache): The response cache to use, or None to behave like a plain session.
+        """
+        super().__init__()
+        self.cache = cache
+
+    def request(self, method, url, cache: Optional[bool] = None, **kwargs):
+        """
+        Sends a request, answering it from the cache when a stored response is fresh
+        and revalidating stale ones with conditional headers.
+        """
+        use_cache = self.cache is not None and (cache if cache is not None else method.upper() == 'GET')
+        if not use_cache:
+            if self.cache is not None and self.cache.offline:
+                raise requests.exceptions.ConnectionError(f"Offline replay: {method} {url} is not cacheable")
+            return super().request(method, url, **kwargs)
+
+        prepared = requests.Request(method.upper(), url, params=kwargs.get('params'),
+                                    data=kwargs.get('data')).prepare()
+        key = self.cache.key(prepared)
+        entry = self.cache.lookup(key)
+        if entry is not None and self.cache.is_fresh(entry):
+            self.cache.touch(key, entry)
+            return self.cache.build_response(entry, prepared)
+        if self.cache.offline:
+            raise requests.exceptions.ConnectionError(f"Offline replay: no cached response for {prepared.url}")
+
+        headers = dict(kwargs.pop('headers', None) or {})
+        if entry is not None:
+            headers.update(self.cache.conditional_headers(entry))
+        response = super().request(method, url, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            self.cache.touch(key, entry, revalidated=True)
+            return self.cache.build_response(entry, prepared)
+        if self.should_store(response):
+            self.cache.store(key, prepared.url, response)
+        return response
+
+    def should_store(self, response: requests.Response) -> bool:
+        """
+        Returns True if a network response may be cached. Subclasses can refuse responses that
+        look successful but are not (e.g. a login page served after a session expired).
+        """
+        return response.status_code == 200
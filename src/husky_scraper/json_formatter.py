@@ -1,12 +1,26 @@
+import argparse
 import json
 import os
+import sys
+import tempfile
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 
-# Directory containing your JSON files
-data_directory = '/Users/aadarsh/PycharmProjects/husky_scraper/results/'  # Replace with your directory path
+# Directory containing your JSON files, resolved against src/husky_scraper so the script runs from any directory
+DEFAULT_DATA_DIRECTORY = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                       '../../results/raw'))
+DEFAULT_OUTPUT = 'fine_tuning_data.jsonl'
+
+# Prompts of the contact pairs emitted for every scraped document. The same footer contacts appear on hundreds
+# of pages, so dedup builds its near-duplicate templates from these strings.
+EMAIL_PROMPT = "What is the email address provided in the '{title}' document?"
+PHONE_PROMPT = "What is the phone number provided in the '{title}' document?"
+HYPERLINK_PROMPT = "Provide the hyperlink for '{text}' from the '{title}' document."
+FOOTER_PROMPTS = (EMAIL_PROMPT, PHONE_PROMPT, HYPERLINK_PROMPT)
 
 
 def process_accreditation_file(data):
-    dataset = []
     # Since the data is a list of lists, we need to flatten it
     for sublist in data:
         for item in sublist:
@@ -15,12 +29,10 @@ def process_accreditation_file(data):
             agency = item.get('Accrediting Agency', 'Unknown Agency')
             prompt = f"Which accrediting agency has accredited the {program} program at {college}?"
             completion = f"The {program} program at {college} is accredited by {agency}."
-            dataset.append({'prompt': prompt, 'completion': completion})
-    return dataset
+            yield {'prompt': prompt, 'completion': completion}
 
 
 def process_course_file(data):
-    dataset = []
     for item in data:
         course_title = item.get('Course Title', 'Unknown Course')
         description = item.get('Description', 'No description available.')
@@ -30,52 +42,53 @@ def process_course_file(data):
         # Course Description
         prompt = f"What is the description of the course '{course_title}'?"
         completion = description
-        dataset.append({'prompt': prompt, 'completion': completion})
+        yield {'prompt': prompt, 'completion': completion}
 
         # Course Prerequisites
         prompt = f"What are the prerequisites for the course '{course_title}'?"
         completion = prerequisites
-        dataset.append({'prompt': prompt, 'completion': completion})
+        yield {'prompt': prompt, 'completion': completion}
 
         # Course Hours
         prompt = f"How many credit hours is the course '{course_title}'?"
         completion = f"The course '{course_title}' is {hours} credit hours."
-        dataset.append({'prompt': prompt, 'completion': completion})
-    return dataset
+        yield {'prompt': prompt, 'completion': completion}
 
 
 def process_faculty_file(data):
-    dataset = []
     for item in data:
         name = item.get('Name', 'Unknown Name')
         title_department = item.get('Title and Department', 'No title or department available.')
         prompt = f"What is the title and department of {name}?"
         completion = f"{name} is {title_department}."
-        dataset.append({'prompt': prompt, 'completion': completion})
-    return dataset
+        yield {'prompt': prompt, 'completion': completion}
 
 
-# Existing function to extract texts recursively
+# Yields the texts of nested scrape output in document order: strings, or the 'text' of a dict when it has one.
+# Walks with an explicit stack of iterators, so deep Content trees neither copy lists at every level nor hit
+# the recursion limit.
 def extract_texts(data):
-    texts = []
-    if isinstance(data, str):
-        texts.append(data.strip())
-    elif isinstance(data, dict):
-        text = data.get('text', '')
-        if text:
-            texts.append(text.strip())
+    stack = [iter((data,))]
+    while stack:
+        for item in stack[-1]:
+            if isinstance(item, str):
+                yield item.strip()
+            elif isinstance(item, dict):
+                text = item.get('text', '')
+                if text:
+                    yield text.strip()
+                else:
+                    stack.append(iter(item.values()))
+                    break
+            elif isinstance(item, list):
+                stack.append(iter(item))
+                break
         else:
-            for value in data.values():
-                texts.extend(extract_texts(value))
-    elif isinstance(data, list):
-        for item in data:
-            texts.extend(extract_texts(item))
-    return texts
+            stack.pop()
 
 
 # Existing function to create prompt-completion pairs
 def create_prompt_completion(data):
-    dataset = []
     for item in data:
         for title, content in item.items():
             policies = content.get('Content', {})
@@ -88,21 +101,21 @@ def create_prompt_completion(data):
             # Include contact info in prompts and completions
             if emails:
                 for email in emails:
-                    prompt = f"What is the email address provided in the '{title}' document?"
+                    prompt = EMAIL_PROMPT.format(title=title)
                     completion = f"The email address is {email}."
-                    dataset.append({"prompt": prompt, "completion": completion})
+                    yield {"prompt": prompt, "completion": completion}
 
             if phone_numbers:
                 for phone in phone_numbers:
-                    prompt = f"What is the phone number provided in the '{title}' document?"
+                    prompt = PHONE_PROMPT.format(title=title)
                     completion = f"The phone number is {phone}."
-                    dataset.append({"prompt": prompt, "completion": completion})
+                    yield {"prompt": prompt, "completion": completion}
 
             if hyperlinks:
                 for link in hyperlinks:
-                    prompt = f"Provide the hyperlink for '{link.get('text', 'the provided link')}' from the '{title}' document."
+                    prompt = HYPERLINK_PROMPT.format(text=link.get('text', 'the provided link'), title=title)
                     completion = f"The hyperlink is {link.get('url', '')}."
-                    dataset.append({"prompt": prompt, "completion": completion})
+                    yield {"prompt": prompt, "completion": completion}
 
             for section, section_content in policies.items():
                 if section == 'url':
@@ -113,51 +126,126 @@ def create_prompt_completion(data):
                         for text in extracted_texts:
                             prompt = f"Explain the policy section '{subsection}' in the context of '{section}'."
                             completion = text
-                            dataset.append({
+                            yield {
                                 "prompt": prompt,
                                 "completion": completion
-                            })
+                            }
                 else:
                     extracted_texts = extract_texts(section_content)
                     for text in extracted_texts:
                         prompt = f"Provide information on '{section}' from the university policies."
                         completion = text
-                        dataset.append({
+                        yield {
                             "prompt": prompt,
                             "completion": completion
-                        })
-    return dataset
-
-
-# Initialize lists to hold all data and the final dataset
-all_data = []
-dataset = []
-
-# Read and process each JSON file in the directory and its subdirectories
-for root, dirs, files in os.walk(data_directory):
-    for filename in files:
-        if filename.endswith('.json'):
-            filepath = os.path.join(root, filename)
-            with open(filepath, 'r') as f:
-                data = json.load(f)
-                # Check the filename to determine how to process it
-                if filename == 'northeastern_accreditation.json':
-                    dataset.extend(process_accreditation_file(data))
-                elif filename == 'northeastern_course_descriptions.json':
-                    dataset.extend(process_course_file(data))
-                elif filename == 'northeastern_faculty_members.json':
-                    dataset.extend(process_faculty_file(data))
-                else:
-                    all_data.extend(data)
-
-# Process the remaining data using the existing function
-if all_data:
-    dataset.extend(create_prompt_completion(all_data))
-
-# Save to JSONL file
-with open('fine_tuning_data.jsonl', 'w') as f:
-    for entry in dataset:
-        json.dump(entry, f)
-        f.write('\n')
-
-print("Dataset has been successfully created and saved to 'fine_tuning_data.jsonl'.")
+                        }
+
+
+# Files with a dedicated generator, by name without the .json/.jsonl extension; every other file is scraped
+# page content
+FILE_PROCESSORS = {
+    'northeastern_accreditation': process_accreditation_file,
+    'northeastern_course_descriptions': process_course_file,
+    'northeastern_faculty_members': process_faculty_file,
+}
+# Files sent to a worker at once; keeps scheduling overhead low for directories of small files
+FILES_PER_BATCH = 8
+
+
+def find_json_files(data_directory):
+    # Every JSON and JSON Lines file in the directory and its subdirectories, in a stable order. The scrapers
+    # write JSON Lines by default; a .json output next to the .jsonl of the same task is from an older run.
+    filepaths = set(os.path.join(root, filename)
+                    for root, dirs, files in os.walk(data_directory)
+                    for filename in files if filename.endswith(('.json', '.jsonl')))
+    return sorted(path for path in filepaths if not (path.endswith('.json') and path + 'l' in filepaths))
+
+
+def load_file(filepath):
+    # A JSON Lines output holds one record per line, the same records a JSON output holds in an array
+    with open(filepath, 'r') as f:
+        if filepath.endswith('.jsonl'):
+            return [json.loads(line) for line in f if line.strip()]
+        return json.load(f)
+
+
+def iter_file_entries(filepath):
+    # Streams the prompt-completion pairs of one file through the generator matching its name
+    data = load_file(filepath)
+    process = FILE_PROCESSORS.get(os.path.splitext(os.path.basename(filepath))[0], create_prompt_completion)
+    yield from process(data)
+
+
+def build_files(filepaths):
+    # Runs in a worker process: returns the JSONL lines of a batch of files and how many pairs they hold
+    lines = []
+    for filepath in filepaths:
+        for entry in iter_file_entries(filepath):
+            lines.append(json.dumps(entry) + '\n')
+    return ''.join(lines), len(lines)
+
+
+def build_dataset(data_directory=DEFAULT_DATA_DIRECTORY, output_file=DEFAULT_OUTPUT, workers=None,
+                  files_per_batch=FILES_PER_BATCH):
+    # Builds the fine-tuning JSONL from every scraper output under data_directory. Batches of files are processed
+    # on a process pool and written as soon as they are ready, in file order, so the output is the same for
+    # any number of workers. At most two batches per worker are in flight, so memory does not grow with
+    # the size of the crawl. The output is written to a temporary file and moved into place once complete,
+    # so a missing or empty data directory, or a failed build, leaves an existing dataset untouched.
+    # Returns (files, pairs); raises FileNotFoundError if data_directory is missing or holds no output.
+    workers = workers or os.cpu_count() or 1
+    if not os.path.isdir(data_directory):
+        raise FileNotFoundError(f"Data directory not found: {os.path.abspath(data_directory)}")
+    filepaths = find_json_files(data_directory)
+    if not filepaths:
+        raise FileNotFoundError(f"No JSON or JSON Lines files found under {os.path.abspath(data_directory)}")
+    output_dir = os.path.dirname(output_file)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    pairs = 0
+    fd, tmp_path = tempfile.mkstemp(dir=output_dir or '.', prefix='.tmp-', suffix='.jsonl')
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as executor, os.fdopen(fd, 'w') as f:
+            pending = deque()
+            for start in range(0, len(filepaths), files_per_batch):
+                pending.append(executor.submit(build_files, filepaths[start:start + files_per_batch]))
+                if len(pending) >= 2 * workers:
+                    lines, count = pending.popleft().result()
+                    f.write(lines)
+                    pairs += count
+            while pending:
+                lines, count = pending.popleft().result()
+                f.write(lines)
+                pairs += count
+        os.replace(tmp_path, output_file)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return len(filepaths), pairs
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the fine-tuning JSONL dataset from the scraped JSON files.")
+    parser.add_argument('data_directory', nargs='?', default=DEFAULT_DATA_DIRECTORY,
+                        help="Directory of scraped JSON and JSON Lines files, searched recursively.")
+    parser.add_argument('--output', default=DEFAULT_OUTPUT, help="JSONL file to write.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per core).")
+    parser.add_argument('--files-per-batch', type=int, default=FILES_PER_BATCH, help="Files sent to a worker at once.")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    try:
+        files, pairs = build_dataset(args.data_directory, args.output, args.workers, args.files_per_batch)
+    except FileNotFoundError as e:
+        print(f"Error: {e}. '{args.output}' was left unchanged.")
+        return 1
+    elapsed = time.perf_counter() - started
+    print(f"Dataset of {pairs} pairs from {files} files has been successfully created and saved to "
+          f"'{args.output}' in {elapsed:.2f}s.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
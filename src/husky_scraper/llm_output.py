@@ -0,0 +1,122 @@
+import ast
+import json
+import re
+from typing import Any, Callable, List, Tuple
+
+from pydantic import BaseModel, ValidationError
+
+_CODE_FENCE = re.compile(r'^\s*```[a-zA-Z]*\s*\n?(.*?)\n?\s*```\s*$', re.S)
+_TRAILING_COMMA = re.compile(r',\s*([}\]])')
+
+
+# Define Pydantic model for structured output
+class PolicyResponseModel(BaseModel):
+    prompt: str
+    completion: str
+
+
+class PolicyDatasetModel(BaseModel):
+    """
+    The output requested from the model: the prompt/completion pairs generated for one chunk.
+    """
+    dataset: List[PolicyResponseModel]
+
+
+class OutputParseError(ValueError):
+    """
+    Raised when a model output cannot be decoded or does not match `PolicyDatasetModel`.
+    """
+
+
+def _strip_code_fence(text: str) -> str:
+    match = _CODE_FENCE.match(text)
+    return match.group(1) if match else text
+
+
+def _outer_object(text: str) -> str:
+    start, end = text.find('{'), text.rfind('}')
+    return text[start:end + 1] if 0 <= start < end else text
+
+
+def _remove_trailing_commas(text: str) -> str:
+    return _TRAILING_COMMA.sub(r'\1', text)
+
+
+def _close_brackets(text: str) -> str:
+    """Closes the strings, objects and arrays left open by an output cut off at max_tokens."""
+    stack = []
+    in_string = escaped = False
+    for char in text:
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == '\\':
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char in '{[':
+            stack.append('}' if char == '{' else ']')
+        elif char in '}]' and stack:
+            stack.pop()
+    text = text + '"' if in_string else text
+    return _remove_trailing_commas(text.rstrip().rstrip(',')) + ''.join(reversed(stack))
+
+
+# Repairs tried in order, each on the result of the previous one; the pass is bounded by their number
+REPAIRS: Tuple[Callable[[str], str], ...] = (_strip_code_fence, _outer_object, _remove_trailing_commas, _close_brackets)
+
+
+def decode_json(content: str) -> Any:
+    """
+    Decodes a model output with `json.loads`. Outputs that are not valid JSON go through a bounded repair
+    pass: code fences, text around the outer object, trailing commas and brackets left open by truncation
+    are fixed one at a time, and Python literals (single quotes, True/None) are accepted last.
+
+    Raises:
+        OutputParseError: If no repair makes the output decodable.
+    """
+    if not isinstance(content, str):
+        raise OutputParseError(f"Expected the output text, got {type(content).__name__}")
+    try:
+        return json.loads(content)
+    except json.JSONDecodeError as e:
+        error = e
+    text = content
+    for repair in REPAIRS:
+        text = repair(text)
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    try:
+        return ast.literal_eval(_outer_object(_strip_code_fence(content)))
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        raise OutputParseError(f"Output is not valid JSON: {error}") from None
+
+
+def parse_dataset(content: str) -> PolicyDatasetModel:
+    """
+    Decodes and validates a model output. A bare list of pairs or a single pair is accepted as the
+    dataset it stands for.
+
+    Args:
+        content (str): The raw model output.
+
+    Returns:
+        PolicyDatasetModel: The validated dataset.
+
+    Raises:
+        OutputParseError: If the output cannot be decoded or does not match the schema.
+    """
+    data = decode_json(content)
+    if isinstance(data, list):
+        data = {'dataset': data}
+    elif isinstance(data, dict) and 'dataset' not in data and {'prompt', 'completion'} <= data.keys():
+        data = {'dataset': [data]}
+    try:
+        return PolicyDatasetModel.model_validate(data)
+    except ValidationError as e:
+        raise OutputParseError(f"Output does not match the dataset schema: {e.error_count()} errors, "
+                               f"first: {e.errors()[0]['msg']} at {e.errors()[0]['loc']}") from None
@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+from src.husky_scraper.fetcher import canonicalize_url
+from src.husky_scraper.http_cache import atomic_write
+
+
+def content_hash(text: str) -> str:
+    """
+    Returns the SHA-256 hex digest of a page or output text.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+def file_hash(path: str) -> Optional[str]:
+    """
+    Returns the SHA-256 hex digest of a file's bytes, or None if it cannot be read.
+    """
+    digest = hashlib.sha256()
+    try:
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1 << 20), b''):
+                digest.update(block)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+class ScrapeManifest:
+    """
+    Records the content hash of every fetched page and, per output file, the page hashes it
+    was built from and the hash of the written output. Scrapers consult it to skip parsing
+    and rewriting outputs whose source pages have not changed since the previous run.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Loads the manifest from disk, starting empty if it does not exist yet.
+
+        Args:
+            path (str): Location of the manifest JSON file.
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self.pages: Dict[str, str] = {}
+        self.outputs: Dict[str, dict] = {}
+        self.changed = set()
+        self.unchanged = set()
+        if os.path.exists(path):
+            with open(path, 'r') as f:
+                data = json.load(f)
+            self.pages = data.get('pages', {})
+            self.outputs = data.get('outputs', {})
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> Optional['ScrapeManifest']:
+        """
+        Builds a manifest from a `manifest` config section.
+
+        Args:
+            settings (dict): The config section, or None.
+
+        Returns:
+            ScrapeManifest: The loaded manifest, or None if the section is missing or disabled.
+        """
+        if not settings or not settings.get('enabled', True):
+            return None
+        return cls(settings['path'])
+
+    def page_unchanged(self, url: str, page_hash: str) -> bool:
+        """
+        Returns True if the page had the same content the last time it was recorded.
+        """
+        with self._lock:
+            return self.pages.get(canonicalize_url(url)) == page_hash
+
+    def task_unchanged(self, output_file: str, page_hashes: Dict[str, str]) -> bool:
+        """
+        Returns True if the output file was built from exactly these pages and is still intact on disk.
+        An unchanged task is remembered for the run summary.
+
+        Args:
+            output_file (str): The task's output file.
+            page_hashes (Dict[str, str]): Content hash of every page fetched for the task, keyed by URL.
+        """
+        pages = {canonicalize_url(url): page_hash for url, page_hash in page_hashes.items()}
+        with self._lock:
+            recorded = self.outputs.get(output_file)
+        if recorded is None or recorded['pages'] != pages:
+            return False
+        if file_hash(output_file) != recorded['output_sha256']:
+            return False
+        with self._lock:
+            self.unchanged.add(output_file)
+        return True
+
+    def record(self, output_file: str, page_hashes: Dict[str, str]) -> bool:
+        """
+        Records the pages an output file was just written from, along with the output's hash.
+
+        Args:
+            output_file (str): The task's output file.
+            page_hashes (Dict[str, str]): Content hash of every page fetched for the task, keyed by URL.
+
+        Returns:
+            bool: True if the written output differs from the previously recorded one.
+        """
+        pages = {canonicalize_url(url): page_hash for url, page_hash in page_hashes.items()}
+        output_sha256 = file_hash(output_file)
+        with self._lock:
+            previous = self.outputs.get(output_file)
+            changed = previous is None or previous['output_sha256'] != output_sha256
+            self.pages.update(pages)
+            self.outputs[output_file] = {'pages': pages, 'output_sha256': output_sha256}
+            if changed:
+                self.changed.add(output_file)
+            else:
+                self.unchanged.add(output_file)
+        return changed
+
+    def save(self) -> None:
+        """
+        Atomically writes the manifest to disk.
+        """
+        with self._lock:
+            data = json.dumps({'pages': self.pages, 'outputs': self.outputs}, indent=4, sort_keys=True)
+        atomic_write(self.path, data.encode('utf-8'))
@@ -0,0 +1,118 @@
+from typing import Iterable, Iterator, Optional, Tuple
+
+from bs4 import BeautifulSoup, CData, NavigableString, SoupStrainer, Tag
+
+# lxml is faster, but repairs invalid nesting (e.g. a <ul> or <div> inside a <p>) differently and drops
+# text the scrapers read, so html.parser stays the default and the speedup comes from the strainers
+DEFAULT_PARSER = 'html.parser'
+
+# Targets of the catalog scrapers, used to restrict the parsed tree to the containers they read
+TITLE = SoupStrainer('title')
+HEADING = SoupStrainer('h1')
+TEXT_CONTAINER = SoupStrainer('div', id='textcontainer')
+COURSE_BLOCKS = SoupStrainer('div', class_='courseblock')
+FACULTY_BLOCKS = SoupStrainer('p', class_='keeptogether')
+CIP_TABLE = SoupStrainer('table', class_='visible grid sc_majorciptable')
+LINKS = SoupStrainer('a', href=True)
+
+# Events emitted by `iter_events`
+START = 'start'
+END = 'end'
+TEXT = 'text'
+
+# String types that `Tag.get_text()` returns: no comments, scripts, stylesheets or doctypes
+TEXT_TYPES = (NavigableString, CData)
+
+_settings = {'parser': DEFAULT_PARSER, 'use_strainers': True}
+
+
+def configure_parser(parser: Optional[str] = None, use_strainers: Optional[bool] = None) -> None:
+    """
+    Changes the tree builder and strainer usage of every scraper in the process.
+    `configure_parser('html.parser', use_strainers=False)` restores the original full-tree parsing.
+
+    Args:
+        parser (str): The BeautifulSoup tree builder, e.g. 'lxml' or 'html.parser'.
+        use_strainers (bool): Whether scrapers only build the containers they read.
+    """
+    if parser is not None:
+        _settings['parser'] = parser
+    if use_strainers is not None:
+        _settings['use_strainers'] = use_strainers
+
+
+def parser_settings() -> dict:
+    """
+    Returns the current tree builder and strainer usage, as accepted by `configure_parser`.
+    """
+    return dict(_settings)
+
+
+def containers(*ids: str) -> SoupStrainer:
+    """
+    Returns a strainer keeping the elements with any of the given ids, along with everything inside them.
+    """
+    return SoupStrainer(id=list(ids))
+
+
+def make_soup(html: str, parse_only: Optional[SoupStrainer] = None) -> BeautifulSoup:
+    """
+    Parses HTML with the configured tree builder, building only the elements matched by `parse_only`.
+
+    Args:
+        html (str): The HTML content to parse.
+        parse_only (SoupStrainer): Restricts the tree to matching elements and their descendants;
+            None builds the whole page.
+
+    Returns:
+        BeautifulSoup: The parsed tree.
+    """
+    if not _settings['use_strainers']:
+        parse_only = None
+    return BeautifulSoup(html, _settings['parser'], parse_only=parse_only)
+
+
+def make_soups(html: str, strainers: Iterable[SoupStrainer]) -> list:
+    """
+    Parses the same HTML once per strainer, for scrapers that read several unrelated parts of a page
+    (e.g. the `<title>` and a content container). Each pass only builds its own small tree.
+
+    Args:
+        html (str): The HTML content to parse.
+        strainers (Iterable[SoupStrainer]): One strainer per part.
+
+    Returns:
+        list: One parsed tree per strainer. Without strainers the same full tree is shared.
+    """
+    strainers = list(strainers)
+    if not _settings['use_strainers']:
+        soup = make_soup(html)
+        return [soup] * len(strainers)
+    return [make_soup(html, strainer) for strainer in strainers]
+
+
+def iter_events(element: Tag) -> Iterator[Tuple[str, object]]:
+    """
+    Walks the descendants of an element once, depth-first and in document order, without recursion.
+
+    Yields `(START, tag)` when a tag opens, `(END, tag)` once all of its descendants were walked and
+    `(TEXT, string)` for every string `element.get_text()` would include. Consumers can build the
+    text of any tag from the strings seen between its START and END events.
+
+    Args:
+        element (Tag): The element whose descendants are walked; it is not emitted itself.
+
+    Yields:
+        Tuple[str, object]: The event name and the tag or string.
+    """
+    stack = list(reversed(element.contents))
+    while stack:
+        node = stack.pop()
+        if type(node) is tuple:
+            yield node
+        elif isinstance(node, Tag):
+            yield START, node
+            stack.append((END, node))
+            stack.extend(reversed(node.contents))
+        elif type(node) in TEXT_TYPES:
+            yield TEXT, node
@@ -0,0 +1,96 @@
+import asyncio
+import contextlib
+import time
+from typing import AsyncIterator, Optional
+
+
+class TokenBucket:
+    """
+    Asynchronous token bucket refilled continuously at a per-minute rate. Callers wait in arrival order
+    until enough tokens are available, so a burst never exceeds the bucket capacity.
+    """
+
+    def __init__(self, per_minute: float, capacity: Optional[float] = None) -> None:
+        """
+        Initializes a full bucket.
+
+        Args:
+            per_minute (float): Tokens added per minute.
+            capacity (float): Maximum number of stored tokens; defaults to one minute's worth.
+        """
+        self.rate = per_minute / 60.0
+        self.capacity = capacity if capacity is not None else per_minute
+        self.tokens = self.capacity
+        self._updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated_at) * self.rate)
+        self._updated_at = now
+
+    async def acquire(self, amount: float = 1) -> None:
+        """
+        Waits until `amount` tokens are available and takes them. Requests larger than the capacity
+        wait for a full bucket instead of waiting forever.
+        """
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            self._refill()
+            while self.tokens < amount:
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= amount
+
+
+class RateLimiter:
+    """
+    Client-side limits of an API account: requests per minute, tokens per minute and concurrent requests.
+    A rate-limit response from the server pauses every caller, not only the one that received it.
+    """
+
+    def __init__(self, requests_per_minute: float, tokens_per_minute: float, concurrency: int = 8) -> None:
+        """
+        Initializes the limiter.
+
+        Args:
+            requests_per_minute (float): The account's RPM limit.
+            tokens_per_minute (float): The account's TPM limit.
+            concurrency (int): Maximum number of requests in flight.
+        """
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute)
+        self._slots = asyncio.Semaphore(concurrency)
+        self._paused_until = 0.0
+
+    @classmethod
+    def from_config(cls, settings: dict) -> 'RateLimiter':
+        """
+        Creates a limiter from a `rate_limits` config section with `requests_per_minute`,
+        `tokens_per_minute` and optionally `concurrency`.
+        """
+        return cls(settings['requests_per_minute'], settings['tokens_per_minute'], settings.get('concurrency', 8))
+
+    def pause(self, seconds: float) -> None:
+        """
+        Holds back every request that has not started yet for `seconds`, e.g. after a 429.
+        """
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    @contextlib.asynccontextmanager
+    async def limit(self, tokens: float) -> AsyncIterator[None]:
+        """
+        Holds one of the concurrent request slots for the duration of the block, after waiting for a
+        request and `tokens` tokens under the per-minute limits.
+
+        Args:
+            tokens (float): The tokens the request counts against the TPM limit.
+        """
+        async with self._slots:
+            delay = self._paused_until - time.monotonic()
+            while delay > 0:
+                await asyncio.sleep(delay)
+                delay = self._paused_until - time.monotonic()
+            await self.requests.acquire(1)
+            await self.tokens.acquire(tokens)
+            yield
@@ -0,0 +1,150 @@
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional
+
+PENDING = 'pending'
+DONE = 'done'
+FAILED = 'failed'
+
+
+class RunJournal:
+    """
+    Durable record of a scraping run, stored in a local SQLite file. Every task and every URL
+    of a task is tracked as pending, done or failed, so an interrupted run can be resumed by
+    re-running only the tasks that did not finish or that failed.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Opens (and if needed creates) the journal database.
+
+        Args:
+            path (str): Location of the SQLite file.
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tasks ("
+            "name TEXT PRIMARY KEY, status TEXT NOT NULL, error TEXT, updated_at REAL)")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS urls ("
+            "task TEXT NOT NULL, url TEXT NOT NULL, status TEXT NOT NULL, error TEXT, updated_at REAL, "
+            "PRIMARY KEY (task, url))")
+
+    @classmethod
+    def from_config(cls, settings: Optional[dict]) -> Optional['RunJournal']:
+        """
+        Opens a journal from a `run_journal` config section.
+
+        Args:
+            settings (dict): The config section, or None.
+
+        Returns:
+            RunJournal: The opened journal, or None if the section is missing or disabled.
+        """
+        if not settings or not settings.get('enabled', True):
+            return None
+        return cls(settings['path'])
+
+    def _register(self, task_urls: Dict[str, List[str]]) -> None:
+        """Inserts tasks and URLs that are not in the journal yet as pending; the caller must hold the lock."""
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO tasks (name, status, updated_at) VALUES (?, ?, ?)",
+            [(task, PENDING, now) for task in task_urls])
+        self._conn.executemany(
+            "INSERT OR IGNORE INTO urls (task, url, status, updated_at) VALUES (?, ?, ?, ?)",
+            [(task, url, PENDING, now) for task, urls in task_urls.items() for url in urls])
+
+    def start(self, task_urls: Dict[str, List[str]]) -> None:
+        """
+        Starts a fresh run: forgets the previous run and marks every task and URL pending.
+
+        Args:
+            task_urls (Dict[str, List[str]]): The URLs of every task in the run, keyed by task name.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._conn.execute("DELETE FROM tasks")
+            self._conn.execute("DELETE FROM urls")
+            self._register(task_urls)
+            self._conn.execute("COMMIT")
+
+    def resume(self, task_urls: Dict[str, List[str]]) -> List[str]:
+        """
+        Resumes the previous run. Tasks that are not in the journal yet are added as pending.
+
+        Args:
+            task_urls (Dict[str, List[str]]): The URLs of every task in the run, keyed by task name.
+
+        Returns:
+            List[str]: The tasks that still have to run: pending ones and failed ones.
+        """
+        with self._lock:
+            self._conn.execute("BEGIN")
+            self._register(task_urls)
+            self._conn.execute("COMMIT")
+            rows = self._conn.execute("SELECT name FROM tasks WHERE status != ?", (DONE,)).fetchall()
+        remaining = {name for name, in rows}
+        return [task for task in task_urls if task in remaining]
+
+    def task_finished(self, task: str, succeeded: bool, error: Optional[str] = None) -> None:
+        """
+        Marks a task as done or failed.
+        """
+        with self._lock:
+            self._conn.execute("UPDATE tasks SET status = ?, error = ?, updated_at = ? WHERE name = ?",
+                               (DONE if succeeded else FAILED, error, time.time(), task))
+
+    def url_finished(self, task: str, url: str, succeeded: bool, error: Optional[str] = None) -> None:
+        """
+        Marks one URL of a task as done or failed.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO urls (task, url, status, error, updated_at) VALUES (?, ?, ?, ?, ?)",
+                (task, url, DONE if succeeded else FAILED, error, time.time()))
+
+    def for_task(self, task: str) -> 'TaskJournal':
+        """
+        Returns a journal view bound to one task, handed to the task's scraper.
+        """
+        return TaskJournal(self, task)
+
+    def counts(self) -> Dict[str, int]:
+        """
+        Returns the number of tasks in each status.
+        """
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return dict(rows)
+
+    def close(self) -> None:
+        """
+        Closes the database connection.
+        """
+        with self._lock:
+            self._conn.close()
+
+
+class TaskJournal:
+    """
+    View of a `RunJournal` bound to a single task, used by scrapers to record per-URL progress.
+    """
+
+    def __init__(self, journal: RunJournal, task: str) -> None:
+        self.journal = journal
+        self.task = task
+
+    def url_finished(self, url: str, succeeded: bool, error: Optional[str] = None) -> None:
+        """
+        Marks one URL of the task as done or failed.
+        """
+        self.journal.url_finished(self.task, url, succeeded, error)
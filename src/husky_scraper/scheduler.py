@@ -0,0 +1,139 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import timedelta
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.husky_scraper.fetcher import get_fetch_engine
+
+
+class ProgressReporter:
+    """
+    Thread-safe progress tracker that logs completed tasks, throughput and an ETA.
+    """
+
+    def __init__(self, total: int, logger, report_every: int = 10) -> None:
+        """
+        Initializes the reporter.
+
+        Args:
+            total (int): Total number of tasks in the run.
+            logger: The logger instance for logging.
+            report_every (int): Log a progress line every this many finished tasks.
+        """
+        self.total = total
+        self.logger = logger
+        self.report_every = max(1, report_every)
+        self.done = 0
+        self.failed = 0
+        self.started_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def task_finished(self, task_name: str, succeeded: bool) -> None:
+        """
+        Records a finished task and periodically logs the overall progress.
+
+        Args:
+            task_name (str): Name of the task that finished.
+            succeeded (bool): Whether the task completed without errors.
+        """
+        with self._lock:
+            self.done += 1
+            if not succeeded:
+                self.failed += 1
+            if self.done % self.report_every == 0 or self.done == self.total:
+                self.logger.info(self.summary())
+
+    def summary(self) -> str:
+        """
+        Returns a one-line description of the current progress.
+        """
+        elapsed = time.monotonic() - self.started_at
+        rate = self.done / elapsed if elapsed > 0 else 0.0
+        remaining = (self.total - self.done) / rate if rate > 0 else 0.0
+        return (f"Progress: {self.done}/{self.total} tasks ({self.failed} failed), "
+                f"{rate:.2f} tasks/s, elapsed {timedelta(seconds=int(elapsed))}, "
+                f"ETA {timedelta(seconds=int(remaining))}")
+
+
+class TaskScheduler:
+    """
+    Runs scraping tasks on a worker pool. All workers share the process-wide fetch engine,
+    so per-host concurrency and the global request-rate cap apply across the whole run.
+    """
+
+    def __init__(self, logger, max_workers: int = 8, max_per_host: int = 8,
+                 requests_per_second: Optional[float] = None) -> None:
+        """
+        Initializes the scheduler and applies its politeness limits to the fetch engine.
+
+        Args:
+            logger: The logger instance for logging.
+            max_workers (int): Number of tasks scraped at the same time.
+            max_per_host (int): Maximum number of concurrent requests per host.
+            requests_per_second (float): Global cap on requests started per second, or None for no cap.
+        """
+        self.logger = logger
+        self.max_workers = max_workers
+        get_fetch_engine().configure(max_per_host=max_per_host, requests_per_second=requests_per_second)
+
+    @classmethod
+    def from_config(cls, config: dict, logger) -> 'TaskScheduler':
+        """
+        Builds a scheduler from the optional `scheduler` section of the scraper config.
+
+        Args:
+            config (dict): The loaded scraper configuration.
+            logger: The logger instance for logging.
+
+        Returns:
+            TaskScheduler: The configured scheduler.
+        """
+        settings = config.get('scheduler') or {}
+        return cls(logger,
+                   max_workers=settings.get('max_workers', 8),
+                   max_per_host=settings.get('max_per_host', 8),
+                   requests_per_second=settings.get('requests_per_second'))
+
+    def run(self, jobs: List[Tuple[str, Callable[[], bool]]],
+            exclusive_keys: Optional[Dict[str, str]] = None) -> Dict[str, bool]:
+        """
+        Runs all jobs on the worker pool and reports progress as they finish.
+
+        Args:
+            jobs (List[Tuple[str, Callable[[], bool]]]): Task names with the callable that scrapes them.
+                Each callable returns True when the task succeeded.
+            exclusive_keys (Dict[str, str]): Optional task name to key mapping (e.g. the output file).
+                Tasks sharing a key never run at the same time.
+
+        Returns:
+            Dict[str, bool]: Whether each task succeeded, keyed by task name.
+        """
+        exclusive_keys = exclusive_keys or {}
+        locks = {key: threading.Lock() for key in set(exclusive_keys.values())}
+
+        def run_job(task_name: str, job: Callable[[], bool]) -> bool:
+            key = exclusive_keys.get(task_name)
+            if key is None:
+                return job()
+            with locks[key]:
+                return job()
+
+        progress = ProgressReporter(len(jobs), self.logger)
+        results = {}
+        self.logger.info(f"Scheduling {len(jobs)} tasks on {self.max_workers} workers")
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="scraper") as executor:
+            futures = {executor.submit(run_job, task_name, job): task_name for task_name, job in jobs}
+            for future in as_completed(futures):
+                task_name = futures[future]
+                try:
+                    results[task_name] = bool(future.result())
+                except Exception as e:
+                    self.logger.error(f"Unhandled error in task {task_name}: {str(e)}")
+                    results[task_name] = False
+                progress.task_finished(task_name, results[task_name])
+
+        failed = [task_name for task_name, succeeded in results.items() if not succeeded]
+        if failed:
+            self.logger.warning(f"{len(failed)} tasks failed: {failed}")
+        return results
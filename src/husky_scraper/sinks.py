@@ -0,0 +1,202 @@
+import json
+import os
+import tempfile
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+
+def read_jsonl(path: str) -> Iterator[Any]:
+    """
+    Reads records from a JSON Lines file. A truncated last line, left behind by a crash
+    in the middle of a write, is ignored.
+
+    Args:
+        path (str): The JSON Lines file to read.
+
+    Yields:
+        The decoded records, in file order.
+    """
+    with open(path, 'r') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            if line.strip():
+                yield json.loads(line)
+
+
+def load_records(path: str) -> List[Any]:
+    """
+    Loads the records of a scraper output, written either as a JSON array or as JSON Lines.
+
+    Args:
+        path (str): A `.json` or `.jsonl` output file.
+
+    Returns:
+        List[Any]: The records, in file order.
+    """
+    if path.endswith('.jsonl'):
+        return list(read_jsonl(path))
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def find_outputs(directory: str) -> List[str]:
+    """
+    Returns the JSON and JSON Lines scraper outputs under a directory, sorted. A `.json` output is
+    left out when a `.jsonl` output of the same task sits next to it, as it was written by an older run.
+    """
+    paths = set(os.path.join(root, name) for root, _, names in os.walk(directory)
+                for name in names if name.endswith(('.json', '.jsonl')))
+    return sorted(path for path in paths if not (path.endswith('.json') and path + 'l' in paths))
+
+
+def indent_json(record: Any, indent: int = 4) -> str:
+    """
+    Serializes a record the way `json.dump(records, f, indent=indent)` lays out one array element.
+    """
+    return '\n'.join(' ' * indent + line for line in json.dumps(record, indent=indent).split('\n'))
+
+
+class JsonlSink:
+    """
+    Append-only JSON Lines sink. Each record is serialized exactly once, written with a single
+    write call and flushed to disk, so a crash loses at most the record being written.
+    Records can be written from several threads.
+    The sink can optionally be finalized into a JSON array file, ordered by record index.
+    """
+
+    def __init__(self, path: str, logger, durable: bool = True, append: bool = False, keyed: bool = False) -> None:
+        """
+        Opens the sink, truncating any previous content at `path` unless `append` is set. When appending,
+        the complete records already in the file are recovered and a line torn by a crash is cut off, so
+        the file continues where the crashed run stopped.
+
+        Args:
+            path (str): The JSON Lines file to append to.
+            logger: The logger instance for logging.
+            durable (bool): fsync after every record in addition to flushing.
+            append (bool): Keep and recover the records already in the file.
+            keyed (bool): Store every record with its index, a key and metadata, so that a recovered sink
+                tells in `recovered` which records it already holds.
+
+        Raises:
+            ValueError: If `keyed` is set and an existing line was not written by a keyed sink.
+        """
+        self.path = path
+        self.logger = logger
+        self.durable = durable
+        self.keyed = keyed
+        self.count = 0
+        self.recovered: Dict[int, dict] = {}
+        self._offsets: List[Tuple[int, int, int]] = []
+        self._lock = threading.Lock()
+        output_dir = os.path.dirname(path)
+        if output_dir and not os.path.exists(output_dir):
+            os.makedirs(output_dir, exist_ok=True)
+            logger.info(f"Created directory: {output_dir}")
+        if append and os.path.exists(path):
+            self._recover()
+        self._file = open(path, 'ab' if append else 'wb')
+
+    def _recover(self) -> None:
+        """
+        Indexes the complete records already in the file and truncates a torn last line.
+        """
+        offset = 0
+        with open(self.path, 'r+b') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                if line.strip():
+                    index = self.count
+                    if self.keyed:
+                        entry = json.loads(line)
+                        if not isinstance(entry, dict) or not {'index', 'key', 'meta', 'record'} <= entry.keys():
+                            raise ValueError(f"{self.path} was not written by a keyed sink")
+                        index = entry['index']
+                        self.recovered[index] = {'key': entry['key'], 'meta': entry['meta']}
+                    self._offsets.append((index, offset, len(line)))
+                    self.count += 1
+                offset += len(line)
+            f.truncate(offset)
+        if self.count:
+            self.logger.info(f"Recovered {self.count} records from {self.path}")
+
+    def __enter__(self) -> 'JsonlSink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def write(self, record: Any, index: Optional[int] = None, key: Optional[str] = None, meta: Any = None) -> None:
+        """
+        Appends one record.
+
+        Args:
+            record: The JSON-serializable record.
+            index (int): Position of the record in the finalized array; defaults to arrival order.
+            key (str): Identifies the record in `recovered` after a restart; keyed sinks only.
+            meta: JSON-serializable data returned with the key in `recovered`; keyed sinks only.
+        """
+        with self._lock:
+            if index is None:
+                index = self.count
+            if self.keyed:
+                record = {'index': index, 'key': key, 'meta': meta, 'record': record}
+            line = (json.dumps(record) + '\n').encode('utf-8')
+            offset = self._file.tell()
+            self._file.write(line)
+            self._file.flush()
+            if self.durable:
+                os.fsync(self._file.fileno())
+            self._offsets.append((index, offset, len(line)))
+            self.count += 1
+
+    def close(self) -> None:
+        """
+        Closes the underlying file. Records written so far stay in the JSON Lines file.
+        """
+        if not self._file.closed:
+            self._file.close()
+
+    def finalize(self, output_file: str, output_format: str = 'json', flatten: bool = False) -> None:
+        """
+        Converts the sink into a JSON array at `output_file`, ordered by record index, and removes
+        the JSON Lines file. The array is laid out exactly like `json.dump(records, f, indent=4)`
+        and is moved into place atomically.
+
+        Args:
+            output_file (str): The JSON file to write.
+            output_format (str): 'json' for the JSON array, or 'jsonl' for one record per line in
+                index order.
+            flatten (bool): Every record is a list whose items are written as individual records.
+        """
+        self.close()
+        output_dir = os.path.dirname(output_file) or '.'
+        os.makedirs(output_dir, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=output_dir, prefix='.tmp-')
+        try:
+            with open(self.path, 'rb') as source, os.fdopen(fd, 'w') as target:
+                written = 0
+                if output_format == 'json':
+                    target.write('[')
+                for _, offset, length in sorted(self._offsets):
+                    source.seek(offset)
+                    record = json.loads(source.read(length))
+                    if self.keyed:
+                        record = record['record']
+                    for item in (record if flatten else [record]):
+                        if output_format == 'jsonl':
+                            target.write(json.dumps(item) + '\n')
+                        else:
+                            target.write((',\n' if written else '\n') + indent_json(item))
+                        written += 1
+                if output_format == 'json':
+                    target.write('\n]' if written else ']')
+            os.replace(tmp_path, output_file)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        os.remove(self.path)
+        self.logger.info(f"Finalized {self.count} records into {output_file}")
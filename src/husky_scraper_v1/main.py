@@ -1,39 +1,120 @@
-from preprocessing.utils import get_terms, declare_term, get_courses, get_subjects, create_session
+from preprocessing.utils import (get_terms, iter_courses, get_subjects, create_session, DETAIL_WORKERS, TERM_WORKERS,
+                                 CourseMetadataCache, BannerSessionPool)
 from preprocessing.clean_data import clean_course_data
-import json
+from concurrent.futures import ThreadPoolExecutor
+from src.husky_scraper.logging_util import LoggerFactory
+from src.husky_scraper.sinks import JsonlSink
 import os
+import shutil
+
+RAW_OUTPUT = 'data/raw/all_courses.jsonl'
+PROCESSED_OUTPUT = 'data/processed/processed_courses.jsonl'
+
+
+def spool_path(output, term_code):
+    # Records of one term are spooled next to the output and appended to it in term order
+    return f"{output}.{term_code}.part"
+
+
+def append_spool(path, target):
+    # Appends a term's spooled records to an output file and removes the spool
+    with open(path, 'rb') as spool:
+        shutil.copyfileobj(spool, target)
+    os.remove(path)
+
+
+def remove_spools(term_code):
+    # Drops whatever a term left in its spool files, e.g. after its harvest failed
+    for output in (RAW_OUTPUT, PROCESSED_OUTPUT):
+        path = spool_path(output, term_code)
+        if os.path.exists(path):
+            os.remove(path)
+
+
+def harvest_term(pool, term_code, executor, course_cache, logger):
+    # Runs on a term worker with a session of its own, declared to this term only.
+    # Courses are streamed to the term's spool files as soon as their page is complete: the raw record is
+    # written before clean_course_data cleans it in place. Returns how many courses there were.
+    session = pool.session(term_code)
+    count = 0
+    try:
+        with JsonlSink(spool_path(RAW_OUTPUT, term_code), logger, durable=False) as raw_sink, \
+                JsonlSink(spool_path(PROCESSED_OUTPUT, term_code), logger, durable=False) as processed_sink:
+            subjects = get_subjects(session, term_code)
+            for subject in subjects:
+                subject_code = subject.get('code')
+                if subject_code:
+                    print(f"Processing subject {subject_code} for term {term_code}")
+                    for course in iter_courses(session, term_code, subject_code, executor=executor,
+                                               course_cache=course_cache):
+                        raw_sink.write(course)
+                        processed_sink.write(clean_course_data(course))
+                        count += 1
+    finally:
+        pool.release(term_code)
+        if course_cache is not None:
+            course_cache.release_term(term_code)
+    return count
 
 
 def main():
+    logger = LoggerFactory.get_logger("BannerHarvest")
     session = create_session()
     terms = get_terms(session)
-    all_courses = []
-
-    for term in terms:
-        term_code = term['code']
-        declare_term(session, term_code)
-        subjects = get_subjects(session, term_code)
-        for subject in subjects:
-            subject_code = subject.get('code')
-            if subject_code:
-                print(f"Processing subject {subject_code} for term {term_code}")
-                courses = get_courses(session, term_code, subject_code)
-                all_courses.extend(courses)
-
-    # Save raw data
-    os.makedirs('data/raw', exist_ok=True)
-    with open('data/raw/all_courses.json', 'w') as f:
-        json.dump(all_courses, f, indent=4)
-        print("All course data saved to data/raw/all_courses.json")
-
-    # Preprocess data
-    cleaned_courses = [clean_course_data(course) for course in all_courses]
-
-    # Save processed data
-    os.makedirs('data/processed', exist_ok=True)
-    with open('data/processed/processed_courses.json', 'w') as f:
-        json.dump(cleaned_courses, f, indent=4)
-        print("Processed course data saved to data/processed/processed_courses.json")
+    course_cache = CourseMetadataCache()  # Descriptions and prerequisites are fetched once per course
+
+    # Raw and processed records are streamed to JSON Lines as they arrive, so only the sections of the
+    # pages being processed are held in memory. Each term is spooled to files of its own and appended to
+    # the outputs once it is done, so the outputs keep the term order of get_terms. The outputs are built
+    # under a .tmp name and only replace the previous ones once every term has been processed; a term whose
+    # harvest fails is reported and left out instead of aborting the run.
+    for output in (RAW_OUTPUT, PROCESSED_OUTPUT):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    raw_tmp, processed_tmp = f"{RAW_OUTPUT}.tmp", f"{PROCESSED_OUTPUT}.tmp"
+    failed_terms = []
+    try:
+        with open(raw_tmp, 'wb') as raw_file, open(processed_tmp, 'wb') as processed_file:
+            # Terms are harvested in parallel, each on its own declared session; the per-section detail calls
+            # of all terms share one bounded pool
+            with BannerSessionPool() as pool, \
+                    ThreadPoolExecutor(max_workers=DETAIL_WORKERS, thread_name_prefix="banner") as executor, \
+                    ThreadPoolExecutor(max_workers=TERM_WORKERS, thread_name_prefix="banner-term") as term_executor:
+                harvests = {term['code']: term_executor.submit(harvest_term, pool, term['code'], executor,
+                                                               course_cache, logger)
+                            for term in terms}
+                try:
+                    for term_code, harvest in harvests.items():
+                        try:
+                            count = harvest.result()
+                        except Exception as e:
+                            print(f"Error: harvesting term {term_code} failed, skipping it: {e}")
+                            logger.exception(f"Harvesting term {term_code} failed")
+                            failed_terms.append(term_code)
+                            remove_spools(term_code)
+                            continue
+                        append_spool(spool_path(RAW_OUTPUT, term_code), raw_file)
+                        append_spool(spool_path(PROCESSED_OUTPUT, term_code), processed_file)
+                        print(f"Harvested {count} courses for term {term_code}")
+                finally:
+                    # Terms not started yet are dropped when the run is interrupted
+                    for harvest in harvests.values():
+                        harvest.cancel()
+        os.replace(raw_tmp, RAW_OUTPUT)
+        os.replace(processed_tmp, PROCESSED_OUTPUT)
+    finally:
+        # The term workers are done here: remove the spools of terms that were not appended and any
+        # output left unfinished
+        for term in terms:
+            remove_spools(term['code'])
+        for path in (raw_tmp, processed_tmp):
+            if os.path.exists(path):
+                os.remove(path)
+    if failed_terms:
+        print(f"Warning: {len(failed_terms)} of {len(terms)} terms failed and are missing from the outputs: "
+              f"{', '.join(failed_terms)}")
+    print(course_cache.summary())
+    print(f"All course data saved to {RAW_OUTPUT}")
+    print(f"Processed course data saved to {PROCESSED_OUTPUT}")
 
 
 if __name__ == "__main__":
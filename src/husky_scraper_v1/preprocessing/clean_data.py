@@ -1,34 +1,119 @@
 import re
-from bs4 import BeautifulSoup
+import threading
+from lxml import etree
 
+WHITESPACE = re.compile(r'\s+')
+# Strings inside these elements are not text for BeautifulSoup's get_text(): scripts, stylesheets, templates
+# and ruby annotations
+SKIPPED_TAGS = frozenset(('script', 'style', 'template', 'rt', 'rp'))
 
-def clean_course_data(course):
+# One reusable text parser per thread, for callers that do not pass their own
+_local = threading.local()
+
+
+def clean_course_data(course, parser=None):
     # Clean description
     description = course.get('Description', '')
-    course['Description'] = clean_text(description)
+    course['Description'] = clean_text(description, parser)
 
     # Clean catalog details
     catalog_details = course.get('Catalog Details', '')
-    course['Catalog Details'] = clean_text(catalog_details)
+    course['Catalog Details'] = clean_text(catalog_details, parser)
 
     # Clean prerequisites and co-requisites if they are strings
     prerequisites = course.get('Prerequisites', '')
     if isinstance(prerequisites, str):
-        course['Prerequisites'] = clean_text(prerequisites)
+        course['Prerequisites'] = clean_text(prerequisites, parser)
 
     co_requisites = course.get('Co-requisites', '')
     if isinstance(co_requisites, str):
-        course['Co-requisites'] = clean_text(co_requisites)
+        course['Co-requisites'] = clean_text(co_requisites, parser)
 
     # Add any additional cleaning steps here
 
     return course
 
 
-def clean_text(text):
-    # Remove HTML tags
-    soup = BeautifulSoup(text, 'lxml')
-    cleaned_text = soup.get_text(separator='.', strip=True)
+def clean_courses(courses):
+    # Batch version of clean_course_data: cleans every course of a list in place with one reusable parser
+    # and returns the list. A parser must not be shared between threads, so each batch creates its own.
+    parser = text_parser()
+    for course in courses:
+        clean_course_data(course, parser)
+    return courses
+
+
+def clean_text(text, parser=None):
+    # Remove HTML tags, joining the text pieces with '.'
+    cleaned_text = fragment_text(text, parser)
     # Normalize whitespace
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
+    cleaned_text = WHITESPACE.sub(' ', cleaned_text)
     return cleaned_text
+
+
+def text_parser():
+    # An lxml HTML parser that streams its events to a TextCollector instead of building a tree
+    return etree.HTMLParser(target=TextCollector(), recover=True)
+
+
+def fragment_text(text, parser=None):
+    # Same output as BeautifulSoup(text, 'lxml').get_text(separator='.', strip=True), without building a soup.
+    # Bytes are decoded as UTF-8 (invalid sequences replaced) rather than left to lxml's encoding guess,
+    # which reads non-ASCII bytes as Latin-1.
+    if not isinstance(text, (str, bytes)):
+        raise TypeError(f"Incoming markup is of an invalid type: {text!r}. Markup must be a string or a bytestring.")
+    if isinstance(text, bytes):
+        text = text.decode('utf-8-sig', errors='replace')
+    if parser is None:
+        parser = getattr(_local, 'parser', None)
+        if parser is None:
+            parser = _local.parser = text_parser()
+    parser.feed(text)
+    return parser.close()
+
+
+class TextCollector:
+    # lxml parser target receiving the same events as BeautifulSoup's lxml tree builder. Text between two
+    # events forms one string, as in a soup; strings are stripped and empty ones, comments, processing
+    # instructions, doctypes and everything inside SKIPPED_TAGS are left out.
+
+    def __init__(self):
+        self.strings = []
+        self.pending = []
+        self.skipped = 0
+
+    def flush(self):
+        if self.pending:
+            if not self.skipped:
+                string = ''.join(self.pending).strip()
+                if string:
+                    self.strings.append(string)
+            self.pending = []
+
+    def start(self, tag, attrib, nsmap=None):
+        self.flush()
+        if tag in SKIPPED_TAGS:
+            self.skipped += 1
+
+    def end(self, tag):
+        self.flush()
+        if tag in SKIPPED_TAGS and self.skipped:
+            self.skipped -= 1
+
+    def data(self, content):
+        self.pending.append(content)
+
+    def comment(self, text):
+        self.flush()
+
+    def pi(self, target, data=None):
+        self.flush()
+
+    def doctype(self, name, pubid, system):
+        self.flush()
+
+    def close(self):
+        # Called by the parser at the end of each document; resets the collector for the next one
+        self.flush()
+        strings, self.strings, self.skipped = self.strings, [], 0
+        return '.'.join(strings)
@@ -0,0 +1,83 @@
+import argparse
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from preprocessing.clean_data import clean_courses
+
+RAW_INPUT = 'data/raw/all_courses.jsonl'
+PROCESSED_OUTPUT = 'data/processed/processed_courses.jsonl'
+# Raw lines sent to a worker at once; large enough that pickling and scheduling stay negligible
+BATCH_SIZE = 500
+
+
+def iter_batches(path, batch_size=BATCH_SIZE):
+    # Yields the raw JSON lines of a file in lists of batch_size. Like read_jsonl, a truncated last line left
+    # by an interrupted harvest is ignored. Lines stay undecoded so the workers do the JSON work too.
+    batch = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.endswith('\n'):
+                break
+            if line.strip():
+                batch.append(line)
+                if len(batch) == batch_size:
+                    yield batch
+                    batch = []
+    if batch:
+        yield batch
+
+
+def clean_batch(lines):
+    # Runs in a worker process: decodes a batch of raw records, cleans them and returns the processed JSON
+    # lines as one string, serialized exactly like JsonlSink does
+    courses = clean_courses([json.loads(line) for line in lines])
+    return ''.join(json.dumps(course) + '\n' for course in courses)
+
+
+def preprocess(raw_path=RAW_INPUT, processed_path=PROCESSED_OUTPUT, workers=None, batch_size=BATCH_SIZE):
+    # Re-cleans a raw JSON Lines dump on every core. Batches are submitted in file order and written in the
+    # same order, so the output matches a sequential run line for line. At most two batches per worker are in
+    # flight, so memory stays bounded however large the dump is. Returns (courses, seconds).
+    workers = workers or os.cpu_count() or 1
+    output_dir = os.path.dirname(processed_path)
+    if output_dir:
+        os.makedirs(output_dir, exist_ok=True)
+
+    started = time.perf_counter()
+    courses = 0
+    with ProcessPoolExecutor(max_workers=workers) as executor, \
+            open(processed_path, 'w', encoding='utf-8') as output:
+        pending = deque()
+        for batch in iter_batches(raw_path, batch_size):
+            pending.append((len(batch), executor.submit(clean_batch, batch)))
+            if len(pending) >= 2 * workers:
+                size, future = pending.popleft()
+                output.write(future.result())
+                courses += size
+        while pending:
+            size, future = pending.popleft()
+            output.write(future.result())
+            courses += size
+    seconds = time.perf_counter() - started
+    return courses, seconds
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Re-clean raw Banner course records in parallel.")
+    parser.add_argument('--input', default=RAW_INPUT, help="Raw JSON Lines course records.")
+    parser.add_argument('--output', default=PROCESSED_OUTPUT, help="Processed JSON Lines file to write.")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes (default: one per core).")
+    parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help="Records per worker batch.")
+    args = parser.parse_args(argv)
+
+    courses, seconds = preprocess(args.input, args.output, args.workers, args.batch_size)
+    rate = courses / seconds if seconds else 0.0
+    print(f"Processed {courses} courses in {seconds:.2f}s ({rate:.0f} courses/s)")
+    print(f"Processed course data saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
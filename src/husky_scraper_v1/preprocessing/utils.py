@@ -1,12 +1,149 @@
+import hashlib
 import requests
 import json
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from src.husky_scraper.http_cache import CachedSession, ResponseCache
 
+# Number of per-section detail calls in flight at once
+DETAIL_WORKERS = 16
+# Number of terms harvested in parallel, each on its own session
+TERM_WORKERS = 4
+# Keep-alive connections per session: every detail worker plus the page prefetcher
+CONNECTIONS = DETAIL_WORKERS + 1
+# Sections requested per searchResults page
+PAGE_SIZE = 100
+# Retries of a failed searchResults page, waiting PAGE_RETRY_DELAY seconds, doubled after every attempt
+PAGE_RETRIES = 3
+PAGE_RETRY_DELAY = 1.0
 
-def create_session():
-    session = requests.Session()
+# Response cache shared with the catalog scrapers: the directory and size budget of the http_cache section of
+# configs/scraper_config.json, whose paths are relative to src/husky_scraper as data/ is to src/husky_scraper_v1
+CACHE_DIRECTORY = '../../results/http_cache'
+CACHE_MAX_BYTES = 2000000000
+
+DECLARE_TERM_URL = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/term/search'
+# Statuses and redirect targets of requests made with an expired Banner session
+EXPIRED_STATUSES = (401, 403, 440)
+EXPIRED_REDIRECT_MARKERS = ('login', 'termSelection', 'registration/registration')
+
+
+def create_session(cache_directory=CACHE_DIRECTORY, ttl_seconds=86400, offline=False, pool_size=CONNECTIONS,
+                   max_bytes=CACHE_MAX_BYTES):
+    # Banner responses are cached on disk and revalidated; pass cache_directory=None to disable.
+    # With offline=True the session only replays cached responses and never touches the network.
+    cache = ResponseCache(cache_directory, ttl_seconds=ttl_seconds, max_bytes=max_bytes,
+                          offline=offline) if cache_directory else None
+    session = CachedSession(cache)
+    tune_keepalive(session, pool_size)
     return session
 
 
+def tune_keepalive(session, pool_size=CONNECTIONS):
+    # Keeps up to pool_size connections alive so concurrent calls never reconnect (callers wait for a free
+    # connection instead of opening throwaway ones), and retries connection failures with backoff.
+    # Requests that reached the server are never retried here.
+    retries = Retry(total=3, connect=3, read=0, status=0, backoff_factor=0.5)
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, pool_block=True, max_retries=retries)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers['Connection'] = 'keep-alive'
+
+
+def session_expired(response):
+    # Banner answers requests of an expired session with an auth error or a redirect to the login
+    # or term selection page
+    if response.status_code in EXPIRED_STATUSES:
+        return True
+    return bool(response.history) and any(marker in response.url for marker in EXPIRED_REDIRECT_MARKERS)
+
+
+class TermSession(CachedSession):
+    # Session bound to one term. The term is declared when the session is created; when Banner reports
+    # the session as expired, the term is declared again on a fresh cookie jar and the request retried.
+
+    def __init__(self, term_code, cache=None, pool_size=CONNECTIONS, max_retries=2):
+        super().__init__(cache)
+        self.term_code = term_code
+        self.max_retries = max_retries
+        self._declare_lock = threading.Lock()
+        self._generation = 0
+        tune_keepalive(self, pool_size)
+        self.declare()
+
+    def declare(self):
+        if self.cache is not None and self.cache.offline:
+            return  # Replayed responses do not depend on the session
+        self.cookies.clear()
+        try:
+            response = super().request('POST', DECLARE_TERM_URL, data={'term': self.term_code})
+            response.raise_for_status()
+        except requests.exceptions.RequestException as e:
+            print(f"Error declaring term {self.term_code}: {e}")
+        self._generation += 1
+
+    def request(self, method, url, **kwargs):
+        for attempt in range(self.max_retries + 1):
+            generation = self._generation
+            response = super().request(method, url, **kwargs)
+            if attempt == self.max_retries or getattr(response, 'from_cache', False) or not session_expired(response):
+                return response
+            print(f"Session for term {self.term_code} expired, declaring the term again (retry {attempt + 1})")
+            with self._declare_lock:
+                # Threads that saw the same expiry declare the term only once
+                if self._generation == generation:
+                    self.declare()
+        return response
+
+    def should_store(self, response):
+        return super().should_store(response) and not session_expired(response)
+
+
+class BannerSessionPool:
+    # Hands out one TermSession per term, so terms can be harvested in parallel without their declared-term
+    # cookies interfering. All sessions share one response cache.
+
+    def __init__(self, cache_directory=CACHE_DIRECTORY, ttl_seconds=86400, offline=False, pool_size=CONNECTIONS,
+                 max_retries=2, max_bytes=CACHE_MAX_BYTES):
+        self.cache = ResponseCache(cache_directory, ttl_seconds=ttl_seconds, max_bytes=max_bytes,
+                                   offline=offline) if cache_directory else None
+        self.pool_size = pool_size
+        self.max_retries = max_retries
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def session(self, term_code):
+        # Returns the session declared to the term, creating it on first use
+        with self._lock:
+            session = self._sessions.get(term_code)
+            if session is None:
+                session = TermSession(term_code, self.cache, pool_size=self.pool_size, max_retries=self.max_retries)
+                self._sessions[term_code] = session
+            return session
+
+    def release(self, term_code):
+        with self._lock:
+            session = self._sessions.pop(term_code, None)
+        if session is not None:
+            session.close()
+
+    def close(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions.clear()
+        for session in sessions:
+            session.close()
+
+
 # Step 1: Get available terms (uses a session to manage cookies)
 def get_terms(session):
     try:
@@ -34,8 +171,7 @@ def get_subjects(session, term_code):
 # Step 3: Declare term (this will use the session to pass cookies automatically)
 def declare_term(session, term_code):
     try:
-        declare_term_url = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/term/search'
-        response = session.post(declare_term_url, data={'term': term_code})
+        response = session.post(DECLARE_TERM_URL, data={'term': term_code})
         response.raise_for_status()
     except requests.exceptions.RequestException as e:
         print(f"Error declaring term {term_code}: {e}")
@@ -46,7 +182,8 @@ def get_catalog_details(session, term_code, course_reference_number):
     try:
         url = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/searchResults/getSectionCatalogDetails'
         print(f"Fetching catalog details for course {course_reference_number} in term {term_code}")
-        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number})
+        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number},
+                                cache=True)
         response.raise_for_status()
         return response.text  # HTML response
     except requests.exceptions.RequestException as e:
@@ -59,7 +196,8 @@ def get_prerequisites(session, term_code, course_reference_number):
     try:
         url = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/searchResults/getSectionPrerequisites'
         print(f"Fetching prerequisites for course {course_reference_number} in term {term_code}")
-        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number})
+        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number},
+                                cache=True)
         response.raise_for_status()
 
         # Check if the response is JSON or string
@@ -77,7 +215,8 @@ def get_corequisites(session, term_code, course_reference_number):
     try:
         url = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/searchResults/getCorequisites'
         print(f"Fetching co-requisites for course {course_reference_number} in term {term_code}")
-        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number})
+        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number},
+                                cache=True)
         response.raise_for_status()
 
         # Check if the response is JSON or string
@@ -95,7 +234,8 @@ def get_course_description(session, term_code, course_reference_number):
     try:
         url = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/searchResults/getCourseDescription'
         print(f"Fetching description for course {course_reference_number} in term {term_code}")
-        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number})
+        response = session.post(url, data={'term': term_code, 'courseReferenceNumber': course_reference_number},
+                                cache=True)
         response.raise_for_status()
         return response.text  # HTML response
     except requests.exceptions.RequestException as e:
@@ -103,115 +243,332 @@ def get_course_description(session, term_code, course_reference_number):
         return None
 
 
-# Step 5: Get all course details and prerequisites for all courses in a term and subject
-def get_courses(session, term_code, subject_code):
-    courses = []
-    print(f"Fetching courses for subject {subject_code} in term {term_code}")
-    try:
-        courses_url = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/searchResults/searchResults'
+# Detail calls whose result only depends on the course (subject + course number), not on the section.
+# The catalog details (credit hours, schedule types, attributes) belong to the term's catalog; the
+# prerequisites and description are the same in every term a course is offered.
+TERM_COURSE_DETAILS = (
+    ('Catalog Details', get_catalog_details),
+)
+SHARED_COURSE_DETAILS = (
+    ('Prerequisites', get_prerequisites),
+    ('Description', get_course_description),
+)
+COURSE_DETAILS = TERM_COURSE_DETAILS + SHARED_COURSE_DETAILS
+# Detail calls made for every section
+SECTION_DETAILS = (
+    ('Co-requisites', get_corequisites),
+)
+# Search result fields that identify the catalog entry of a course; a change in any of them means the
+# course-level details must be fetched again
+COURSE_FINGERPRINT_FIELDS = ('subject', 'courseNumber', 'courseTitle', 'creditHourLow', 'creditHourHigh')
+
+
+def fetch_details(session, term_code, course_reference_number, fetchers, executor=None):
+    # Returns {field: value}, or {field: Future} when an executor is given
+    if executor is None:
+        return {field: fetch(session, term_code, course_reference_number) for field, fetch in fetchers}
+    return {field: executor.submit(fetch, session, term_code, course_reference_number) for field, fetch in fetchers}
+
+
+class CourseMetadataCache:
+    # Shares the course-level details between the sections of a course. Prerequisites and description are
+    # keyed by subject + course number and fetched once per course across all terms; the catalog details
+    # are keyed by term as well and fetched once per course in each term. Every entry holds a SHA-256
+    # fingerprint of the course-level search fields, and a section whose fingerprint differs (e.g. a retitled
+    # course) refreshes it. Entries whose calls failed are fetched again by the next section of the course.
+    # Once fetched, the content of the details is hashed, so the summary tells how many refetches found
+    # details that changed.
+
+    def __init__(self):
+        self._shared = {}
+        self._terms = {}
+        self._content_hashes = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.term_hits = 0
+        self.misses = 0
+        self.changed = 0
+        self.content_changed = 0
+
+    @staticmethod
+    def fingerprint(course):
+        fields = [course.get(field) for field in COURSE_FINGERPRINT_FIELDS]
+        return hashlib.sha256(json.dumps(fields).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def content_hash(details):
+        # Hash of fetched details ({field: value}); None if a call failed
+        if any(value is None for value in details.values()):
+            return None
+        return hashlib.sha256(json.dumps(details, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def _failed(details):
+        for value in details.values():
+            if isinstance(value, Future):
+                if value.done() and (value.exception() is not None or value.result() is None):
+                    return True
+            elif value is None:
+                return True
+        return False
+
+    def details(self, session, term_code, course, executor=None):
+        # Returns the course-level details of a section ({field: value or Future}), fetching each group
+        # with this section's CRN only if it has not been fetched for the course (in this term, for the
+        # catalog details) yet or the course has changed
+        course_key = (course.get('subject'), course.get('courseNumber'))
+        fingerprint = self.fingerprint(course)
+        course_reference_number = course.get('courseReferenceNumber', 'N/A')
+        term_details = self._lookup(term_code, session, term_code, course_reference_number, course_key,
+                                    fingerprint, TERM_COURSE_DETAILS, executor)
+        shared_details = self._lookup(None, session, term_code, course_reference_number, course_key,
+                                      fingerprint, SHARED_COURSE_DETAILS, executor)
+        return {**term_details, **shared_details}
+
+    def _entries(self, scope):
+        # The entries of a term, or the entries shared by all terms when scope is None; the caller holds the lock
+        return self._shared if scope is None else self._terms.setdefault(scope, {})
+
+    def _lookup(self, scope, session, term_code, course_reference_number, course_key, fingerprint, fetchers,
+                executor):
+        with self._lock:
+            entry = self._entries(scope).get(course_key)
+            if entry is not None and entry[0] == fingerprint and not self._failed(entry[1]):
+                if scope is None:
+                    self.hits += 1
+                else:
+                    self.term_hits += 1
+                return entry[1]
+            if entry is not None and entry[0] != fingerprint:
+                self.changed += 1
+            self.misses += 1
+            if executor is not None:
+                details = fetch_details(session, term_code, course_reference_number, fetchers, executor)
+                self._entries(scope)[course_key] = (fingerprint, details)
+        if executor is None:
+            details = fetch_details(session, term_code, course_reference_number, fetchers)
+            with self._lock:
+                self._entries(scope)[course_key] = (fingerprint, details)
+        # Outside the lock: callbacks of already finished calls run right away and take it
+        self._track_content((scope is None, course_key), details)
+        return details
+
+    def _track_content(self, content_key, details):
+        # Compares the content of the details with the last fetch of the same group once all calls are done
+        futures = [value for value in details.values() if isinstance(value, Future)]
+        remaining = [max(len(futures), 1)]
+
+        def record(_=None):
+            with self._lock:
+                remaining[0] -= 1
+                if remaining[0] > 0:
+                    return
+                if any(future.exception() is not None for future in futures):
+                    return
+                digest = self.content_hash({field: value.result() if isinstance(value, Future) else value
+                                            for field, value in details.items()})
+                if digest is None:
+                    return
+                previous = self._content_hashes.get(content_key)
+                if previous is not None and previous != digest:
+                    self.content_changed += 1
+                self._content_hashes[content_key] = digest
+
+        for future in futures:
+            future.add_done_callback(record)
+        if not futures:
+            record()
+
+    def release_term(self, term_code):
+        # Drops the catalog details of a harvested term; prerequisites and descriptions are kept for later terms
+        with self._lock:
+            self._terms.pop(term_code, None)
+
+    def summary(self):
+        return (f"Course metadata cache: {len(self._shared)} courses, {self.hits} sections reused the "
+                f"prerequisites and description of their course, {self.term_hits} reused its catalog details in "
+                f"the same term, {self.misses} detail groups fetched ({self.changed} after a course change); "
+                f"{self.content_changed} refetches found changed details")
+
+
+def build_course_record(course, term_code):
+    # Extract basic course information
+    course_title = course.get('courseTitle', 'N/A')
+    course_number = course.get('courseNumber', 'N/A')
+    subject = course.get('subject', 'N/A')
+    term_desc = course.get('termDesc', 'N/A')
+
+    # Extract meeting times (list of dictionaries)
+    meeting_times = course.get('meetingsFaculty', [])
+    # Initialize variables
+    faculty = []
+    campus = 'N/A'
+    campus_description = 'N/A'
+    meeting_schedule_type = 'N/A'
+    meeting_type_description = 'N/A'
+    start_date = 'N/A'
+    end_date = 'N/A'
+    # Initialize days of the week
+    days = {
+        'monday': False,
+        'tuesday': False,
+        'wednesday': False,
+        'thursday': False,
+        'friday': False,
+        'saturday': False,
+        'sunday': False
+    }
+
+    # Loop through meeting times to extract required data
+    for meeting in meeting_times:
+        # Extract faculty information
+        faculty_data = meeting.get('instructor', {})
+        if faculty_data:
+            faculty_name = faculty_data.get('displayName', 'N/A')
+            faculty_email = faculty_data.get('emailAddress', 'N/A')
+            faculty.append({'name': faculty_name, 'email': faculty_email})
+
+        # Extract campus information
+        campus = meeting.get('campus', 'N/A')
+        campus_description = meeting.get('campusDescription', 'N/A')
+
+        # Extract meeting schedule type and description
+        meeting_schedule_type = meeting.get('meetingScheduleType', 'N/A')
+        meeting_type_description = meeting.get('meetingTypeDescription', 'N/A')
+
+        # Extract start and end dates
+        start_date = meeting.get('startDate', 'N/A')
+        end_date = meeting.get('endDate', 'N/A')
+
+        # Extract days of the week
+        days['monday'] = meeting.get('monday', False)
+        days['tuesday'] = meeting.get('tuesday', False)
+        days['wednesday'] = meeting.get('wednesday', False)
+        days['thursday'] = meeting.get('thursday', False)
+        days['friday'] = meeting.get('friday', False)
+        days['saturday'] = meeting.get('saturday', False)
+        days['sunday'] = meeting.get('sunday', False)
+
+    # The detail fields are filled in by get_courses once the per-section calls return
+    return {
+        'Course Title': course_title,
+        'Course Number': course_number,
+        'Subject': subject,
+        'Term Description': term_desc,
+        'Faculty': faculty,
+        'Campus': campus,
+        'Campus Description': campus_description,
+        'Meeting Schedule Type': meeting_schedule_type,
+        'Meeting Type Description': meeting_type_description,
+        'Start Date': start_date,
+        'End Date': end_date,
+        'Days': days,
+        'Catalog Details': None,
+        'Prerequisites': None,
+        'Co-requisites': None,
+        'Description': None,
+        'Term': term_code
+    }
+
+
+# Step 5: Stream the sections of a term and subject, page by page
+def iter_search_results(session, term_code, subject_code, page_size=PAGE_SIZE, retries=PAGE_RETRIES,
+                        retry_delay=PAGE_RETRY_DELAY):
+    # Yields one page (list of sections) at a time. The next page is requested in the background while
+    # the caller processes the current one, so at most two pages are held in memory. A failed page is
+    # retried with backoff; a page that still fails is skipped and the harvest goes on with the next one.
+    # When the generator ends, however it ends, the pages and sections received are reported against the
+    # totalCount reported by Banner.
+    courses_url = 'https://nubanner.neu.edu/StudentRegistrationSsb/ssb/searchResults/searchResults'
+
+    def fetch_page(page_offset):
         params = {
             'txt_subject': subject_code,
             'txt_term': term_code,
             'startDatepicker': '',
             'endDatepicker': '',
-            'pageOffset': 0,
-            'pageMaxSize': 100,
+            'pageOffset': page_offset,
+            'pageMaxSize': page_size,
             'sortColumn': 'subjectDescription',
             'sortDirection': 'asc'
         }
-        response = session.get(courses_url, params=params)
-        response.raise_for_status()
-        courses_data = response.json()
-        if 'data' in courses_data:
-            for course in courses_data['data']:
-                # Extract basic course information
-                course_reference_number = course.get('courseReferenceNumber', 'N/A')
-                course_title = course.get('courseTitle', 'N/A')
-                course_number = course.get('courseNumber', 'N/A')
-                subject = course.get('subject', 'N/A')
-                term_desc = course.get('termDesc', 'N/A')
-
-                # Extract meeting times (list of dictionaries)
-                meeting_times = course.get('meetingsFaculty', [])
-                # Initialize variables
-                faculty = []
-                campus = 'N/A'
-                campus_description = 'N/A'
-                meeting_schedule_type = 'N/A'
-                meeting_type_description = 'N/A'
-                start_date = 'N/A'
-                end_date = 'N/A'
-                # Initialize days of the week
-                days = {
-                    'monday': False,
-                    'tuesday': False,
-                    'wednesday': False,
-                    'thursday': False,
-                    'friday': False,
-                    'saturday': False,
-                    'sunday': False
-                }
-
-                # Loop through meeting times to extract required data
-                for meeting in meeting_times:
-                    # Extract faculty information
-                    faculty_data = meeting.get('instructor', {})
-                    if faculty_data:
-                        faculty_name = faculty_data.get('displayName', 'N/A')
-                        faculty_email = faculty_data.get('emailAddress', 'N/A')
-                        faculty.append({'name': faculty_name, 'email': faculty_email})
-
-                    # Extract campus information
-                    campus = meeting.get('campus', 'N/A')
-                    campus_description = meeting.get('campusDescription', 'N/A')
-
-                    # Extract meeting schedule type and description
-                    meeting_schedule_type = meeting.get('meetingScheduleType', 'N/A')
-                    meeting_type_description = meeting.get('meetingTypeDescription', 'N/A')
-
-                    # Extract start and end dates
-                    start_date = meeting.get('startDate', 'N/A')
-                    end_date = meeting.get('endDate', 'N/A')
-
-                    # Extract days of the week
-                    days['monday'] = meeting.get('monday', False)
-                    days['tuesday'] = meeting.get('tuesday', False)
-                    days['wednesday'] = meeting.get('wednesday', False)
-                    days['thursday'] = meeting.get('thursday', False)
-                    days['friday'] = meeting.get('friday', False)
-                    days['saturday'] = meeting.get('saturday', False)
-                    days['sunday'] = meeting.get('sunday', False)
-
-                # Get other course details
-                catalog_details = get_catalog_details(session, term_code, course_reference_number)
-                prerequisites = get_prerequisites(session, term_code, course_reference_number)
-                co_requisites = get_corequisites(session, term_code, course_reference_number)
-                description = get_course_description(session, term_code, course_reference_number)
-
-                # Append course data
-                courses.append({
-                    'Course Title': course_title,
-                    'Course Number': course_number,
-                    'Subject': subject,
-                    'Term Description': term_desc,
-                    'Faculty': faculty,
-                    'Campus': campus,
-                    'Campus Description': campus_description,
-                    'Meeting Schedule Type': meeting_schedule_type,
-                    'Meeting Type Description': meeting_type_description,
-                    'Start Date': start_date,
-                    'End Date': end_date,
-                    'Days': days,
-                    'Catalog Details': catalog_details,
-                    'Prerequisites': prerequisites,
-                    'Co-requisites': co_requisites,
-                    'Description': description,
-                    'Term': term_code
-                })
-                print(f"Added course {course_title} ({course_number})")
-        else:
-            print(f"No courses found for subject {subject_code} in term {term_code}")
-    except requests.exceptions.RequestException as e:
-        print(f"Error fetching courses for subject {subject_code}: {e}")
+        for attempt in range(retries + 1):
+            try:
+                response = session.get(courses_url, params=params)
+                response.raise_for_status()
+                return response.json()
+            except (requests.exceptions.RequestException, ValueError) as e:
+                if attempt == retries:
+                    print(f"Error fetching sections from offset {page_offset} for subject {subject_code} in term "
+                          f"{term_code}, giving up after {retries + 1} attempts: {e}")
+                    return None
+                delay = retry_delay * 2 ** attempt
+                print(f"Error fetching sections from offset {page_offset} for subject {subject_code} in term "
+                      f"{term_code}: {e}, retrying in {delay:.0f}s")
+                time.sleep(delay)
+
+    received = pages = failed_pages = offset = 0
+    total_count = None
+    try:
+        with ThreadPoolExecutor(max_workers=1, thread_name_prefix="banner-page") as prefetcher:
+            next_page = prefetcher.submit(fetch_page, 0)
+            while next_page is not None:
+                courses_data = next_page.result()
+                if courses_data is None:
+                    # Skip the failed page; without a totalCount there is no telling whether more pages exist
+                    failed_pages += 1
+                    sections = None
+                    offset += page_size
+                else:
+                    pages += 1
+                    sections = courses_data.get('data') or []
+                    total_count = courses_data.get('totalCount', total_count)
+                    received += len(sections)
+                    offset += len(sections)
+                more = sections != [] and total_count is not None and offset < total_count
+                next_page = prefetcher.submit(fetch_page, offset) if more else None
+                if sections:
+                    yield sections
+    finally:
+        expected = 'unknown' if total_count is None else total_count
+        short = failed_pages or (total_count is not None and received < total_count)
+        print(f"{'Warning: received' if short else 'Received'} {received} of {expected} sections in {pages} pages "
+              f"({failed_pages} failed) for subject {subject_code} in term {term_code}")
+
+
+# Step 6: Get all course details and prerequisites for all courses in a term and subject
+def iter_courses(session, term_code, subject_code, executor=None, course_cache=None):
+    # With an executor, the four detail calls of every section of a page are submitted as soon as the page
+    # arrives and run in parallel (bounded by the executor's workers). Courses are yielded in search order,
+    # page by page; all calls are finished once the generator is exhausted, so the caller can then safely
+    # declare another term on the same session. With a CourseMetadataCache, only the first section of each
+    # course in the term fetches its catalog details, and only its first section across all terms fetches its
+    # prerequisites and description.
+    # Failed search pages are retried and reported by iter_search_results; detail calls report their own errors.
+    print(f"Fetching courses for subject {subject_code} in term {term_code}")
+    found = False
+    for sections in iter_search_results(session, term_code, subject_code):
+        found = True
+        pending = []
+        for course in sections:
+            course_reference_number = course.get('courseReferenceNumber', 'N/A')
+            record = build_course_record(course, term_code)
+            if course_cache is not None:
+                details = course_cache.details(session, term_code, course, executor=executor)
+            else:
+                details = fetch_details(session, term_code, course_reference_number, COURSE_DETAILS, executor)
+            details = {**details, **fetch_details(session, term_code, course_reference_number, SECTION_DETAILS,
+                                                  executor)}
+            pending.append((record, details))
+
+        for record, details in pending:
+            for field, value in details.items():
+                record[field] = value.result() if isinstance(value, Future) else value
+            print(f"Added course {record['Course Title']} ({record['Course Number']})")
+            yield record
+    if not found:
+        print(f"No courses found for subject {subject_code} in term {term_code}")
+
 
-    return courses
\ No newline at end of file
+def get_courses(session, term_code, subject_code, executor=None, course_cache=None):
+    return list(iter_courses(session, term_code, subject_code, executor=executor, course_cache=course_cache))
@@ -1,5 +1,6 @@
 from abc import ABC, abstractmethod
 from src.husky_scraper_v3.utils import fetch_html, save_to_file
+from src.husky_scraper.manifest import content_hash
 
 
 class BaseScraper(ABC):
@@ -7,7 +8,7 @@ class BaseScraper(ABC):
     Abstract base class for all scrapers. Defines the structure for scrapers to follow.
     """
 
-    def __init__(self, url: str, output_file: str, logger) -> None:
+    def __init__(self, url: str, output_file: str, logger, manifest=None) -> None:
         """
         Initializes the scraper.
 
@@ -15,10 +16,14 @@ class BaseScraper(ABC):
             url (str): The URL to scrape.
             output_file (str): The file to save the scraped content to.
             logger: The logger instance for logging.
+            manifest (ScrapeManifest): Optional manifest used to skip the page when it has not changed.
         """
         self.url = url
         self.output_file = output_file
         self.logger = logger
+        self.manifest = manifest
+        self.journal = None
+        self.failed_urls = []
 
     @abstractmethod
     def parse(self, html: str):
@@ -41,8 +46,26 @@ class BaseScraper(ABC):
         self.logger.info(f"Starting scraping for URL: {self.url}")
         html = fetch_html(self.url, self.logger)
         if html:
+            page_hashes = {self.url: content_hash(html)}
+            if self.manifest and self.manifest.task_unchanged(self.output_file, page_hashes):
+                self.logger.info(f"Page unchanged, keeping {self.output_file}")
+                self.record_url(self.url, True)
+                return
             parsed_content = self.parse(html)
             save_to_file(parsed_content, self.output_file, self.logger)
             self.logger.info(f"Scraping successful. Data saved to {self.output_file}")
+            if self.manifest:
+                self.manifest.record(self.output_file, page_hashes)
+            self.record_url(self.url, True)
         else:
             self.logger.error(f"Failed to fetch content from {self.url}")
+            self.record_url(self.url, False, "fetch failed")
+
+    def record_url(self, url: str, succeeded: bool, error: str = None) -> None:
+        """
+        Records the outcome of one URL, remembering failures and updating the run journal, if any.
+        """
+        if not succeeded:
+            self.failed_urls.append(url)
+        if self.journal:
+            self.journal.url_finished(url, succeeded, error)
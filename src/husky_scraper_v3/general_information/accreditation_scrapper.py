@@ -1,6 +1,6 @@
 from typing import List, Any, Dict
-from bs4 import BeautifulSoup
 from from src.husky_scraper_v3.base_scraper import BaseScraper
+from src.husky_scraper.parsing import TEXT_CONTAINER, make_soup
 from src.husky_scraper_v3.utils import replace_unicode
 
 
@@ -20,7 +20,7 @@ class AccreditationScraper(BaseScraper):
             List[str]: A list of strings containing the accreditation details.
         """
         self.logger.info("Parsing accreditation information.")
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, TEXT_CONTAINER)
         accreditation_section = soup.find('div', id='textcontainer')
         accreditation_content = []
 
@@ -1,6 +1,6 @@
 from typing import List, Dict
-from bs4 import BeautifulSoup
 from from src.husky_scraper_v3.base_scraper import BaseScraper
+from src.husky_scraper.parsing import COURSE_BLOCKS, LINKS, make_soup
 import re
 from src.husky_scraper_v3.utils import fetch_html, save_to_file, replace_unicode
 
@@ -43,7 +43,7 @@ class CourseScraper(BaseScraper):
             List[Dict[str, str]]: A list of dictionaries containing course details.
         """
         self.logger.info("Parsing course descriptions.")
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, COURSE_BLOCKS)
 
         # Find all course blocks
         courses = soup.find_all('div', class_='courseblock')
@@ -83,8 +83,8 @@ class CourseScraper(BaseScraper):
         for url in self.urls:
             self.logger.info(f"Scraping course description from {url}")
             html = fetch_html(url, self.logger)
-            soup = BeautifulSoup(html, 'html.parser')
             if html:
+                soup = make_soup(html, LINKS)
                 for a_tag in soup.find_all('a', href=True):
                     link = a_tag['href']
                     # Filter for only course description links
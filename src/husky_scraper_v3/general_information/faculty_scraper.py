@@ -1,7 +1,8 @@
 from typing import List, Dict
-from bs4 import BeautifulSoup
 from src.husky_scraper_v3.base_scraper import BaseScraper
+from src.husky_scraper.parsing import FACULTY_BLOCKS, make_soup
 from src.husky_scraper_v3.utils import fetch_html, save_to_file, replace_unicode
+from src.husky_scraper.fetcher import dedupe_urls
 
 
 class FacultyScraper(BaseScraper):
@@ -32,7 +33,7 @@ class FacultyScraper(BaseScraper):
             List[Dict[str, str]]: A list of dictionaries containing faculty member details.
         """
         self.logger.info("Parsing faculty members.")
-        soup = BeautifulSoup(html, 'html.parser')
+        soup = make_soup(html, FACULTY_BLOCKS)
         # Find all faculty blocks with the <p> tag and class 'keeptogether'
         faculty_blocks = soup.find_all('p', class_='keeptogether')
         faculty_list = []
@@ -58,7 +59,8 @@ class FacultyScraper(BaseScraper):
         Scrapes faculty members from multiple URLs and saves the data.
         """
         all_faculty = []
-        for url in self.urls:
+        # The per-letter URLs only differ by fragment, so the directory page is fetched and parsed once
+        for url in dedupe_urls(self.urls):
             self.logger.info(f"Scraping faculty members from {url}")
             html = fetch_html(url, self.logger)
             if html:
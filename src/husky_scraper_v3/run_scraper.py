@@ -4,25 +4,43 @@ from src.husky_scraper_v3.undergrad.admissions.scraper import UndergradAdmission
 from src.husky_scraper_v3.undergrad.entering_students_info.scraper import EnteringStudentsInfo
 from src.husky_scraper_v3.undergrad.financial_information.scraper import FinancialInformation, TuitionRoomBoardFeesScraper
 from src.husky_scraper_v3.undergrad.academic_policies.scraper import AcademicPolicies
+from src.husky_scraper.scheduler import TaskScheduler
+from src.husky_scraper.fetcher import get_fetch_engine
+from src.husky_scraper.http_cache import ResponseCache
+from src.husky_scraper.manifest import ScrapeManifest
+from src.husky_scraper.run_journal import RunJournal
 from utils import load_from_file
 from logging_util import LoggerFactory
-from concurrent.futures import ThreadPoolExecutor
 from collections import defaultdict
+from functools import partial
+import argparse
 
 
-def run_scraper(scraper_class, config_task, logger, task_name):
+def run_scraper(scraper_class, config_task, logger, task_name, manifest=None, journal=None):
     """
     Runs the scraper for a specific task if the task is present in the config.
+    Returns True if the task was scraped without errors, and records the outcome in the run journal.
     """
+    succeeded, error = False, None
     if not config_task:
         logger.warning(f"Skipping {task_name}, no configuration found.")
-        return
-    try:
-        logger.info(f"Scraping {task_name} info from {config_task['urls'][0]}")
-        scraper = scraper_class(config_task['urls'][0], config_task['output_file'], logger)
-        scraper.scrape()
-    except Exception as e:
-        logger.error(f"Error occurred during scraping {task_name}: {str(e)}")
+        error = "no configuration found"
+    else:
+        try:
+            logger.info(f"Scraping {task_name} info from {config_task['urls'][0]}")
+            scraper = scraper_class(config_task['urls'][0], config_task['output_file'], logger)
+            scraper.manifest = manifest
+            scraper.journal = journal.for_task(task_name) if journal else None
+            scraper.scrape()
+            succeeded = not scraper.failed_urls
+            if not succeeded:
+                error = f"failed to fetch {scraper.failed_urls}"
+        except Exception as e:
+            logger.error(f"Error occurred during scraping {task_name}: {str(e)}")
+            error = str(e)
+    if journal:
+        journal.task_finished(task_name, succeeded, error)
+    return succeeded
 
 
 def run_scraper_batch(scraper_class, tasks, config, logger):
@@ -39,11 +57,22 @@ def run_scraper_batch(scraper_class, tasks, config, logger):
         logger.error(f"Error in batch execution for {scraper_class.__name__}: {str(e)}")
 
 
-def main() -> None:
+def parse_args(argv=None) -> argparse.Namespace:
+    """
+    Parses the command line options of the scraping run.
+    """
+    parser = argparse.ArgumentParser(description="Scrape the Northeastern catalog into raw JSON files.")
+    parser.add_argument('--resume', action='store_true',
+                        help="Resume the previous run from the run journal, retrying only unfinished and failed tasks.")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> None:
     """
     Main function to orchestrate the scraping process by loading the config
     and executing the appropriate scrapers concurrently.
     """
+    args = parse_args(argv)
     logger = LoggerFactory.get_logger("MainScraper")
     logger.info("Starting the scraping process...")
 
@@ -67,6 +96,16 @@ def main() -> None:
 
     scraping_tasks = defaultdict(lambda: None, config['scraping_tasks'])
 
+    # Serve unchanged pages from the on-disk response cache when one is configured
+    get_fetch_engine().configure(cache=ResponseCache.from_config(config.get('http_cache')))
+    # Skip re-parsing tasks whose pages have not changed since the last run
+    manifest = ScrapeManifest.from_config(config.get('manifest'))
+    # Track every task and URL so an interrupted run can be resumed
+    journal = RunJournal.from_config(config.get('run_journal'))
+    if args.resume and journal is None:
+        logger.error("--resume requires a run_journal section in the config.")
+        return
+
     # List of tasks categorized by their scraper class
     scraping_batches = [
         (AcademicPolicies, ['undergrad_academic_requirements', 'undergrad_conditional_admission']),
@@ -95,9 +134,37 @@ def main() -> None:
         )
     ]
 
-    # Process each scraper batch sequentially
-    for scraper_class, tasks in scraping_batches:
-        run_scraper_batch(scraper_class, tasks, config, logger)
+    # Spread the tasks of every batch across the scheduler's worker pool
+    jobs = [
+        (task_name, partial(run_scraper, scraper_class, scraping_tasks[task_name], logger, task_name, manifest, journal))
+        for scraper_class, tasks in scraping_batches
+        for task_name in tasks
+    ]
+    if journal:
+        task_urls = {task_name: (scraping_tasks[task_name] or {}).get('urls', [])[:1] for task_name, _ in jobs}
+        if args.resume:
+            remaining = set(journal.resume(task_urls))
+            logger.info(f"Resuming run: {len(remaining)} of {len(jobs)} tasks left to scrape")
+            jobs = [(task_name, job) for task_name, job in jobs if task_name in remaining]
+        else:
+            journal.start(task_urls)
+
+    # Tasks writing to the same output file must not run at the same time
+    output_files = {
+        task_name: scraping_tasks[task_name]['output_file']
+        for task_name, _ in jobs
+        if scraping_tasks[task_name]
+    }
+    TaskScheduler.from_config(config, logger).run(jobs, output_files)
+
+    if manifest:
+        manifest.save()
+        changed_tasks = [task_name for task_name, output_file in output_files.items()
+                         if output_file in manifest.changed]
+        logger.info(f"{len(changed_tasks)} of {len(jobs)} tasks changed since the last run: {changed_tasks}")
+    if journal:
+        logger.info(f"Run journal status: {journal.counts()}")
+        journal.close()
 
 
 if __name__ == "__main__":
@@ -1,6 +1,6 @@
-from bs4 import BeautifulSoup
 from src.husky_scraper_v3.base_scraper import BaseScraper
-import re
+from src.husky_scraper.contacts import extract_contacts
+from src.husky_scraper.parsing import HEADING, TEXT_CONTAINER, make_soup, make_soups
 from src.husky_scraper_v3.utils import fetch_html, save_to_file, replace_unicode
 
 
@@ -12,8 +12,8 @@ class UndergradAdmissionRequirements(BaseScraper):
     def parse(self, html: str) -> dict[str, str]:
         self.logger.info("Parsing course descriptions.")
 
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        # Parse only the main content container
+        soup = make_soup(html, TEXT_CONTAINER)
 
         # Locate the main content container
         content_section = soup.find('div', {'id': 'textcontainer'})
@@ -55,11 +55,11 @@ class UndergradMilitaryRequirements(BaseScraper):
     def parse(self, html: str) -> dict[str, str]:
         self.logger.info("Parsing course descriptions.")
 
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        # Parse only the page heading and the main content container
+        heading_soup, soup = make_soups(html, [HEADING, TEXT_CONTAINER])
 
         # Extract the title of the page
-        title = soup.find('h1').text.strip()
+        title = heading_soup.find('h1').text.strip()
 
         # Extract the content under the main section related to deferment
         main_content = soup.find('div', {'id': 'textcontainer'}).get_text(separator='.').strip()
@@ -78,11 +78,11 @@ class UndergradJohnMartinsonRequirements(BaseScraper):
     def parse(self, html: str) -> dict[str, str]:
         self.logger.info("Parsing course descriptions.")
 
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        # Parse only the page heading and the main content container
+        heading_soup, soup = make_soups(html, [HEADING, TEXT_CONTAINER])
 
         # Try to find the title
-        title_tag = soup.find('h1')
+        title_tag = heading_soup.find('h1')
         if title_tag is None:
             print("Error: <h1> tag not found.")
             return {}
@@ -98,11 +98,9 @@ class UndergradJohnMartinsonRequirements(BaseScraper):
         # Extract all the text content and replace \n with space and &nbsp; with space
         full_content = main_content_section.get_text(separator='.', strip=True).replace('\n', ' ').replace('\xa0', ' ')
 
-        # Extract phone numbers (matching patterns like 617.373.2333 or 617-373-2333)
-        phone_numbers = re.findall(r'\(?\d{3}\)?[\.\-\s]\d{3}[\.\-\s]\d{4}', full_content)
-
-        # Extract email addresses
-        email_addresses = re.findall(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', full_content)
+        # Extract unique email addresses and phone numbers (617.373.2333 and 617-373-2333 normalize to the same number);
+        # the strict patterns require separators in phone numbers, so other digit runs are not matched
+        email_addresses, phone_numbers = extract_contacts(full_content, strict=True)
 
         # Extract names of Director and Associate Directors, replace \n with space and &nbsp;
         director_names = []
@@ -131,11 +129,11 @@ class UndergradSpecializedEntry(BaseScraper):
     def parse(self, html: str) -> dict[str, str]:
         self.logger.info("Parsing course descriptions.")
 
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        # Parse only the page heading and the main content container
+        heading_soup, soup = make_soups(html, [HEADING, TEXT_CONTAINER])
 
         # Extract the title
-        title_tag = soup.find('h1')
+        title_tag = heading_soup.find('h1')
         title = title_tag.text.strip() if title_tag else "No title found"
 
         # Extract the main content container
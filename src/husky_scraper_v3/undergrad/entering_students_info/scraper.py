@@ -1,7 +1,7 @@
-from bs4 import BeautifulSoup
 from src.husky_scraper_v3.base_scraper import BaseScraper
+from src.husky_scraper.contacts import extract_contacts
+from src.husky_scraper.parsing import make_soup
 from src.husky_scraper_v3.utils import fetch_html, save_to_file, replace_unicode
-import re
 
 
 class EnteringStudentsInfo(BaseScraper):
@@ -12,17 +12,14 @@ class EnteringStudentsInfo(BaseScraper):
     def parse(self, html: str) -> dict[str, str]:
         self.logger.info("Parsing accommodation details.")
 
-        # Parse the HTML content with BeautifulSoup
-        soup = BeautifulSoup(html, 'html.parser')
+        # Parse the whole page: contacts are searched in the text of the entire page
+        soup = make_soup(html)
 
         # Extract the title of the page
         title = soup.find('title').get_text(strip=True)
 
-        # Extract phone numbers using regex
-        phone_numbers = re.findall(r'\(?\d{3}\)?[-.\s]?\d{3}[-.\s]?\d{4}', soup.get_text())
-
-        # Extract email addresses using regex
-        email_addresses = re.findall(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}', soup.get_text())
+        # Extract unique email addresses and normalized phone numbers from the page text
+        email_addresses, phone_numbers = extract_contacts(soup.get_text())
 
         # Extract the main content div
         main_content_tag = soup.find('div', {'id': 'textcontainer'})
@@ -1,7 +1,8 @@
-import requests
 import json
 import sys
 import re
+from typing import Iterator, List, Optional, Tuple
+from src.husky_scraper.fetcher import get_fetch_engine
 
 
 def fetch_html(url: str, logging) -> str:
@@ -15,14 +16,21 @@ def fetch_html(url: str, logging) -> str:
     Returns:
         str: The HTML content fetched from the URL, or None if an error occurred.
     """
-    try:
-        logging.info(f"Fetching HTML content from: {url}")
-        response = requests.get(url)
-        response.raise_for_status()
-        return response.text
-    except Exception as e:
-        logging.error(f"Error fetching URL {url}: {e}, {sys.exc_info()}")
-        return None
+    return get_fetch_engine().fetch(url, logging)
+
+
+def fetch_html_many(urls: List[str], logging) -> Iterator[Tuple[str, Optional[str]]]:
+    """
+    Fetches the HTML content of several URLs concurrently.
+
+    Args:
+        urls (List[str]): The URLs to fetch the HTML from.
+        logging: The logger instance used for logging information and errors.
+
+    Yields:
+        Tuple[str, str]: Each URL with its HTML content (None if an error occurred), in completion order.
+    """
+    return get_fetch_engine().fetch_many(urls, logging)
 
 
 def save_to_file(data: dict, output_file: str, logging) -> None: